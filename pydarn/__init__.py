@@ -25,11 +25,13 @@ from .version import __version__
 
 # Import io for pyDARN
 from .io.superdarn_io import SuperDARNRead
+from .io.dmap_cache import DmapCache, dmap_cache
 
 # Importing pydarn exception classes
 from .exceptions import rtp_exceptions
 from .exceptions import plot_exceptions
 from .exceptions import radar_exceptions
+from .exceptions import io_exceptions
 from .exceptions.warning_formatting import standard_warning_format
 from .exceptions.warning_formatting import only_message_warning_format
 from .exceptions.warning_formatting import citing_warning
@@ -44,23 +46,47 @@ from .utils.constants import C
 from .utils.range_estimations import RangeEstimation
 from .utils.virtual_heights import VHModels
 from .utils.conversions import dmap2dict
+from .utils.columnar import ColumnarData
+from .utils.columnar import to_columnar
+from .utils.columnar import TimeIndex
 from .utils.plotting import MapParams
 from .utils.plotting import check_data_type
 from .utils.plotting import time2datetime
+from .utils.plotting import times2datetime64
 from .utils.plotting import find_record
+from .utils.plotting import find_gaps
+from .utils.plotting import fill_gaps
+from .utils.coordinate_cache import CoordinateCache
+from .utils.coordinate_cache import coordinate_cache
 from .utils.superdarn_radars import SuperDARNRadars
 from .utils.superdarn_cpid import SuperDARNCpids
 from .utils.superdarn_radars import Hemisphere
 from .utils.superdarn_radars import read_hdw_file
 from .utils.superdarn_radars import get_hdw_files
+from .utils.superdarn_radars import HardwareDatabase
 from .utils.scan import build_scan
+from .utils.scan import build_scan_index
+from .utils.scan import ScanIndex
 from .utils.geo import geocentric_coordinates
+from .utils.spherical_harmonics import associated_legendre
+from .utils.spherical_harmonics import harmonic_indices
+from .utils.spherical_harmonics import harmonic_basis
+from .utils.spherical_harmonics import potential_basis
+from .utils.spherical_harmonics import efield_basis
+from .utils.spherical_harmonics import HarmonicBasisCache
+from .utils.spherical_harmonics import harmonic_basis_cache
 from .utils.coordinates import Coords
+from .utils.coordinates import batch_aacgm_coordinates
+from .utils.filters import Filter
+from .utils.range_time import build_range_time
+from .utils.range_time import RangeTimeBuffer
 
 # import plotting
 from .plotting.color_maps import PyDARNColormaps
 from .plotting.projections import Projs
+from .plotting.vectors import plot_vectors
 from .plotting.rtp import RTP
+from .plotting.rtp import RangeTimePlot
 from .plotting.fan import Fan
 from .plotting.grid import Grid
 from .plotting.acf import ACF
@@ -0,0 +1,34 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+import logging
+
+pydarn_log = logging.getLogger('pydarn')
+
+
+class CodecMissingError(Exception):
+    """
+    This error is raised when a file is compressed with a codec that
+    needs a library which is not installed
+    """
+    def __init__(self, filename, codec, package):
+        self.filename = filename
+        self.codec = codec
+        self.message = "{file} is compressed with {codec} which needs the"\
+            " {package} library, please install it: pip install {package}"\
+            "".format(file=filename, codec=codec, package=package)
+        super().__init__(self.message)
+        pydarn_log.error(self.message)
+
+
+class PydarnioVersionError(Exception):
+    """
+    This error is raised when the record conversion methods of the
+    installed pyDARNio are missing or changed
+    """
+    def __init__(self, problem):
+        self.problem = problem
+        self.message = "Borealis records cannot be converted with the"\
+            " installed pyDARNio: {problem}. Please make an issue on pyDARN"\
+            " with your pyDARNio version.".format(problem=problem)
+        super().__init__(self.message)
+        pydarn_log.error(self.message)
@@ -0,0 +1,121 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+#
+# Modifications:
+#
+"""
+borealis_records.py converts Borealis rawacf/bfiq records to SDARN
+rawacf/iqdat records in memory, one record at a time.
+
+pydarnio's BorealisConvert converts all the records and writes them to a
+SDARN DMap file, BorealisRecords uses the same record conversion without
+writing (or reading back) a file.
+
+The record conversion is private to BorealisConvert (pyDARNio has no public
+API converting records without writing a file), so the methods are checked
+before they are used. pyDARNio 1.1 converts a Borealis record to one SDARN
+record, later versions to a list of SDARN records (one per beam).
+"""
+import pydarnio
+
+from pydarnio import borealis_exceptions
+
+from pydarn.exceptions.io_exceptions import PydarnioVersionError
+
+# private BorealisConvert methods the conversion relies on
+CONVERT_METHODS = {'iqdat': '_BorealisConvert__convert_bfiq_record',
+                   'rawacf': '_BorealisConvert__convert_rawacf_record'}
+CHECK_METHODS = {'iqdat': '_is_convertible_to_iqdat',
+                 'rawacf': '_is_convertible_to_rawacf'}
+
+
+class BorealisRecords(pydarnio.BorealisConvert):
+    """
+    Converts the records of a Borealis file to SDARN records in memory
+
+    Parameters
+    ----------
+        borealis_filename: str
+            name of the Borealis hdf5 file
+        borealis_filetype: str
+            'rawacf' (converted to rawacf) or 'bfiq' (converted to iqdat)
+        borealis_slice_id: int
+            slice id of the file, only needed for files produced before
+            Borealis v0.5
+            default: None
+        scaling_factor: int
+            the data is multiplied by scaling_factor before it is converted
+            to integers
+            default: 1
+
+    Raises
+    ------
+        BorealisConversionTypesError - the file cannot be converted
+        BorealisConvert2RawacfError - the rawacf file cannot be converted
+        PydarnioVersionError - the installed pyDARNio does not have the
+            conversion methods or they return an unknown type
+    """
+    def __init__(self, borealis_filename: str, borealis_filetype: str,
+                 borealis_slice_id: int = None, scaling_factor: int = 1):
+        for method in list(CONVERT_METHODS.values()) + \
+                list(CHECK_METHODS.values()) + ['_write_to_sdarn']:
+            if not hasattr(pydarnio.BorealisConvert, method):
+                raise PydarnioVersionError('BorealisConvert.{} is missing'
+                                           ''.format(method))
+        # sdarn_filename is None as no file is written
+        super().__init__(borealis_filename, borealis_filetype, None,
+                         borealis_slice_id, scaling_factor=scaling_factor)
+
+    def _write_to_sdarn(self):
+        """
+        Called by BorealisConvert.__init__, only checks the file can be
+        converted; the records are converted when they are iterated
+        """
+        getattr(self, CHECK_METHODS[self.sdarn_filetype])()
+
+    def __iter__(self):
+        """
+        Yields the SDARN records (dict) of each Borealis record
+        """
+        convert = getattr(self, CONVERT_METHODS[self.sdarn_filetype])
+        if self.sdarn_filetype == 'iqdat':
+            conversion_error = borealis_exceptions.BorealisConvert2IqdatError
+        else:
+            conversion_error = \
+                borealis_exceptions.BorealisConvert2RawacfError
+        for record in self.borealis_records.items():
+            try:
+                sdarn_record = convert(self.borealis_slice_id, record,
+                                       self.borealis_filename,
+                                       self.scaling_factor)
+            # missing or malformed data in the Borealis record, other
+            # errors are not conversion errors and are raised as they are
+            except (KeyError, IndexError, ValueError) as err:
+                raise conversion_error(err) from err
+            if isinstance(sdarn_record, dict):
+                yield sdarn_record
+            elif isinstance(sdarn_record, list):
+                yield from sdarn_record
+            else:
+                raise PydarnioVersionError(
+                    'BorealisConvert.{} returned a {}'
+                    ''.format(CONVERT_METHODS[self.sdarn_filetype],
+                              type(sdarn_record).__name__))
+
+    @property
+    def sdarn_dict(self):
+        """
+        The converted SDARN records as a list of dictionaries
+        """
+        if not self._sdarn_dict:
+            self._sdarn_dict = list(self)
+        return self._sdarn_dict
@@ -0,0 +1,188 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+#
+# Modifications:
+#
+"""
+codecs.py picks the decompressor of a DMap file from its magic bytes
+(bz2, gzip, xz or zstd) instead of its name.
+
+Multi-stream bz2 files (written by pbzip2/lbzip2 or concatenated files)
+are decompressed in parallel threads, one stream per thread, as bz2
+releases the GIL while decompressing.
+"""
+import bz2
+import gzip
+import lzma
+import os
+import re
+
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+
+from pydarn.exceptions import io_exceptions
+
+try:
+    import zstandard
+    zstandardInstalled = True
+except Exception:
+    zstandardInstalled = False
+
+# bz2 stream header "BZh" + block size followed by the byte aligned magic
+# of the first block, pi in BCD
+BZ2_STREAM = re.compile(b'BZh[1-9]1AY&SY')
+# streams smaller than this are not worth a thread
+BZ2_MIN_STREAM = 256 * 1024
+
+
+class Codecs(Enum):
+    """
+    Compression formats of DMap files and their magic bytes
+
+    enums
+    -----
+    BZ2
+    GZIP
+    XZ
+    ZSTD
+    """
+    BZ2 = b'BZh'
+    GZIP = b'\x1f\x8b'
+    XZ = b'\xfd7zXZ\x00'
+    ZSTD = b'\x28\xb5\x2f\xfd'
+
+
+def detect_codec(filename: str):
+    """
+    Returns the Codecs of a file from its first bytes, None if the file
+    is not compressed (or not compressed with a known codec)
+    """
+    with open(filename, 'rb') as fp:
+        magic = fp.read(6)
+    for codec in Codecs:
+        if magic.startswith(codec.value):
+            return codec
+    return None
+
+
+def _zstandard(filename: str):
+    if zstandardInstalled is False:
+        raise io_exceptions.CodecMissingError(filename, 'zstd', 'zstandard')
+    return zstandard
+
+
+def open_dmap(filename: str):
+    """
+    Opens a DMap file for reading bytes, compressed files are decompressed
+    while they are read
+
+    Parameters
+    ----------
+        filename: str
+            name of the file
+
+    Returns
+    -------
+        file object of the (decompressed) bytes
+
+    Raises
+    ------
+        CodecMissingError - zstandard is not installed for zstd files
+    """
+    codec = detect_codec(filename)
+    if codec is Codecs.BZ2:
+        return bz2.open(filename, 'rb')
+    if codec is Codecs.GZIP:
+        return gzip.open(filename, 'rb')
+    if codec is Codecs.XZ:
+        return lzma.open(filename, 'rb')
+    if codec is Codecs.ZSTD:
+        return _zstandard(filename).open(filename, 'rb')
+    return open(filename, 'rb')
+
+
+def bz2_streams(data: bytes, min_size: int = BZ2_MIN_STREAM):
+    """
+    Splits multi-stream bz2 data at the start of its streams, neighbouring
+    streams are joined into pieces of at least min_size bytes. Only the
+    stream starts are byte aligned so single stream data is not split.
+    """
+    starts = [match.start() for match in BZ2_STREAM.finditer(data)
+              if match.start() > 0]
+    pieces = []
+    start = 0
+    for stop in starts:
+        if stop - start >= min_size:
+            pieces.append(data[start:stop])
+            start = stop
+    pieces.append(data[start:])
+    return pieces
+
+
+def decompress_bz2(data: bytes, threads: int = None):
+    """
+    Decompresses bz2 data, the streams of multi-stream data are
+    decompressed in a pool of threads
+
+    Parameters
+    ----------
+        data: bytes
+            bz2 compressed data
+        threads: int
+            number of threads, None uses the number of CPUs
+            default: None
+
+    Returns
+    -------
+        bytes of the decompressed data
+    """
+    if threads is None:
+        threads = os.cpu_count() or 1
+    pieces = bz2_streams(data) if threads > 1 else [data]
+    if len(pieces) == 1:
+        return bz2.decompress(data)
+    try:
+        with ThreadPoolExecutor(min(threads, len(pieces))) as executor:
+            return b''.join(executor.map(bz2.decompress, pieces))
+    except (OSError, EOFError, ValueError):
+        # the magic bytes were found inside compressed data
+        return bz2.decompress(data)
+
+
+def decompress_file(filename: str, threads: int = None):
+    """
+    Reads and decompresses a whole DMap file, the codec is picked from the
+    magic bytes of the file
+
+    Parameters
+    ----------
+        filename: str
+            name of the file
+        threads: int
+            number of threads for multi-stream bz2 files, None uses the
+            number of CPUs
+            default: None
+
+    Returns
+    -------
+        bytes of the (decompressed) file
+
+    Raises
+    ------
+        CodecMissingError - zstandard is not installed for zstd files
+    """
+    codec = detect_codec(filename)
+    if codec is Codecs.BZ2:
+        with open(filename, 'rb') as fp:
+            return decompress_bz2(fp.read(), threads)
+    with open_dmap(filename) as fp:
+        return fp.read()
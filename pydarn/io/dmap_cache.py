@@ -0,0 +1,259 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+#
+# Modifications:
+#
+"""
+dmap_cache.py stores parsed DMap files as memory-mappable columns so a file
+is only decompressed and parsed the first time it is read.
+"""
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+import pydarn
+from pydarn.utils.coordinate_cache import user_cache_dir
+
+
+class DmapCache():
+    """
+    Cache of parsed DMap files stored as ColumnarData columns, one
+    directory per file with one .npy file per column (values and offsets
+    for array fields) that is loaded with np.load(mmap_mode='r').
+
+    Entries are keyed by the absolute path, modification time and size of
+    the file (and the fields read) so a changed file is parsed again, the
+    entries of the older versions of a file are removed when it is stored
+    again. When the directory holds more than max_entries entries the
+    least recently used ones are removed.
+
+    Nothing is pickled, arrays changing shape between records are stored
+    as flattened values with the offsets and shape of each record.
+
+    Attributes
+    ----------
+        directory: str
+            directory the entries are stored in
+            default: user_cache_dir('dmap')
+        max_entries: int
+            number of entries kept in the directory
+            default: 64
+    """
+    INDEX = 'index.json'
+
+    def __init__(self, directory: str = '', max_entries: int = 64):
+        self.directory = user_cache_dir('dmap') if directory == '' \
+            else directory
+        self.max_entries = max_entries
+
+    @staticmethod
+    def _stat(filename: str):
+        """ modification time and size identifying a version of a file """
+        stat = os.stat(filename)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    @classmethod
+    def _name(cls, filename: str, fields: list = None):
+        """ directory name of the entry of a file """
+        key = (os.path.abspath(filename), *cls._stat(filename),
+               None if fields is None else sorted(fields))
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def get(self, filename: str, fields: list = None):
+        """
+        Returns the cached ColumnarData of a file with memory-mapped
+        (read-only) columns, None if the file is not cached
+
+        Parameters
+        ----------
+            filename: str
+                name of the DMap file
+            fields: list
+                fields the file was read with, None for all the fields
+                default: None
+        """
+        path = os.path.join(self.directory, self._name(filename, fields))
+        try:
+            with open(os.path.join(path, self.INDEX)) as fp:
+                index = json.load(fp)
+            present = np.load(os.path.join(path, 'present.npy'),
+                              mmap_mode='r')
+            scalars = {}
+            arrays = {}
+            for i, (name, kind) in enumerate(index['columns']):
+                column = os.path.join(path, '{}.npy'.format(i))
+                if kind == 'array':
+                    arrays[name] = (
+                        np.load(column, mmap_mode='r'),
+                        np.load(os.path.join(path, '{}.offsets.npy'
+                                             ''.format(i))))
+                elif kind == 'shaped':
+                    scalars[name] = self._load_shaped(
+                        column, os.path.join(path, '{}.offsets.npy'
+                                             ''.format(i)),
+                        os.path.join(path, '{}.shapes.npy'.format(i)),
+                        present[i])
+                else:
+                    scalars[name] = np.load(column, mmap_mode='r')
+        except (OSError, ValueError, KeyError):
+            return None
+        # the modification time of the index orders the entries for
+        # eviction
+        try:
+            os.utime(os.path.join(path, self.INDEX))
+        except OSError:
+            pass
+        fields = [name for name, _ in index['columns']]
+        return pydarn.ColumnarData._from_columns(
+            index['num_records'], fields, scalars, arrays,
+            dict(zip(fields, present)))
+
+    def put(self, filename: str, data, fields: list = None):
+        """
+        Stores the ColumnarData of a file, errors writing the cache are
+        ignored
+
+        Parameters
+        ----------
+            filename: str
+                name of the DMap file
+            data: ColumnarData
+                parsed records of the file
+            fields: list
+                fields the file was read with, None for all the fields
+                default: None
+        """
+        path = os.path.join(self.directory, self._name(filename, fields))
+        source = os.path.abspath(filename)
+        stat = self._stat(filename)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # write the entry in a temporary directory and move it in place
+            # so readers never see a partial entry
+            tmp_path = tempfile.mkdtemp(dir=self.directory)
+        except OSError:
+            return
+        try:
+            columns = []
+            for i, name in enumerate(data.fields):
+                column = os.path.join(tmp_path, '{}.npy'.format(i))
+                if data.is_array(name):
+                    values, offsets = data.ragged(name)
+                    np.save(column, values)
+                    np.save(os.path.join(tmp_path, '{}.offsets.npy'
+                                         ''.format(i)), offsets)
+                    columns.append((name, 'array'))
+                elif data.scalar(name).dtype == object:
+                    # arrays changing shape between records
+                    self._save_shaped(
+                        column, os.path.join(tmp_path, '{}.offsets.npy'
+                                             ''.format(i)),
+                        os.path.join(tmp_path, '{}.shapes.npy'.format(i)),
+                        data.scalar(name), data.present(name))
+                    columns.append((name, 'shaped'))
+                else:
+                    np.save(column, data.scalar(name), allow_pickle=False)
+                    columns.append((name, 'scalar'))
+            np.save(os.path.join(tmp_path, 'present.npy'),
+                    np.array([data.present(name) for name in data.fields],
+                             dtype=bool).reshape(len(data.fields),
+                                                 len(data)))
+            with open(os.path.join(tmp_path, self.INDEX), 'w') as fp:
+                json.dump({'source': source, 'stat': stat,
+                           'num_records': len(data),
+                           'columns': columns}, fp)
+            # an unreadable entry of the same file is replaced
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp_path, path)
+        # OSError: the directory is not writable or another process
+        # stored the file first, ValueError: columns numpy cannot store
+        # without pickling
+        except (OSError, ValueError):
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+        self._evict(source, stat)
+
+    @staticmethod
+    def _save_shaped(column: str, offsets_file: str, shapes_file: str,
+                     values: np.ndarray, present: np.ndarray):
+        """
+        Stores an object column of arrays as their flattened values, the
+        offset of each record in the values and the shape of each record
+        (padded with -1 to the largest number of dimensions)
+        """
+        arrays = [np.asarray(value) if present[i] else np.zeros(0)
+                  for i, value in enumerate(values)]
+        offsets = np.zeros(len(arrays) + 1, dtype=int)
+        np.cumsum([array.size for array in arrays], out=offsets[1:])
+        ndim = max([array.ndim for array in arrays], default=0)
+        shapes = np.full((len(arrays), ndim), -1, dtype=int)
+        for i, array in enumerate(arrays):
+            shapes[i, :array.ndim] = array.shape
+        np.save(column, np.concatenate([array.ravel() for array in arrays]),
+                allow_pickle=False)
+        np.save(offsets_file, offsets)
+        np.save(shapes_file, shapes)
+
+    @staticmethod
+    def _load_shaped(column: str, offsets_file: str, shapes_file: str,
+                     present: np.ndarray) -> np.ndarray:
+        """
+        Loads an object column stored by _save_shaped, the arrays are
+        views of the memory-mapped values
+        """
+        values = np.load(column, mmap_mode='r')
+        offsets = np.load(offsets_file)
+        shapes = np.load(shapes_file)
+        arrays = np.empty(len(shapes), dtype=object)
+        for i in np.flatnonzero(present):
+            arrays[i] = values[offsets[i]:offsets[i + 1]].\
+                reshape(tuple(shapes[i][shapes[i] >= 0]))
+        return arrays
+
+    def _evict(self, source: str, stat: list):
+        """
+        Removes the entries of older versions of the source file and the
+        least recently used entries over max_entries
+        """
+        mtimes = {}
+        for index_file in glob.glob(os.path.join(self.directory, '*',
+                                                 self.INDEX)):
+            try:
+                with open(index_file) as fp:
+                    index = json.load(fp)
+                mtime = os.path.getmtime(index_file)
+            # removed by another process or unreadable
+            except (OSError, ValueError):
+                continue
+            if index.get('source') == source and index.get('stat') != stat:
+                shutil.rmtree(os.path.dirname(index_file),
+                              ignore_errors=True)
+            else:
+                mtimes[os.path.dirname(index_file)] = mtime
+        for path in sorted(mtimes, key=mtimes.get)[
+                :max(len(mtimes) - self.max_entries, 0)]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def clear(self):
+        """
+        Removes all the cached files
+        """
+        for path in glob.glob(os.path.join(self.directory, '*')):
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+
+dmap_cache = DmapCache()
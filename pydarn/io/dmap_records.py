@@ -0,0 +1,348 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+#
+# Modifications:
+#
+"""
+dmap_records.py parses DMap records one at a time, only the requested fields
+are converted to python values/numpy arrays, the other fields are skipped
+over in the byte buffer.
+
+The records have the same layout as the records returned by pydarnio's
+DmapRead/SDarnRead: a dictionary of the fields in the order they are stored
+with scalars cast to python/numpy scalars and arrays as numpy arrays.
+However, the SuperDARN format checks (missing/extra fields, field types)
+are not done.
+"""
+import os
+import pydarnio
+import struct
+import numpy as np
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable
+
+import pydarn
+from pydarn.io.codecs import detect_codec, open_dmap
+
+# DMap data type code: (struct format, numpy dtype, number of bytes)
+# DMap data is stored little endian
+DMAP_TYPES = {1: ('<b', np.dtype('<i1'), 1),  # char defined as int8 in RST
+              2: ('<h', np.dtype('<i2'), 2),  # short
+              3: ('<i', np.dtype('<i4'), 4),  # int
+              4: ('<f', np.dtype('<f4'), 4),  # float
+              8: ('<d', np.dtype('<f8'), 8),  # double
+              9: ('s', None, 1),  # string
+              10: ('<q', np.dtype('<i8'), 8),  # long
+              16: ('<B', np.dtype('<u1'), 1),  # unsigned char
+              17: ('<H', np.dtype('<u2'), 2),  # unsigned short
+              18: ('<I', np.dtype('<u4'), 4),  # unsigned int
+              19: ('<Q', np.dtype('<u8'), 8)}  # unsigned long
+
+# casting of the scalar values, same as pydarnio's dmap2dict
+DMAP_CASTING_TYPES = {1: np.int8, 2: np.int16, 3: int, 4: float,
+                      8: np.float64, 9: str, 10: np.int64, 16: np.uint8,
+                      17: np.uint16, 18: np.uint32, 19: np.uint64}
+
+STRING = 9
+
+
+def _read_string(buffer: bytes, cursor: int):
+    """ reads a null terminated string, returns it and the next cursor """
+    end = buffer.index(b'\x00', cursor)
+    return bytes(buffer[cursor:end]).decode('utf-8'), end + 1
+
+
+def _data_type(buffer: bytes, cursor: int, name: str, source: str):
+    """ checks the DMap data type code at cursor """
+    data_type = buffer[cursor]
+    if data_type not in DMAP_TYPES:
+        raise pydarnio.dmap_exceptions.DmapDataError(
+            source, "Data type {} of field {} is not a DMap data type"
+            "".format(data_type, name))
+    return data_type
+
+
+def record_time(record: dict):
+    """
+    Returns the datetime of a record (from time.* or start.* fields) or
+    None if the record has no time fields
+    """
+    try:
+        return pydarn.time2datetime(record)
+    except KeyError:
+        return None
+
+
+def read_record(buffer: bytes, cursor: int = 0, fields: set = None,
+                scalar_filter: Callable = None, copy: bool = False,
+                source: str = 'stream'):
+    """
+    Reads the DMap record starting at cursor in the buffer
+
+    Parameters
+    ----------
+        buffer: bytes
+            bytes (or bytearray) containing the record
+        cursor: int
+            position of the record in the buffer
+            default: 0
+        fields: set
+            names of the fields to keep, None keeps all the fields
+            default: None
+        scalar_filter: Callable
+            called with a dictionary of all the scalars of the record
+            (scalars are stored before the arrays), the arrays are
+            skipped and None is returned if it returns False
+            default: None
+        copy: bool
+            copy the arrays out of the buffer, otherwise the arrays are
+            views of the buffer
+            default: False
+        source: str
+            name of the file for error messages
+
+    Returns
+    -------
+        record: OrderedDict or None
+            record with the requested fields, None if the record did not
+            pass the scalar_filter
+        cursor: int
+            position of the next record
+
+    Raises
+    ------
+        DmapDataError - the record is corrupted
+    """
+    if len(buffer) - cursor < 16:
+        raise pydarnio.dmap_exceptions.DmapDataError(
+            source, "Record at byte {} is truncated".format(cursor))
+    # encoding identifier (unused), block size, number of scalars and
+    # arrays
+    _, block_size, num_scalars, num_arrays = \
+        struct.unpack_from('<4i', buffer, cursor)
+    end = cursor + block_size
+    if block_size <= 0 or end > len(buffer) or \
+            num_scalars < 0 or num_arrays < 0:
+        raise pydarnio.dmap_exceptions.DmapDataError(
+            source, "Record at byte {} has a block size of {} bytes with"
+            " {} bytes left".format(cursor, block_size,
+                                    len(buffer) - cursor))
+    cursor += 16
+
+    scalars = OrderedDict()
+    for _ in range(num_scalars):
+        name, cursor = _read_string(buffer, cursor)
+        data_type = _data_type(buffer, cursor, name, source)
+        cursor += 1
+        if data_type == STRING:
+            value, cursor = _read_string(buffer, cursor)
+        else:
+            data_fmt, _, data_bytes = DMAP_TYPES[data_type]
+            value = DMAP_CASTING_TYPES[data_type](
+                struct.unpack_from(data_fmt, buffer, cursor)[0])
+            cursor += data_bytes
+        scalars[name] = value
+
+    if scalar_filter is not None and not scalar_filter(scalars):
+        return None, end
+
+    if fields is None:
+        record = scalars
+    else:
+        record = OrderedDict((name, value) for name, value in scalars.items()
+                             if name in fields)
+
+    for _ in range(num_arrays):
+        name, cursor = _read_string(buffer, cursor)
+        data_type = _data_type(buffer, cursor, name, source)
+        dimension = struct.unpack_from('<i', buffer, cursor + 1)[0]
+        shape = struct.unpack_from('<{}i'.format(dimension), buffer,
+                                   cursor + 5)
+        cursor += 5 + 4 * dimension
+        if data_type == STRING:
+            raise pydarnio.dmap_exceptions.DmapDataError(
+                source, "Trying to read array of strings {}. Currently not"
+                " implemented.".format(name))
+        _, dtype, data_bytes = DMAP_TYPES[data_type]
+        # DMap stores the dimensions from the fastest changing
+        cells = int(np.prod(shape))
+        if fields is None or name in fields:
+            array = np.frombuffer(buffer, dtype, cells, cursor)
+            array = array.reshape(shape[::-1])
+            record[name] = array.copy() if copy else array
+        cursor += cells * data_bytes
+
+    if cursor != end:
+        raise pydarnio.dmap_exceptions.DmapDataError(
+            source, "Record {} ends at byte {} instead of {}"
+            "".format(record_time(scalars), cursor, end))
+    return record, end
+
+
+def time_window_filter(start_time: datetime = None,
+                       end_time: datetime = None):
+    """
+    Returns a scalar_filter for read_record keeping the records between
+    start_time and end_time (inclusive), None if there is no window
+    """
+    if start_time is None and end_time is None:
+        return None
+
+    def in_window(scalars: dict):
+        time = record_time(scalars)
+        return time is None or \
+            ((start_time is None or time >= start_time) and
+             (end_time is None or time <= end_time))
+    return in_window
+
+
+def iter_records(filename: str, fields: list = None,
+                 start_time: datetime = None, end_time: datetime = None,
+                 record_filter: Callable = None, copy: bool = True):
+    """
+    Generator of the records of a DMap file, the file is read (and
+    decompressed for compressed files) one record at a time
+
+    Parameters
+    ----------
+        filename: str
+            name of the file, bz2, gzip, xz and zstd files are
+            decompressed
+        fields: list
+            names of the fields to keep, None keeps all the fields
+            default: None
+        start_time: datetime
+            skip records before start_time
+            default: None
+        end_time: datetime
+            skip records after end_time
+            default: None
+        record_filter: Callable
+            called with each record (after the projection), records it
+            returns False for are skipped
+            default: None
+        copy: bool
+            copy the arrays out of the record block like read_dmap,
+            otherwise the arrays are read-only views of the block which
+            is kept in memory as long as one of them is
+            default: True
+
+    Yields
+    ------
+        record: OrderedDict
+            record with the requested fields
+    """
+    if fields is not None:
+        fields = set(fields)
+    scalar_filter = time_window_filter(start_time, end_time)
+    with open_dmap(filename) as fp:
+        while True:
+            header = fp.read(8)
+            if len(header) == 0:
+                return
+            if len(header) < 8:
+                raise pydarnio.dmap_exceptions.DmapDataError(
+                    filename, "File ends in the middle of a record header")
+            block_size = struct.unpack_from('<i', header, 4)[0]
+            block = header + fp.read(max(block_size - 8, 0))
+            record, _ = read_record(block, 0, fields, scalar_filter,
+                                    copy=copy, source=filename)
+            if record is not None and \
+                    (record_filter is None or record_filter(record)):
+                yield record
+
+
+class DmapFollower():
+    """
+    Follows a DMap file that is being written (i.e. a real-time fitacf
+    file), every read returns the records appended since the last read.
+    The byte offset of the end of the last complete record is kept so only
+    new bytes are parsed and a record that is still being written is read
+    on a later call.
+
+    Compressed files are decompressed from the start on every read, only
+    the parsing is proportional to the new data.
+
+    Attributes
+    ----------
+        filename: str
+            name of the file
+        fields: set
+            names of the fields to keep, None keeps all the fields
+        offset: int
+            (decompressed) byte offset of the end of the last complete
+            record read
+    """
+
+    def __init__(self, filename: str, fields: list = None):
+        self.filename = filename
+        self.fields = None if fields is None else set(fields)
+        self.offset = 0
+        self._file_id = None
+        self._size = 0
+
+    def _read_new_bytes(self):
+        """ bytes of the file after offset """
+        stat = os.stat(self.filename)
+        # a replaced or truncated file is read from the start
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._size:
+            self.offset = 0
+        self._file_id = file_id
+        self._size = stat.st_size
+
+        if detect_codec(self.filename) is None:
+            with open(self.filename, 'rb') as fp:
+                fp.seek(self.offset)
+                return fp.read()
+        chunks = []
+        with open_dmap(self.filename) as fp:
+            fp.seek(self.offset)
+            try:
+                while True:
+                    chunk = fp.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            except EOFError:
+                # the compressor has not finished the last stream
+                pass
+        return b''.join(chunks)
+
+    def read(self):
+        """
+        Returns the list of records appended to the file since the last
+        read, an empty list if there are no new complete records
+
+        Raises
+        ------
+            DmapDataError - the new bytes are not DMap records
+        """
+        buffer = self._read_new_bytes()
+        records = []
+        cursor = 0
+        while len(buffer) - cursor >= 8:
+            block_size = struct.unpack_from('<i', buffer, cursor + 4)[0]
+            if block_size <= 0:
+                raise pydarnio.dmap_exceptions.DmapDataError(
+                    self.filename, "Record at byte {} has a block size of {}"
+                    " bytes".format(self.offset + cursor, block_size))
+            if cursor + block_size > len(buffer):
+                # the record is still being written
+                break
+            record, cursor = read_record(buffer, cursor, self.fields,
+                                         copy=True, source=self.filename)
+            records.append(record)
+        self.offset += cursor
+        return records
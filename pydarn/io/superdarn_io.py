@@ -1,10 +1,31 @@
 # Copyright (C) 2020 SuperDARN Canada, University of Saskatchewan
 # Author: Marina Schmidt
 
-import bz2
 import pydarnio
 import os
 
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from glob import glob
+from typing import Callable, List, Union
+
+import pydarn
+from pydarn.io.borealis_records import BorealisRecords
+from pydarn.io.codecs import decompress_file, detect_codec
+from pydarn.io.dmap_cache import dmap_cache
+from pydarn.io.dmap_records import DmapFollower, iter_records, record_time
+
+# fields always read by read_dmap_files to merge and de-duplicate records
+MERGE_FIELDS = ['time.yr', 'time.mo', 'time.dy', 'time.hr', 'time.mt',
+                'time.sc', 'time.us', 'start.year', 'start.month',
+                'start.day', 'start.hour', 'start.minute', 'start.second',
+                'bmnum', 'channel']
+
+
+def _read_dmap_file(filename: str, fields: list = None):
+    """ reads one file in a worker process of read_dmap_files """
+    return SuperDARNRead().read_dmap(filename, fields=fields)
+
 
 class SuperDARNRead(pydarnio.SDarnRead):
     """
@@ -13,14 +34,22 @@ class SuperDARNRead(pydarnio.SDarnRead):
     Methods
     -------
     read_dmap : reads superDARN DMap formats
+    read_columnar : reads superDARN DMap formats as ColumnarData with a
+        memory-mapped cache
+    read_dmap_files : reads and merges many superDARN DMap files in
+        parallel
+    iter_dmap : generator reading superDARN DMap files one record at a time
+    follow : reads the records appended to a growing DMap file
     read_borealis: Reads Borealis hdf5 formats and converts
         Borealis' data dictionary to SDARN data dictionary
+    iter_borealis: generator converting Borealis hdf5 records to SDARN
+        records one at a time
     """
     def __init__(self, filename: str = None, stream: bool = False):
         if filename is not None:
             super().__init__(filename, stream)
 
-    def read_dmap(self, filename: str):
+    def read_dmap(self, filename: str, fields: list = None):
         """
         Reads select SuperDARN DMap files for pyDARN plotting:
             fitacf
@@ -33,19 +62,23 @@ class SuperDARNRead(pydarnio.SDarnRead):
         ----------
             filename: string
                 name of the file you are going to read
+            fields: list
+                names of the fields to keep, the other fields are skipped
+                while parsing (the SuperDARN format checks are not done
+                as the records are incomplete). None keeps all fields
+                default: None
 
         Returns
         ------
             data: List[dict]
                 data records from the file
         """
-        # check if the file  is compressed with
-        # bz2
-        if 'bz2' in filename:
-            with bz2.open(filename) as fp:
-                dmap_stream = fp.read()
+        if fields is not None:
+            return list(iter_records(filename, fields=fields))
 
-            super().__init__(dmap_stream, stream=True)
+        # check if the file is compressed (bz2, gzip, xz or zstd)
+        if detect_codec(filename) is not None:
+            super().__init__(decompress_file(filename), stream=True)
         else:
             super().__init__(filename)
 
@@ -72,10 +105,187 @@ class SuperDARNRead(pydarnio.SDarnRead):
             data = self.read_records
         return data
 
-    def read_borealis(self, filename: str, slice_id: int = None):
+    def read_columnar(self, filename: str, fields: list = None,
+                      cache: bool = True):
+        """
+        Reads a DMap file with read_dmap as ColumnarData. With cache the
+        columns are stored in pydarn.dmap_cache on the first read, later
+        reads of the same (unchanged) file memory-map the stored columns
+        instead of decompressing and parsing the file.
+
+        Parameters
+        ----------
+            filename: string
+                name of the file you are going to read
+            fields: list
+                names of the fields to keep, None keeps all fields
+                default: None
+            cache: bool
+                use the cache
+                default: True
+
+        Returns
+        ------
+            data: ColumnarData
+                data records from the file, columns are read-only
+                memory-mapped arrays when loaded from the cache
+        """
+        if cache:
+            data = dmap_cache.get(filename, fields)
+            if data is not None:
+                return data
+        data = pydarn.ColumnarData(self.read_dmap(filename, fields=fields))
+        if cache:
+            dmap_cache.put(filename, data, fields)
+        return data
+
+    def read_dmap_files(self, filenames: Union[str, List[str]],
+                        fields: list = None, columnar: bool = False,
+                        processes: int = None):
+        """
+        Reads many DMap files (e.g. the 2-hour fitacf files of a day) in a
+        process pool, each worker decompresses and parses one file with
+        read_dmap. The records are merged in time order and records
+        repeated at file boundaries (same time, beam and channel) are
+        only kept once. Records without time fields are kept after the
+        timed records in file order.
+
+        Parameters
+        ----------
+            filenames: str or List[str]
+                glob pattern or list of the files (str or paths) to read
+            fields: list
+                names of the fields to keep, None keeps all fields.
+                The time fields, bmnum and channel are always read to merge
+                the records
+                default: None
+            columnar: bool
+                return the records as ColumnarData
+                default: False
+            processes: int
+                number of worker processes, None uses the number of CPUs
+                and 1 reads the files in this process
+                default: None
+
+        Returns
+        ------
+            data: List[dict] or ColumnarData
+                time ordered data records from the files
+        """
+        if isinstance(filenames, str):
+            filenames = sorted(glob(filenames))
+        filenames = [os.fspath(filename) for filename in filenames]
+        if fields is not None:
+            fields = list(fields) + [field for field in MERGE_FIELDS
+                                     if field not in fields]
+        if processes is None:
+            processes = os.cpu_count() or 1
+        processes = min(processes, len(filenames))
+
+        if processes <= 1:
+            file_records = [_read_dmap_file(filename, fields)
+                            for filename in filenames]
+        else:
+            with ProcessPoolExecutor(processes) as executor:
+                file_records = list(executor.map(_read_dmap_file, filenames,
+                                                 [fields] * len(filenames)))
+
+        # stable sort keeps the file order of records with the same time,
+        # records without a time (None) are sorted last
+        keyed_records = sorted(((record_time(record), i, record)
+                                for i, records in enumerate(file_records)
+                                for record in records),
+                               key=lambda keyed: (keyed[0] is None,
+                                                  keyed[0] or datetime.min,
+                                                  keyed[1]))
+        data = []
+        # file of the first record of each (time, beam, channel), only
+        # repeats from other files are duplicates
+        first_file = {}
+        for time, i, record in keyed_records:
+            key = (time, record.get('bmnum'), record.get('channel'))
+            if time is not None and first_file.setdefault(key, i) != i:
+                continue
+            data.append(record)
+        if columnar:
+            return pydarn.ColumnarData(data)
+        return data
+
+    def iter_dmap(self, filename: str, fields: list = None,
+                  start_time: datetime = None, end_time: datetime = None,
+                  record_filter: Callable = None, copy: bool = True):
+        """
+        Generator reading a DMap file (fitacf, rawacf, iqdat, grid, map)
+        one record at a time, compressed files are decompressed
+        incrementally.
+        Only one record is held in memory and records outside the time
+        window or fields not in fields are skipped without being parsed.
+
+        Note: unlike read_dmap the SuperDARN format checks (missing/extra
+        fields and field types) are not done.
+
+        Parameters
+        ----------
+            filename: string
+                name of the file you are going to read
+            fields: list
+                names of the fields to keep, None keeps all fields
+                default: None
+            start_time: datetime
+                skip records before start_time
+                default: None
+            end_time: datetime
+                skip records after end_time
+                default: None
+            record_filter: Callable
+                function given each record (with only fields) that returns
+                False for records to skip
+                default: None
+            copy: bool
+                copy the arrays out of the file buffer, False gives
+                read-only arrays sharing the record's buffer (faster, but
+                the buffer is kept in memory as long as one array is)
+                default: True
+
+        Yields
+        ------
+            record: dict
+                data record from the file
+        """
+        return iter_records(filename, fields=fields, start_time=start_time,
+                            end_time=end_time, record_filter=record_filter,
+                            copy=copy)
+
+    def follow(self, filename: str, fields: list = None):
+        """
+        Follows a DMap file that is still being written (i.e. a real-time
+        fitacf file). Each call to read() on the returned DmapFollower
+        parses only the records appended since the last call, the first
+        call returns all the records in the file.
+
+        Note: like iter_dmap the SuperDARN format checks are not done.
+
+        Parameters
+        ----------
+            filename: string
+                name of the file you are going to follow
+            fields: list
+                names of the fields to keep, None keeps all fields
+                default: None
+
+        Returns
+        -------
+            follower: DmapFollower
+                follower.read() returns the list of new records
+        """
+        return DmapFollower(filename, fields)
+
+    def read_borealis(self, filename: str, slice_id: int = None,
+                      fields: list = None):
         """
         Reads RAWACF or BFIQ borealis files and converts them to
         an SDARN data format dictionary for plotting.
+        The records are converted in memory, no SDARN file is written.
 
         Parameters
         ----------
@@ -85,19 +295,49 @@ class SuperDARNRead(pydarnio.SDarnRead):
             slice_id: int
                 the Borealis slice id of the file, required if reading Borealis
                 data produced prior to when Borealis v0.5 was released
-
-        Post
-        ----
-            Produces a file named: dmap_file.rawacf, this should be deleted
-            at the end of the file. Requirements for BorealisConvert.
+            fields: list
+                names of the fields to keep in the converted records,
+                None keeps all fields
+                default: None
 
         Raises
         -----
             ValueError - if the file type is not determined in the filename
             then it raises an error that it cannot convert the file.
         """
-        new_filename = 'dmap_file.rawacf'
+        return list(self.iter_borealis(filename, slice_id, fields))
 
+    def iter_borealis(self, filename: str, slice_id: int = None,
+                      fields: list = None):
+        """
+        Generator of the SDARN records of a RAWACF or BFIQ borealis file,
+        each Borealis record is converted when it is reached so only one
+        converted record is held in memory. The Borealis file is still
+        read by pyDARNio.
+
+        Parameters
+        ----------
+            filename: str
+                string name of the file, make sure "rawacf" or "bfiq" is in
+                the name
+            slice_id: int
+                the Borealis slice id of the file, required if reading Borealis
+                data produced prior to when Borealis v0.5 was released
+            fields: list
+                names of the fields to keep in the converted records,
+                None keeps all fields
+                default: None
+
+        Yields
+        ------
+            record: dict
+                SDARN (rawacf or iqdat) record
+
+        Raises
+        -----
+            ValueError - if the file type is not determined in the filename
+            then it raises an error that it cannot convert the file.
+        """
         if 'rawacf' in filename:
             file_type = 'rawacf'
         elif 'bfiq' in filename:
@@ -109,7 +349,9 @@ class SuperDARNRead(pydarnio.SDarnRead):
                              " file in pyDARNio's"
                              " documentation".format(filename))
 
-        converter = pydarnio.BorealisConvert(filename, file_type,
-                                             new_filename, slice_id)
-        os.remove(new_filename)
-        return converter.sdarn_dict
+        records = iter(BorealisRecords(filename, file_type, slice_id))
+        if fields is None:
+            return records
+        fields = set(fields)
+        return ({key: value for key, value in record.items()
+                 if key in fields} for record in records)
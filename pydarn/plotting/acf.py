@@ -14,7 +14,7 @@ from typing import List
 
 from pydarn import (plot_exceptions, SuperDARNRadars,
                     standard_warning_format, time2datetime,
-                    check_data_type)
+                    times2datetime64, check_data_type)
 
 warnings.formatwarning = standard_warning_format
 
@@ -131,9 +131,10 @@ class ACF():
         scan_count = 0
         re = []
         im = []
-        for record in cls.dmap_data:
+        rec_times = times2datetime64(cls.dmap_data)
+        for i, record in enumerate(cls.dmap_data):
             if record['bmnum'] == beam_num:
-                time = time2datetime(record)
+                time = rec_times[i].astype(datetime)
                 if start_time is not None:
                     if time.day != start_time.day or \
                        time.month != start_time.month or \
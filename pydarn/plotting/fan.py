@@ -42,9 +42,10 @@ from typing import List, Union
 # Third party libraries
 import aacgmv2
 
-from pydarn import (PyDARNColormaps, build_scan, partial_record_warning,
+from pydarn import (PyDARNColormaps, build_scan_index,
+                    partial_record_warning,
                     time2datetime, plot_exceptions, SuperDARNRadars,
-                    Projs, Coords, Hemisphere, RangeEstimation)
+                    Projs, Coords, Hemisphere, RangeEstimation, Filter)
 
 
 class Fan():
@@ -74,7 +75,8 @@ class Fan():
                  colorbar_label: str = '', title: bool = True,
                  boundary: bool = True, projs: Projs = Projs.POLAR,
                  coords: Coords = Coords.AACGM_MLT,
-                 channel: int = 'all', **kwargs):
+                 channel: int = 'all', time_tolerance: float = 1,
+                 filter_settings: dict = {}, **kwargs):
         """
         Plots a radar's Field Of View (FOV) fan plot for the given data and
         scan number
@@ -138,6 +140,15 @@ class Fan():
                 integer indicating which channel to plot or 'all' to
                 plot all channels
                 Default: 'all'
+            time_tolerance: float
+                How close, in seconds, a record time has to be to the
+                scan_index datetime to be matched
+                Default: 1
+            filter_settings: dict or Filter
+                values to filter out, see RTP.plot_range_time, or a
+                Filter of the values to keep. Ground scatter is not
+                filtered
+                Default: {}
             kwargs: key = value
                 Additional keyword arguments to be used in projection plotting
                 and plot_fov for possible keywords, see: projections.axis_polar
@@ -160,51 +171,41 @@ class Fan():
         --------
             plot_fov
         """
-        # Remove all data from dmap_data that is not in chosen channel
-        if channel != 'all':
+        # Get scan numbers for each record of the chosen channel
+        scans = build_scan_index(dmap_data, channel)
+        # If no records exist, advise user that the channel is not used
+        if len(scans.record_numbers) == 0:
             # Get the first channel used in case of no data in given channel
-            opt_channel = dmap_data[0]['channel']
-            dmap_data = [rec for rec in dmap_data if rec['channel'] == channel]
-            # If no records exist, advise user that the channel is not used
-            if not dmap_data:
-                raise plot_exceptions.NoChannelError(channel, opt_channel)
-
-        # Get scan numbers for each record
-        beam_scan = build_scan(dmap_data)
+            raise plot_exceptions.NoChannelError(channel,
+                                                 dmap_data[0]['channel'])
+        first_record = dmap_data[scans.record_numbers[0]]
         scan_time = None
         if isinstance(scan_index, dt.datetime):
-            # loop through dmap_data records, dump a datetime
-            # list where scans start
+            # find the earliest record within the tolerance of the
+            # datetime and plot the scan it is in
             scan_time = scan_index
-            scan_index = 0
-            found_match = False
-            for rec in dmap_data:
-                rec_time = time2datetime(rec)
-                if abs(rec['scan']) == 1:
-                    scan_index += 1
-                # Need the abs since you cannot have negative seconds
-                diff_time = abs(scan_time - rec_time)
-                if diff_time.seconds < 1:
-                    found_match = True
-                    break
+            tolerance = dt.timedelta(seconds=time_tolerance)
+            scan_index = scans.find(scan_time - tolerance,
+                                    scan_time + tolerance)
             # handle datetimes out of bounds
-            if found_match is False:
-                raise plot_exceptions.IncorrectDateError(rec_time,
-                                                         scan_time)
+            if scan_index < 0:
+                raise plot_exceptions.\
+                    IncorrectDateError(scans.time_index().times[-1].
+                                       astype(dt.datetime), scan_time)
         # Locate scan in loaded data
-        plot_beams = np.where(beam_scan == scan_index)
+        plot_beams = scans.records(scan_index)
         # Time for coordinate conversion
         if not scan_time:
-            date = time2datetime(dmap_data[plot_beams[0][0]])
+            date = time2datetime(dmap_data[plot_beams[0]])
         else:
             date = scan_time
 
         # Plot FOV outline
-        stid = dmap_data[0]['stid']
+        stid = first_record['stid']
         if ranges == [] or ranges is None:
             try:
                 # If not given, get ranges from data file
-                ranges = [0, dmap_data[0]['nrang']]
+                ranges = [0, first_record['nrang']]
             except KeyError:
                 # Otherwise, default to [0,75]
                 ranges = [0, SuperDARNRadars.radars[stid].range_gate_45]
@@ -213,12 +214,12 @@ class Fan():
         # of 180 km for frang and 45 km for rsep as these are most commonly
         # used
         try:
-            frang = dmap_data[0]['frang']
+            frang = first_record['frang']
         except KeyError:
             frang = 180
 
         try:
-            rsep = dmap_data[0]['rsep']
+            rsep = first_record['rsep']
         except KeyError:
             rsep = 45
 
@@ -233,7 +234,7 @@ class Fan():
                                                  "/SuperDARN/pyDARN")
 
         beam_corners_lats, beam_corners_lons =\
-                coords(stid=dmap_data[0]['stid'],
+                coords(stid=first_record['stid'],
                        rsep=rsep, frang=frang,
                        gates=ranges, date=date,
                        **kwargs)
@@ -275,25 +276,28 @@ class Fan():
         norm = colors.Normalize
         norm = norm(zmin, zmax)
 
-        for i in np.nditer(plot_beams):
+        if filter_settings:
+            # filter all the range gates of the scan at once
+            cell_masks = Filter.compile(filter_settings).\
+                cell_masks(dmap_data, plot_beams)
+        for n, i in enumerate(plot_beams):
             try:
                 # get a list of gates where there is data
-                slist = dmap_data[i.astype(int)]['slist']
+                slist = dmap_data[i]['slist']
                 # get the beam number for the record
-                beam = dmap_data[i.astype(int)]['bmnum']
+                beam = dmap_data[i]['bmnum']
 
                 # Exclude ranges larger than the expected maximum.
                 # This is a temporary fix to manage inconsistencies between the
                 # fitacf files and the hardware files. The issue will be
                 # fully resolved when the `rpos` code is committed.
-                good_data = np.where((slist >= ranges[0]) &
-                                     (slist < ranges[1]))
-                slist = slist[good_data]
-                temp_data = dmap_data[i.astype(int)][parameter][good_data]
-                temp_ground = dmap_data[i.astype(int)]['gflg'][good_data]
-
-                scan[slist-ranges[0], beam] = temp_data
-                grndsct[slist-ranges[0], beam] = temp_ground
+                good_data = (slist >= ranges[0]) & (slist < ranges[1])
+                temp_ground = dmap_data[i]['gflg'][good_data]
+                grndsct[slist[good_data]-ranges[0], beam] = temp_ground
+                if filter_settings:
+                    good_data &= cell_masks[n]
+                temp_data = dmap_data[i][parameter][good_data]
+                scan[slist[good_data]-ranges[0], beam] = temp_data
             # if there is no slist field this means partial record
             except KeyError:
                 partial_record_warning()
@@ -307,7 +311,7 @@ class Fan():
         scan = scan[0:ranges[1]-ranges[0]]
         grndsct = grndsct[0:ranges[1]-ranges[0]]
         # Set up axes in correct hemisphere
-        stid = dmap_data[0]['stid']
+        stid = first_record['stid']
         kwargs['hemisphere'] = SuperDARNRadars.radars[stid].hemisphere
 
         ax, ccrs = projs(date=date, **kwargs)
@@ -335,7 +339,7 @@ class Fan():
             plt.grid()
 
         if boundary:
-            cls.plot_fov(stid=dmap_data[0]['stid'], date=date, ax=ax,
+            cls.plot_fov(stid=first_record['stid'], date=date, ax=ax,
                          ccrs=ccrs, coords=coords, projs=projs, rsep=rsep,
                          frang=frang, ranges=ranges, **kwargs)
 
@@ -352,8 +356,8 @@ class Fan():
             if colorbar_label != '':
                 cb.set_label(colorbar_label)
         if title:
-            start_time = time2datetime(dmap_data[plot_beams[0][0]])
-            end_time = time2datetime(dmap_data[plot_beams[-1][-1]])
+            start_time = time2datetime(dmap_data[plot_beams[0]])
+            end_time = time2datetime(dmap_data[plot_beams[-1]])
             title = cls.__add_title__(start_time, end_time)
             plt.title(title)
         return ax, beam_corners_lats, beam_corners_lons, scan, grndsct
@@ -30,7 +30,8 @@ from typing import List
 import aacgmv2
 
 from pydarn import (PyDARNColormaps, Fan, plot_exceptions,
-    standard_warning_format)
+    standard_warning_format, find_record, Coords, batch_aacgm_coordinates,
+    Filter, plot_vectors)
 
 try:
     from cartopy.mpl import geoaxes
@@ -63,7 +64,7 @@ class Grid():
                   zmax: int = None, colorbar: bool = True,
                   colorbar_label: str = '', title: str = '',
                   len_factor: float = 150.0, ref_vector: int = 300,
-                  **kwargs):
+                  filter_settings: dict = {}, **kwargs):
         """
         Plots a radar's gridded vectors from a GRID file
 
@@ -118,6 +119,10 @@ class Grid():
             ref_vector: int
                 Velocity value to be used for the reference vector, in m/s
                 Default: 300
+            filter_settings: dict or Filter
+                values to filter out, see RTP.plot_range_time, or a
+                Filter of the vectors to keep
+                Default: {}
             kwargs: key=value
                 uses the parameters for plot_fov and projections.axis
         See Also
@@ -145,35 +150,33 @@ class Grid():
 
         # Find the record corresponding to the start time
         if start_time is not None:
-            for record in range(len(dmap_data)):
-                date = dt.datetime(dmap_data[record]['start.year'],
-                                    dmap_data[record]['start.month'],
-                                    dmap_data[record]['start.day'],
-                                    dmap_data[record]['start.hour'],
-                                    dmap_data[record]['start.minute'])
-                time_diff = date - start_time
-                if time_diff.seconds/60 <= time_delta:
-                    break
-            if time_diff.seconds/60 > time_delta:
-                raise plot_exceptions.NoDataFoundError(parameter,
-                                                       start_time=start_time)
+            record = find_record(dmap_data, start_time, time_delta)
+        date = dt.datetime(dmap_data[record]['start.year'],
+                           dmap_data[record]['start.month'],
+                           dmap_data[record]['start.day'],
+                           dmap_data[record]['start.hour'],
+                           dmap_data[record]['start.minute'])
+        if filter_settings:
+            # mask of the grid vectors passing the filter
+            vector_mask = Filter.compile(filter_settings).\
+                cell_masks(dmap_data, [record], 'vector.mlat')[0]
         else:
-            record = 0
-            date = dt.datetime(dmap_data[record]['start.year'],
-                                dmap_data[record]['start.month'],
-                                dmap_data[record]['start.day'],
-                                dmap_data[record]['start.hour'],
-                                dmap_data[record]['start.minute'])
+            vector_mask = slice(None)
 
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
+            # convert the FOVs of all the radars in one batch,
+            # plot_fov then uses the cached coordinates
+            if kwargs.get('coords', Coords.AACGM_MLT) != Coords.GEOGRAPHIC:
+                batch_aacgm_coordinates(dmap_data[record]['stid'], date,
+                                        gates=kwargs.get('ranges'), **kwargs)
             for stid in dmap_data[record]['stid']:
                 _, aacgm_lons, ax, _ =\
                         Fan.plot_fov(stid, date,
                                      ax=ax, **kwargs)
                 try:
-                    data_lons = dmap_data[record]['vector.mlon']
-                    data_lats = dmap_data[record]['vector.mlat']
+                    data_lons = dmap_data[record]['vector.mlon'][vector_mask]
+                    data_lats = dmap_data[record]['vector.mlat'][vector_mask]
                 except KeyError:
                     raise plot_exceptions.PartialRecordsError('vector.mlon')
 
@@ -208,7 +211,7 @@ class Grid():
                 # this may not be the case for wdt and pwr as you need -xtd
                 # option in make_grid
                 try:
-                    data = dmap_data[record][parameter]
+                    data = dmap_data[record][parameter][vector_mask]
                 except KeyError:
                     raise plot_exceptions.UnknownParameterError(parameter,
                                                                 grid=True)
@@ -220,10 +223,7 @@ class Grid():
                 if parameter == "vector.vel.median":
 
                     # Get the azimuths from the data
-                    azm_v = dmap_data[record]['vector.kvect']
-
-                    # Number of data points
-                    num_pts = range(len(data))
+                    azm_v = dmap_data[record]['vector.kvect'][vector_mask]
 
                     # Angle to "rotate" each vector by to get into same
                     # reference frame Controlled by longitude, or "mltitude"
@@ -254,10 +254,8 @@ class Grid():
                     end_thetas = np.arctan2(end_pos_y, end_pos_x)
 
                     # Plot the vectors
-                    for i in num_pts:
-                        plt.plot([thetas[i], end_thetas[i]],
-                                 [rs[i], end_rs[i]], c=cmap(norm(data[i])),
-                                 linewidth=0.5)
+                    plot_vectors(thetas, rs, end_thetas, end_rs, data,
+                                 cmap, norm, ax=ax, linewidth=0.5)
 
                 # TODO: Add a velocity reference vector
 
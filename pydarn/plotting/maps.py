@@ -30,7 +30,6 @@ import warnings
 from enum import Enum
 from matplotlib import ticker, cm, colors
 from mpl_toolkits.axes_grid.inset_locator import InsetPosition
-from scipy import special
 from typing import List
 
 # Third party libraries
@@ -38,7 +37,9 @@ import aacgmv2
 
 from pydarn import (PyDARNColormaps, plot_exceptions,
                     standard_warning_format, Re, Hemisphere,
-                    time2datetime, find_record, Fan, MapParams)
+                    time2datetime, find_record, Fan, MapParams, Coords,
+                    batch_aacgm_coordinates, potential_basis,
+                    efield_basis, harmonic_basis_cache, plot_vectors)
 
 warnings.formatwarning = standard_warning_format
 
@@ -51,6 +52,9 @@ class Maps():
     -------
     plot_maps
     calculated_fitted_velocities
+    calculated_fitted_velocities_batch
+    calculate_potentials
+    calculate_potentials_batch
     """
 
     def __str__(self):
@@ -167,6 +171,11 @@ class Maps():
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             # TODO: Make FOV outlines optional or invisible
+            # convert the FOVs of all the radars in one batch,
+            # plot_fov then uses the cached coordinates
+            if kwargs.get('coords', Coords.AACGM_MLT) != Coords.GEOGRAPHIC:
+                batch_aacgm_coordinates(dmap_data[record]['stid'], date,
+                                        gates=kwargs.get('ranges'), **kwargs)
             for stid in dmap_data[record]['stid']:
                 _, aacgm_lons, ax, _ =\
                         Fan.plot_fov(stid, date, ax=ax, boundary=boundary,
@@ -254,11 +263,9 @@ class Maps():
             
             end_mlats=end_mlats * hemisphere.value
 
-            # Plot the vectomlats
-            for i in range(len(v_mag)):
-                plt.plot([mlons[i], end_mlons[i]],
-                         [mlats[i], end_mlats[i]], c=cmap(norm(v_mag[i])),
-                         linewidth=0.5, zorder=5.0)
+            # Plot the vectors
+            plot_vectors(mlons, mlats, end_mlons, end_mlats, v_mag, cmap,
+                         norm, ax=ax, linewidth=0.5, zorder=5.0)
         plt.scatter(mlons, mlats, c=v_mag, s=2.0,
                     vmin=zmin, vmax=zmax,  cmap=cmap, zorder=5.0)
 
@@ -382,140 +389,112 @@ class Maps():
                 length of the vector socks multiplied by
                 default: 150
         """
+        fit_coefficient = np.reshape(fit_coefficient, (-1, 1))
+        velocity_fit_vectors = \
+            cls.__fitted_velocity_vectors(mlats, mlons, fit_coefficient,
+                                          fit_order, lat_min)
+        return cls.__velocity_azimuths(velocity_fit_vectors[:, :, 0],
+                                       hemisphere)
+
+    @classmethod
+    def calculated_fitted_velocities_batch(cls, mlats: list, mlons: list,
+                                           fit_coefficients: list,
+                                           hemisphere: list =
+                                           Hemisphere.North,
+                                           fit_order: list = 6,
+                                           lat_min: list = 60):
+        """
+        Calculates the fitted velocities of many map records, records with
+        the same fit order, lat_min and positions are evaluated together
+
+        Parameters
+        ----------
+            mlats: List[float] or List[List[float]]
+                Magnetic Latitude in degrees, of all the records or one
+                array per record
+            mlons: List[float] or List[List[float]]
+                Magnetic Longitude in radians, of all the records or one
+                array per record
+            fit_coefficients: List[List[float]]
+                N+2 coefficients of each record
+            hemisphere: Enum or List[Enum]
+                hemisphere of all the records or of each record
+                default: Hemisphere.North
+            fit_order: int or List[int]
+                order of the fit of all the records or of each record
+                default: 6
+            lat_min: float or List[float]
+                Lower latitude boundary of data in degrees of all the
+                records or of each record
+                default: 60
+
+        Returns
+        -------
+            velocities: List[Tuple[np.ndarray, np.ndarray]]
+                velocity and azm_v of each record, as returned by
+                calculated_fitted_velocities
+        """
+        num_records = len(fit_coefficients)
+        hemispheres, fit_orders, lat_mins = \
+            cls.__per_record(num_records, hemisphere, fit_order, lat_min)
+        # a single array of positions is shared by all the records
+        shared = np.ndim(mlats[0]) == 0
+        positions = [(np.asarray(mlats if shared else mlats[i], dtype=float),
+                      np.asarray(mlons if shared else mlons[i], dtype=float))
+                     for i in range(num_records)]
+
+        groups = {}
+        for i in range(num_records):
+            key = harmonic_basis_cache.key('positions', fit_orders[i],
+                                           lat_mins[i], *positions[i])
+            groups.setdefault(key, []).append(i)
+
+        velocities = [None] * num_records
+        for indices in groups.values():
+            i = indices[0]
+            num_coefficients = (fit_orders[i] + 1)**2
+            coefficients = np.stack([np.ravel(fit_coefficients[j])
+                                     [:num_coefficients]
+                                     for j in indices], axis=1)
+            velocity_fit_vectors = \
+                cls.__fitted_velocity_vectors(*positions[i], coefficients,
+                                              fit_orders[i], lat_mins[i])
+            for n, j in enumerate(indices):
+                velocities[j] = cls.__velocity_azimuths(
+                    velocity_fit_vectors[:, :, n], hemispheres[j])
+        return velocities
+
+    @staticmethod
+    def __per_record(num_records: int, hemisphere, fit_order, lat_min):
+        """ hemisphere, fit order and lat_min of each record """
+        if isinstance(hemisphere, Hemisphere) or np.ndim(hemisphere) == 0:
+            hemisphere = [hemisphere] * num_records
+        hemispheres = [Hemisphere(value) for value in hemisphere]
+        fit_orders = np.broadcast_to(fit_order, num_records).astype(int)
+        lat_mins = np.broadcast_to(lat_min, num_records).astype(float)
+        return hemispheres, fit_orders, lat_mins
+
+    @classmethod
+    def __fitted_velocity_vectors(cls, mlats: list, mlons: list,
+                                  fit_coefficients: np.ndarray,
+                                  fit_order: int, lat_min: float):
+        """
+        Velocity vector components of the fits at the positions, each
+        column of fit_coefficients is the fit of a record. Returns an
+        array of shape (2, positions, records)
+        """
         # convert earth radius to meters
         Re_meters = Re * 1000.0
         # theta values in radians
-        thetas = np.radians(90.0 - abs(mlats))
-        thetas_max = np.radians(90.0 - abs(lat_min))
-
-        # Angle to "rotate" each vector by to get into same
-        # reference frame Controlled by longitude, or "mltitude"
-        alpha = np.pi / thetas_max
-        thetas_prime = alpha * thetas
-        x = np.cos(thetas_prime)
-
-        # i is the index of the list
-        # x_i is the element of x at ith index
-        for i, x_i in enumerate(x):
-            temp_poly = special.lpmn(fit_order, fit_order, x_i)
-            if i == 0:
-                legendre_poly = np.append([temp_poly[0]], [temp_poly[0]],
-                                          axis=0)
-            else:
-                legendre_poly = np.append(legendre_poly, [temp_poly[0]],
-                                          axis=0)
-        legendre_poly = np.delete(legendre_poly, 0, 0)
-        phi = mlons
-
-        # now do the index legender part,
-        # We are doing Associated Legendre Polynomials but
-        # for each polynomial we have two coefficients one
-        # for cos(phi) and the other for sin(phi),
-        # so we do spherical harmonics for a real valued function using
-        # sin(phi) and cos(phi) rather than exp(i*phi).
-        # we place an inner function to copying code
-
-        # max index value
-        k_max = cls.index_legendre(fit_order, fit_order)
-
-        # set up arrays and small stuff for the E field
-        # coefficients calculation
-        thetas_ecoeffs = np.zeros((k_max + 2, len(thetas)))
-        phi_ecoeffs = np.zeros((k_max + 2, len(thetas)))
-
-        q_prime = np.array(np.where(thetas_prime != 0.0))
-        q_prime = q_prime[0]
-        q = np.array(np.where(thetas != 0.0))
-        q = q[0]
-
-        # finally get to converting coefficients for the potential into
-        # coefficients for elec. Field
-        fit_coefficient_flat = fit_coefficient.flatten()
-        for m in range(fit_order + 1):
-            for l in range(m, fit_order + 1):
-                k3 = cls.index_legendre(l, m)
-                k4 = cls.index_legendre(l, m)
-
-                if k3 >= 0:
-                    thetas_ecoeffs[k4, q_prime] =\
-                            thetas_ecoeffs[k4, q_prime] -\
-                            fit_coefficient_flat[k3] * alpha * l *\
-                            np.cos(thetas_prime[q_prime]) / \
-                            np.sin(thetas_prime[q_prime]) / Re_meters
-                    phi_ecoeffs[k4, q] = phi_ecoeffs[k4, q] - \
-                        fit_coefficient_flat[k3 + 1] * m /\
-                        np.sin(thetas[q]) / Re_meters
-                    phi_ecoeffs[k4 + 1, q] = phi_ecoeffs[k4 + 1, q] + \
-                        fit_coefficient_flat[k3] * m /\
-                        np.sin(thetas[q]) / Re_meters
-
-                if l < fit_order:
-                    k1 = cls.index_legendre(l+1, m)
-                else:
-                    k1 = -1
-
-                k2 = cls.index_legendre(l, m)
-
-                if k1 >= 0:
-                    thetas_ecoeffs[k2, q_prime] =\
-                        thetas_ecoeffs[k2, q_prime] + \
-                        fit_coefficient_flat[k1] * alpha * (l + 1 + m) / \
-                        np.sin(thetas_prime[q_prime]) / Re_meters
-
-                if m > 0:
-                    if k3 >= 0:
-                        k3 = k3 + 1
-                    k4 = k4 + 1
-
-                    if k1 >= 0:
-                        k1 = k1 + 1
-                    k2 = k2 + 1
-
-                    if k3 >= 0:
-                        thetas_ecoeffs[k4, q_prime] =\
-                                thetas_ecoeffs[k4, q_prime] \
-                                - fit_coefficient_flat[k3] * alpha * l * \
-                                np.cos(thetas_prime[q_prime]) / \
-                                np.sin(thetas_prime[q_prime]) / Re_meters
-
-                    if k1 >= 0:
-                        thetas_ecoeffs[k2, q_prime] = \
-                            thetas_ecoeffs[k2, q_prime] \
-                            + fit_coefficient_flat[k1] * alpha *\
-                            (l + 1 + m) / np.sin(thetas_prime[q_prime]) /\
-                            Re_meters
-
-        # Calculate the Electric field positions
-        thetas_ecomp = np.zeros(thetas.shape)
-        phi_ecomp = np.zeros(thetas.shape)
-
-        for m in range(fit_order + 1):
-            for l in range(m, fit_order + 1):
-                k = cls.index_legendre(l, m)
-                # Now in the IDL code we use
-                # legendre_poly[:,l,m] instead of
-                # legendre_poly[:,m,l] like here, this is
-                # because we have a different
-                # organization of legendre_poly due to the
-                # way scipy.special.lpmn
-                # stores values in arrays...
-                if m == 0:
-                    thetas_ecomp = thetas_ecomp + thetas_ecoeffs[k, :] * \
-                            legendre_poly[:, m, l]
-                    phi_ecomp = phi_ecomp + phi_ecoeffs[k, :] * \
-                        legendre_poly[:, m, l]
-                else:
-                    thetas_ecomp = thetas_ecomp + thetas_ecoeffs[k, :] * \
-                        legendre_poly[:, m, l] * np.cos(m * phi) + \
-                        thetas_ecoeffs[k+1, :] * legendre_poly[:, m, l] * \
-                        np.sin(m * phi)
-                    phi_ecomp = phi_ecomp + phi_ecoeffs[k, :] * \
-                        legendre_poly[:, m, l] * np.cos(m * phi) + \
-                        phi_ecoeffs[k+1, :] * legendre_poly[:, m, l] * \
-                        np.sin(m * phi)
-
-        # Store the two components of Efield into a single array
-        E_field_fit = np.append([thetas_ecomp], [phi_ecomp], axis=0)
+        thetas = np.radians(90.0 - abs(np.asarray(mlats)))
+
+        # Electric field basis matrices of the points, the E field
+        # of every record is then a matrix product with its coefficients
+        thetas_ebasis, phi_ebasis = \
+            efield_basis(fit_order, lat_min, mlats, mlons, Re_meters)
+        fit_coefficients = fit_coefficients[:thetas_ebasis.shape[1]]
+        thetas_ecomp = thetas_ebasis @ fit_coefficients
+        phi_ecomp = phi_ebasis @ fit_coefficients
 
         # We'll calculate Bfield magnitude now, need to initialize some more
         # stuff
@@ -527,9 +506,13 @@ class Maps():
             * np.sqrt(3.0 * np.square(np.cos(thetas)) + 1.0) / 2
 
         # get the velocity components from E-field
-        velocity_fit_vectors = np.zeros(E_field_fit.shape)
-        velocity_fit_vectors[0, :] = E_field_fit[1, :] / B_field
-        velocity_fit_vectors[1, :] = -E_field_fit[0, :] / B_field
+        return np.stack([phi_ecomp / B_field[:, np.newaxis],
+                         -thetas_ecomp / B_field[:, np.newaxis]])
+
+    @staticmethod
+    def __velocity_azimuths(velocity_fit_vectors: np.ndarray,
+                            hemisphere: Enum):
+        """ magnitudes and azimuths of the velocity vectors of a record """
         velocity = np.sqrt(np.square(velocity_fit_vectors[0, :]) +
                            np.square(velocity_fit_vectors[1, :]))
         velocity_chk_zero_inds = np.where(velocity != 0.0)
@@ -707,80 +690,99 @@ class Maps():
                 default: Hemisphere.North
 
         '''
-        # Lowest latitude to calculate potential to
-        theta_max = np.radians(90-np.abs(lat_min)) * hemisphere.value
+        mlat_center, mlon_center = cls.__potential_grid(lowlat)
 
-        # Make a grid of the space the potential is evaluated on
-        # in magnetic coordinates
-        lat_step = 1
-        lon_step = 2
-        num_lats = int((90.0 - lowlat) / lat_step) + 1
-        num_lons = int(360.0 / lon_step) + 1
-        lat_arr = np.array(range(num_lats)) * lat_step + lowlat
-        lon_arr = np.array(range(num_lons)) * lon_step
-
-        # Set up Grid
-        grid_arr = np.zeros((2, num_lats * num_lons))
-        count1 = 0
-        for lons in lon_arr:
-            for lats in lat_arr:
-                grid_arr[0, count1] = lats
-                grid_arr[1, count1] = lons
-                count1 += 1
-
-        # Convert grid vals to spherical coords
-        theta = np.radians(90.0 - np.abs(grid_arr[0, :]))
-        phi = np.radians(grid_arr[1, :])
-
-        # Adjusted/Normalised values (runs 0 - pi)
-        alpha = np.pi / theta_max
-        x = np.cos(alpha*theta)
-
-        # Legendre Polys
-        for j, xj in enumerate(x):
-            plm_tmp = special.lpmn(fit_order, fit_order, xj)
-            if j == 0:
-                plm_fit = np.append([plm_tmp[0]], [plm_tmp[0]], axis=0)
-            else:
-                plm_fit = np.append(plm_fit, [plm_tmp[0]], axis=0)
-        # Remove first element as it is duplicated to start off the array
-        plm_fit = np.delete(plm_fit, 0, 0)
+        # Basis of the spherical harmonics on the grid (0 below the
+        # latmin), the same grid and fit reuse the cached basis
+        basis = potential_basis(fit_order, lat_min, mlat_center,
+                                np.radians(mlon_center))
 
         # Eval the potential
-        lmax = plm_fit.shape
-        lmax = lmax[1]
-        v = np.zeros(phi.shape)
-
-        coeff_fit_flat = fit_coefficient.flatten()
-        for m in range(lmax):
-            for l in range(m, lmax):
-                k = cls.index_legendre(l, m)
-                if m == 0:
-                    v = v + coeff_fit_flat[k] * plm_fit[:, 0, l]
-                else:
-                    v = v + coeff_fit_flat[k] * np.cos(m * phi) \
-                          * plm_fit[:, m, l] + coeff_fit_flat[k+1] \
-                          * np.sin(m * phi) * plm_fit[:, m, l]
-
-        pot_arr = np.zeros((num_lons, num_lats))
-        pot_arr = np.reshape(v, pot_arr.shape) / 1000.0
+        coeff_fit_flat = fit_coefficient.flatten()[:basis.shape[1]]
+        pot_arr = (basis @ coeff_fit_flat).reshape(mlat_center.shape) / 1000.0
 
         # TODO: Account for lon_shift
         # TODO: Code for lat shift! (both rarely non-0 though)
         # grid_arr[1,:] = (grid_arr[1,:] + lon_shift)
 
-        mlat_center = grid_arr[0, :].reshape((num_lons, num_lats))
-        # Set everything below the latmin as 0
-        ind = np.where(abs(mlat_center) < abs(lat_min))
-        pot_arr[ind] = 0
-
-        mlon_center = grid_arr[1, :].reshape((num_lons, num_lats))
         # Invert for Southern maps
         mlat_center = mlat_center * hemisphere.value
 
         return mlat_center, mlon_center, pot_arr
 
 
+    @classmethod
+    def calculate_potentials_batch(cls, fit_coefficients: list,
+                                   lat_min: list, fit_order: list = 6,
+                                   lowlat: int = 60,
+                                   hemisphere: list = Hemisphere.North):
+        '''
+        Calculates the potentials of many map records on the magnetic
+        lat/lon grid of calculate_potentials. Records with the same fit
+        order and lat_min share a basis and are evaluated with one matrix
+        product, i.e. for cross polar cap potential time series
+
+        Parameters
+        ----------
+            fit_coefficients: List[List[float]]
+                N+2 coefficients of each record
+            lat_min: float or List[float]
+                Minimum latitude that will be evaluated of all the records
+                or of each record
+            fit_order: int or List[int]
+                order of the fit of all the records or of each record
+                default: 6
+            lowlat: int
+                Lowest latitude of the grid
+                default: 60
+            hemisphere: Enum or List[Enum]
+                hemisphere of all the records or of each record
+                default: Hemisphere.North
+
+        Returns
+        -------
+            mlat_center: np.ndarray
+                (num_lons, num_lats) latitudes of the grid, northern
+                latitudes (negate them for southern records)
+            mlon_center: np.ndarray
+                (num_lons, num_lats) longitudes of the grid
+            pot_arr: np.ndarray
+                (records, num_lons, num_lats) potentials in kV
+        '''
+        num_records = len(fit_coefficients)
+        _, fit_orders, lat_mins = \
+            cls.__per_record(num_records, hemisphere, fit_order, lat_min)
+        mlat_center, mlon_center = cls.__potential_grid(lowlat)
+        pot_arr = np.zeros((num_records,) + mlat_center.shape)
+
+        groups = {}
+        for i in range(num_records):
+            groups.setdefault((fit_orders[i], lat_mins[i]), []).append(i)
+        for (group_order, group_lat_min), indices in groups.items():
+            basis = potential_basis(group_order, group_lat_min, mlat_center,
+                                    np.radians(mlon_center))
+            coefficients = np.stack([np.ravel(fit_coefficients[i])
+                                     [:basis.shape[1]]
+                                     for i in indices], axis=1)
+            potentials = (basis @ coefficients).T / 1000.0
+            pot_arr[indices] = potentials.reshape((len(indices),) +
+                                                  mlat_center.shape)
+        return mlat_center, mlon_center, pot_arr
+
+    @staticmethod
+    def __potential_grid(lowlat: int):
+        """
+        Grid of the space the potential is evaluated on in magnetic
+        coordinates, (num_lons, num_lats) with latitude changing fastest
+        """
+        lat_step = 1
+        lon_step = 2
+        num_lats = int((90.0 - lowlat) / lat_step) + 1
+        num_lons = int(360.0 / lon_step) + 1
+        lat_arr = np.arange(num_lats) * lat_step + lowlat
+        lon_arr = np.arange(num_lons) * lon_step
+        return np.meshgrid(lat_arr, lon_arr)
+
     @classmethod
     def plot_potential_contours(cls, fit_coefficient: list, lat_min: list,
                                 date: object, lat_shift: int = 0,
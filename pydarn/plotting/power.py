@@ -1,6 +1,5 @@
 #  Copyright (C) 2020 SuperDARN Canada, University of Saskatchewan
 #  Author: Cooper Ross Robertson, Summer Student 2020, Marina Schmidt
-import copy
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -296,8 +295,9 @@ class Power():
             NoDataFound: when no data is found within the comparison
         """
 
-        # deep copy so we don't modify the original records
-        records_of_interest = copy.deepcopy(records)
+        # copy the records so we don't modify the original records,
+        # pwr0 is replaced below so the arrays do not need to be copied
+        records_of_interest = [dict(record) for record in records]
 
         # tfreq greater than frequency
         if operand == '>':
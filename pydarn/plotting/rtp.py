@@ -32,13 +32,23 @@ from datetime import datetime, timedelta
 from matplotlib import dates, colors, cm, ticker
 from typing import List
 
-from pydarn import (RangeEstimation, check_data_type,
-                    time2datetime, rtp_exceptions, plot_exceptions,
-                    SuperDARNCpids, SuperDARNRadars,
-                    standard_warning_format, PyDARNColormaps)
+from pydarn import (RangeEstimation, build_range_time, RangeTimeBuffer,
+                    ColumnarData, to_columnar, time2datetime, fill_gaps,
+                    rtp_exceptions, plot_exceptions, SuperDARNCpids,
+                    SuperDARNRadars, standard_warning_format,
+                    PyDARNColormaps)
 
 warnings.formatwarning = standard_warning_format
 
+# colour scale of the parameters used when the data has no finite limits
+DEFAULT_RANGES = {'noise.sky': (1e0, 1e5),
+                  'tfreq': (8, 22),
+                  'nave': (0, 60),
+                  'p_l': (0, 45),
+                  'v': (-200, 200),
+                  'w_l': (0, 250),
+                  'elv': (0, 45)}
+
 
 class RTP():
     """
@@ -80,7 +90,9 @@ class RTP():
                         norm=colors.Normalize, cmap: str = None,
                         filter_settings: dict = {},
                         date_fmt: str = '%y/%m/%d\n %H:%M',
-                        round_start: bool = True, **kwargs):
+                        round_start: bool = True, append: bool = False,
+                        gap_resolution: timedelta = timedelta(minutes=2),
+                        **kwargs):
         """
         Plots a range-time parameter plot of the given
         field name in the dmap_data
@@ -158,7 +170,8 @@ class RTP():
             https://matplotlib.org/tutorials/colors/colormaps.html
             Default: PyDARNColormaps.PYDARN_VELOCITY
             note: to reverse the color just add _r to the string name
-        plot_filter: dict
+        filter_settings: dict or Filter
+            a Filter of the values to keep (see Filter) or a
             dictionary of the following keys for filtering data out:
             max_array_filter : dict
                 dictionary that contains the key parameter names and the values
@@ -184,6 +197,16 @@ class RTP():
                 option to round the start time to give tick at start of xaxis
                 Set True to round, set False to plot from start of data.
                 Default: True
+        append: bool
+            continue the range-time plot already on ax with the records
+            that came after it (i.e. from SuperDARNRead.follow). Only the
+            new records are drawn, no colorbar is created and zmin, zmax,
+            cmap and norm default to the ones of the plot on ax.
+            Default: False
+        gap_resolution: timedelta
+            records more than gap_resolution apart are not joined, the
+            data gap is left empty
+            Default: 2 minutes
         kwargs:
             used for other methods in pyDARN
                 - reflection_height
@@ -222,180 +245,79 @@ class RTP():
             https://matplotlib.org/3.1.1/api/_as_gen/matplotlib.pyplot.pcolormesh.html
 
         """
-        # Settings
-        plot_filter = {'min_array_filter': dict(),
-                       'max_array_filter': dict(),
-                       'min_scalar_filter': dict(),
-                       'max_scalar_filter': dict(),
-                       'equal_scalar_filter': dict()}
-
-        plot_filter.update(filter_settings)
-
         # If an axes object is not passed in then store
         # the equivalent object in matplotlib. This allows
         # for variant matplotlib plotting styles.
         if not ax:
             ax = plt.gca()
 
-        # Determine if a DmapRecord was passed in, instead of a list
-        try:
-            # because of partial records we need to find the first
-            # record that has that parameter
-            index_first_match = next(i for i, d in enumerate(dmap_data)
-                                     if parameter in d)
-        except StopIteration:
-            raise plot_exceptions.UnknownParameterError(parameter)
         cls.dmap_data = dmap_data
-        check_data_type(cls.dmap_data, parameter, 'array', index_first_match)
         start_time, end_time = cls.__determine_start_end_time(start_time,
                                                               end_time)
-
-        # y-axis coordinates, i.e., range gates,
-        # TODO: implement variant other coordinate systems for the y-axis
-        # y shape needs to be +1 longer as requirement of how pcolormesh
-        # draws the pixels on the grid
-
-        # because nrang can change based on mode we need to look
-        # for the largest value
-        y_max = max(record['nrang'] for record in cls.dmap_data)
-        y = np.arange(0, y_max+1, 1)
-
-        # z: parameter data mapped into the color mesh
-        z = np.zeros((1, y_max)) * np.nan
-
         # x: time date data
-        x = []
+        # y: range gates or range estimation, y is +1 longer than z as
+        #    requirement of how pcolormesh draws the pixels on the grid
+        # z: parameter data mapped into the color mesh
+        x, y, z = build_range_time(dmap_data, parameter=parameter,
+                                   beam_num=beam_num, channel=channel,
+                                   start_time=start_time, end_time=end_time,
+                                   groundscatter=groundscatter,
+                                   filter_settings=filter_settings,
+                                   range_estimation=range_estimation,
+                                   gap_resolution=gap_resolution,
+                                   **kwargs)
+
+        if append:
+            meshes = [mesh for mesh in ax.collections
+                      if mesh.get_gid() == 'range time']
+            plot_end = dates.num2date(ax.get_xlim()[1]).replace(tzinfo=None)
+            if meshes and \
+                    timedelta(0) < x[0] - plot_end <= gap_resolution:
+                # the last record of the plot lasts until the first new
+                # record (unless there is a data gap in between), the
+                # mesh data is range x time
+                last_column = meshes[-1].get_array()
+                if np.size(last_column) % z.shape[1] == 0:
+                    last_column = np.ma.reshape(last_column,
+                                                (z.shape[1], -1))[:, -1]
+                    x.insert(0, plot_end)
+                    z = np.vstack([np.ma.filled(last_column.astype(float),
+                                                np.nan), z])
+            # use the colour scale of the plot being continued
+            if meshes:
+                if zmin is None and zmax is None:
+                    zmin, zmax = meshes[-1].get_clim()
+                if cmap is None:
+                    cmap = meshes[-1].get_cmap()
+                if norm is colors.Normalize:
+                    norm = type(meshes[-1].norm)
 
         # We cannot simply use numpy's built in min and max function
         # because of the groundscatter value :(
-
-        # These flags indicate if zmin and zmax should change
-        set_zmin = True
-        set_zmax = True
+        first_value = next(d[parameter][0] for d in dmap_data
+                           if parameter in d)
+        data_values = z[~np.isnan(z) & (z != -1000000)]
         if zmin is None:
-            zmin = cls.dmap_data[index_first_match][parameter][0]
-            set_zmin = False
+            zmin = np.min(data_values, initial=first_value)
         if zmax is None:
-            zmax = cls.dmap_data[index_first_match][parameter][0]
-            set_zmax = False
-
-        for dmap_record in cls.dmap_data:
-            # get time difference to test if there is some gap data
-            rec_time = time2datetime(dmap_record)
-            diff_time = 0.0
-            if rec_time > end_time:
-                break
-            if x != []:
-                # 60.0 seconds in a minute
-                delta_diff_time = (rec_time - x[-1])
-                diff_time = delta_diff_time.seconds/60.0
-
-            # separation roughly 2 minutes
-            if diff_time > 2.0:
-                # if there is gap data (no data recorded past 2 minutes)
-                # then fill it in with white space
-                for _ in range(0, int(np.floor(diff_time/2.0))):
-                    x.append(x[-1] + timedelta(0, 120))
-                    i = len(x) - 1  # offset since we start at 0 not 1
-                    if i > 0:
-                        z = np.insert(z, len(z), np.zeros(1, y_max) * np.nan,
-                                      axis=0)
-            # Get data for the provided beam number
-            if (beam_num == 'all' or dmap_record['bmnum'] == beam_num) and\
-               (channel == 'all' or
-                    dmap_record['channel'] == channel):
-                if start_time <= rec_time:
-                    # construct the x-axis array
-                    # Numpy datetime is used because it properly formats on the
-                    # x-axis
-                    x.append(rec_time)
-                    # I do this to avoid having an extra loop to just count how
-                    # many records contain the beam number
-                    i = len(x) - 1  # offset since we start at 0 not 1
-
-                    # insert a new column into the z_data
-                    if i > 0:
-                        z = np.insert(z, len(z), np.zeros(1, y_max) * np.nan,
-                                      axis=0)
-                    try:
-                        if len(dmap_record[parameter]) == dmap_record['nrang']:
-                            good_gates = range(len(dmap_record[parameter]))
-                        else:
-                            good_gates = dmap_record['slist']
-
-                        # get the range gates that have "good" data in it
-                        for j in range(len(good_gates)):
-                            # if it is groundscatter store a very
-                            # low number in that cell
-                            if groundscatter and\
-                               dmap_record['gflg'][j] == 1:
-                                # chosen value from davitpy to make the
-                                # groundscatter a different color
-                                # from the color map
-                                z[i][good_gates[j]] = -1000000
-                            # otherwise store parameter value
-                            # TODO: refactor and clean up this code
-                            elif cls.__filter_data_check(dmap_record,
-                                                         plot_filter, j):
-                                z[i][good_gates[j]] = \
-                                        dmap_record[parameter][j]
-                                # calculate min and max value
-                                if not set_zmin and\
-                                   z[i][good_gates[j]] < zmin:
-                                    zmin = z[i][good_gates[j]]
-                                if not set_zmax and \
-                                   z[i][good_gates[j]] > zmax:
-                                    zmax = z[i][good_gates[j]]
-                    # a KeyError may be thrown because slist is not created
-                    # due to bad quality data.
-                    except KeyError:
-                        continue
-        x.append(end_time)
-        # Check if there is any data to plot
-        if np.all(np.isnan(z)):
-            raise plot_exceptions.\
-                    NoDataFoundError(parameter, beam_num,
-                                     start_time=start_time,
-                                     end_time=end_time,
-                                     opt_beam_num=cls.dmap_data[0]['bmnum'])
-        if range_estimation != RangeEstimation.RANGE_GATE:
-            # Get rxrise from hardware files (consistent with RST)
-            rxrise = SuperDARNRadars.radars[cls.dmap_data[0]['stid']]\
-                                    .hardware_info.rx_rise_time
-            frang = int(cls.dmap_data[0]['frang'])
-            rsep = int(cls.dmap_data[0]['rsep'])
-
-            y = range_estimation(frang=frang, rxrise=rxrise,
-                                 rsep=rsep, nrang=y_max, **kwargs)
-
-            y0inx = np.min(np.where(np.isfinite(y))[0])
-            y = y[y0inx:]
-            z = z[:, y0inx:]
+            zmax = np.max(data_values, initial=first_value)
 
         time_axis, y_axis = np.meshgrid(x, y)
         z_data = np.ma.masked_where(np.isnan(z.T), z.T)
-        Default = {'noise.sky': (1e0, 1e5),
-                   'tfreq': (8, 22),
-                   'nave': (0, 60),
-                   'p_l': (0, 45),
-                   'v': (-200, 200),
-                   'w_l': (0, 250),
-                   'elv': (0, 45)}
-
         if np.isinf(zmin) and zmin < 0:
-            zmin = Default[parameter][0]
+            zmin = DEFAULT_RANGES[parameter][0]
             warnings.warn("Warning: zmin is -inf, set zmin to {}. You can"
                           "set zmin and zmax in the function"
                           " options".format(zmin))
         if np.isinf(zmax) and zmax > 0:
-            zmax = Default[parameter][1]
+            zmax = DEFAULT_RANGES[parameter][1]
             warnings.warn("Warning: zmax is inf, set zmax to {}. You can"
                           "set zmin and zmax in the functions"
                           " options".format(zmax))
         norm = norm(zmin, zmax)
         if isinstance(cmap, str):
             cmap = cm.get_cmap(cmap)
-        else:
+        elif cmap is None:
             # need to do this as matplotlib 3.5 will
             # not all direct mutations of the object
             cmaps = {'p_l': copy.copy(cm.get_cmap('plasma')),
@@ -409,7 +331,7 @@ class RTP():
         cmap.set_bad(color=background, alpha=1.)
         # plot!
         im = ax.pcolormesh(time_axis, y_axis, z_data, lw=0.01,
-                           cmap=cmap, norm=norm, **kwargs)
+                           cmap=cmap, norm=norm, gid='range time', **kwargs)
 
         if isinstance(groundscatter, str):
             ground_scatter = np.ma.masked_where(z_data != -1000000, z_data)
@@ -423,71 +345,79 @@ class RTP():
             ax.pcolormesh(time_axis, y_axis, ground_scatter, lw=0.01,
                           cmap=gs_color, norm=norm, **kwargs)
 
-        # setup some standard axis information
-        if ymax is None:
-            ymax = np.max(y)
+        if append:
+            # keep the axes of the plot being continued, only extend
+            # the x-axis to the new records
+            ax.set_xlim([dates.num2date(ax.get_xlim()[0]).replace(
+                tzinfo=None), x[-1]])
+        else:
+            # setup some standard axis information
+            if ymax is None:
+                ymax = np.max(y)
 
-        if ymin is None:
-            ymin = np.min(y)
+            if ymin is None:
+                ymin = np.min(y)
 
-        ax.set_ylim(ymin, ymax)
+            ax.set_ylim(ymin, ymax)
 
-        if range_estimation != RangeEstimation.RANGE_GATE:
-            ax.yaxis.set_ticks(np.arange(np.ceil(ymin/100.0)*100,
-                                         ymax+1, yspacing))
-        else:
-            ax.yaxis.set_ticks(np.arange(ymin, ymax+1, (ymax)/5))
-
-        # SuperDARN file typically are in 2hr or 24 hr files
-        # to make the minute ticks sensible, the time length is detected
-        # then a interval is picked. 30 minute ticks for 24 hr plots
-        # and 5 minute ticks for 2 hour plots.
-        data_time_length = end_time - start_time
-        # 3 hours * 60 minutes * 60 seconds
-        if data_time_length.total_seconds() > 3*60*60:
-            tick_interval = 30
-        else:
-            tick_interval = 1
-        # byminute keyword makes sure that the ticks are situated at
-        # the minute or half hour marks, rather than at a set interval
-        ax.xaxis.set_minor_locator(
-            dates.MinuteLocator(byminute=range(0, 60, tick_interval)))
-
-        # Upon request of Daniel Billet and others, I am rounding
-        # the time down so the plotting x-axis will show the origin
-        # time label
-        # Updated to give option to round down and make sure
-        # rounding to same frequency as plot axis ticks if less than 1 hour
-        if round_start:
-            major_locator, _ = plt.xticks()
-            dt = dates.num2date(major_locator[1]) -\
-                dates.num2date(major_locator[0])
-            tick_sep = dt.seconds//60
-            if tick_sep > 0:
-                rounded_down_start_time = x[0] -\
-                    timedelta(minutes=x[0].minute % tick_sep,
-                              seconds=x[0].second,
-                              microseconds=x[0].microsecond)
+            if range_estimation != RangeEstimation.RANGE_GATE:
+                ax.yaxis.set_ticks(np.arange(np.ceil(ymin/100.0)*100,
+                                             ymax+1, yspacing))
             else:
-                rounded_down_start_time = x[0] -\
-                    timedelta(minutes=x[0].minute % 15,
-                              seconds=x[0].second,
-                              microseconds=x[0].microsecond)
-        else:
-            rounded_down_start_time = x[0]
+                ax.yaxis.set_ticks(np.arange(ymin, ymax+1, (ymax)/5))
+
+            # SuperDARN file typically are in 2hr or 24 hr files
+            # to make the minute ticks sensible, the time length is detected
+            # then a interval is picked. 30 minute ticks for 24 hr plots
+            # and 5 minute ticks for 2 hour plots.
+            data_time_length = end_time - start_time
+            # 3 hours * 60 minutes * 60 seconds
+            if data_time_length.total_seconds() > 3*60*60:
+                tick_interval = 30
+            else:
+                tick_interval = 1
+            # byminute keyword makes sure that the ticks are situated at
+            # the minute or half hour marks, rather than at a set interval
+            ax.xaxis.set_minor_locator(
+                dates.MinuteLocator(byminute=range(0, 60, tick_interval)))
+
+            # Upon request of Daniel Billet and others, I am rounding
+            # the time down so the plotting x-axis will show the origin
+            # time label
+            # Updated to give option to round down and make sure
+            # rounding to same frequency as plot axis ticks if less than 1 hour
+            if round_start:
+                major_locator, _ = plt.xticks()
+                dt = dates.num2date(major_locator[1]) -\
+                    dates.num2date(major_locator[0])
+                tick_sep = int(dt.total_seconds()//60)
+                if tick_sep > 0:
+                    rounded_down_start_time = x[0] -\
+                        timedelta(minutes=x[0].minute % tick_sep,
+                                  seconds=x[0].second,
+                                  microseconds=x[0].microsecond)
+                else:
+                    rounded_down_start_time = x[0] -\
+                        timedelta(minutes=x[0].minute % 15,
+                                  seconds=x[0].second,
+                                  microseconds=x[0].microsecond)
+            else:
+                rounded_down_start_time = x[0]
 
-        ax.set_xlim([rounded_down_start_time, x[-1]])
-        ax.xaxis.set_major_formatter(dates.DateFormatter(date_fmt))
+            ax.set_xlim([rounded_down_start_time, x[-1]])
+            ax.xaxis.set_major_formatter(dates.DateFormatter(date_fmt))
 
-        if range_estimation != RangeEstimation.RANGE_GATE:
-            ax.yaxis.set_minor_locator(ticker.AutoMinorLocator(2))
-        else:
-            ax.yaxis.set_minor_locator(ticker.MultipleLocator(5))
-        # so the plots gets to the ends
-        ax.margins(0)
+            if range_estimation != RangeEstimation.RANGE_GATE:
+                ax.yaxis.set_minor_locator(ticker.AutoMinorLocator(2))
+            else:
+                ax.yaxis.set_minor_locator(ticker.MultipleLocator(5))
+            # so the plots gets to the ends
+            ax.margins(0)
 
         # create color bar if True
-        if not colorbar:
+        if colorbar or append:
+            cb = colorbar
+        else:
             with warnings.catch_warnings():
                 warnings.filterwarnings('error')
                 try:
@@ -506,7 +436,7 @@ class RTP():
                     raise rtp_exceptions.RTPZeroError(parameter, beam_num,
                                                       zmin, zmax,
                                                       norm) from None
-        if colorbar_label != '':
+        if colorbar_label != '' and cb is not None:
             cb.set_label(colorbar_label)
         return im, cb, cmap, x, y, z_data
 
@@ -519,7 +449,9 @@ class RTP():
                          channel='all', scale: str = 'linear',
                          cp_name: bool = True, color: str = 'black',
                          linestyle: str = '-', linewidth: float = 1,
-                         round_start: bool = True, **kwargs):
+                         round_start: bool = True, append: bool = False,
+                         gap_resolution: timedelta = timedelta(minutes=2),
+                         **kwargs):
         """
         Plots the time series of a scalar parameter
 
@@ -561,6 +493,16 @@ class RTP():
                 option to round the start time to give tick at start of xaxis
                 Set True to round, set False to plot from start of data.
                 Default: True
+        append: bool
+            continue the time series already on ax with the records that
+            came after it (i.e. from SuperDARNRead.follow), only the new
+            records are drawn with the line style and y-scale of the time
+            series on ax
+            Default: False
+        gap_resolution: timedelta
+            the line is broken between records more than gap_resolution
+            apart
+            Default: 2 minutes
         color: str
             color of the line
             default: black
@@ -621,51 +563,64 @@ class RTP():
         y = []
         # date time
         x = []
+        data = to_columnar(dmap_data, fields=[parameter, 'slist', 'bmnum',
+                                              'channel'] +
+                           ColumnarData.TIME_FIELDS)
+        # record times are converted once for all records
+        rec_times = data.times()
+        rec_datetimes = rec_times.astype(datetime)
+        in_window = (rec_times >= np.datetime64(start_time, 'us')) &\
+            (rec_times <= np.datetime64(end_time, 'us'))
+        selected = np.ones(len(data), dtype=bool)
+        if beam_num != 'all':
+            selected &= data.scalar('bmnum') == beam_num
+        if channel != 'all':
+            selected &= data.scalar('channel') == channel
         # plot CPID
         if parameter == 'cp':
             old_cpid = None
-            for dmap_record in cls.dmap_data:
-                # TODO: this check could be a function call
-                x.append(time2datetime(dmap_record))
-
-                if (dmap_record['bmnum'] == beam_num or beam_num == 'all') and\
-                   (dmap_record['channel'] == channel or channel == 'all'):
-                    rec_time = time2datetime(dmap_record)
-                    if start_time <= rec_time and rec_time <= end_time:
-                        if old_cpid != dmap_record['cp'] or old_cpid is None:
-                            ax.axvline(x=rec_time, color='black')
-                            old_cpid = dmap_record['cp']
-                            ax.text(x=rec_time + timedelta(seconds=600), y=0.7,
-                                    s=dmap_record['cp'])
-                            if cp_name:
-                                # Keeping this commented code in to show how
-                                # we could get the name from the file; however,
-                                # there is not set format for combf field ...
-                                # so we will use the dictionary to prevent
-                                # errors or incorrect names on the plot.
-                                # However, we should get it from the file
-                                # not a dictionary that might not be updated
-                                # cpid_command =
-                                #   dmap_record['combf'].split(' ')
-                                # if len(cpid_command) == 1:
-                                #     cp_name = cpid_command[0]
-                                # elif len(cpid_command) == 0:
-                                #     cp_name = 'unknown'
-                                # else:
-                                #     cp_name = cpid_command[1]
-                                if dmap_record['cp'] < 0:
-                                    cpID_name = 'discretionary \n{}'\
-                                            ''.format(SuperDARNCpids.cpids.
-                                                      get(abs(
-                                                          dmap_record['cp']),
-                                                          'unknown'))
-                                else:
-                                    cpID_name =\
-                                            SuperDARNCpids.cpids.\
-                                            get(abs(dmap_record['cp']),
-                                                'unknown')
-                                ax.text(x=rec_time + timedelta(seconds=600),
-                                        y=0.1, s=cpID_name)
+            if append:
+                # last control program already marked on the plot
+                cpid_labels = [text for text in ax.texts
+                               if text.get_gid() == 'cpid']
+                if cpid_labels:
+                    old_cpid = int(cpid_labels[-1].get_text())
+            x = rec_datetimes.tolist()
+            cpids = data.scalar('cp')
+            for i in np.flatnonzero(selected & in_window):
+                rec_time = rec_datetimes[i]
+                if old_cpid != cpids[i] or old_cpid is None:
+                    ax.axvline(x=rec_time, color='black')
+                    old_cpid = cpids[i]
+                    ax.text(x=rec_time + timedelta(seconds=600), y=0.7,
+                            s=cpids[i], gid='cpid')
+                    if cp_name:
+                        # Keeping this commented code in to show how
+                        # we could get the name from the file; however,
+                        # there is not set format for combf field ...
+                        # so we will use the dictionary to prevent
+                        # errors or incorrect names on the plot.
+                        # However, we should get it from the file
+                        # not a dictionary that might not be updated
+                        # cpid_command =
+                        #   dmap_record['combf'].split(' ')
+                        # if len(cpid_command) == 1:
+                        #     cp_name = cpid_command[0]
+                        # elif len(cpid_command) == 0:
+                        #     cp_name = 'unknown'
+                        # else:
+                        #     cp_name = cpid_command[1]
+                        if cpids[i] < 0:
+                            cpID_name = 'discretionary \n{}'\
+                                    ''.format(SuperDARNCpids.cpids.
+                                              get(abs(cpids[i]),
+                                                  'unknown'))
+                        else:
+                            cpID_name =\
+                                    SuperDARNCpids.cpids.\
+                                    get(abs(cpids[i]), 'unknown')
+                        ax.text(x=rec_time + timedelta(seconds=600),
+                                y=0.1, s=cpID_name)
 
             # Check if the old cp ID change, if not then there was no data
             if old_cpid is None:
@@ -679,41 +634,36 @@ class RTP():
             # to get rid of y-axis numbers
             ax.set_yticks([])
         else:
-            for dmap_record in cls.dmap_data:
-                # TODO: this check could be a function call
-                rec_time = time2datetime(dmap_record)
-                if start_time <= rec_time and rec_time <= end_time:
-                    if (dmap_record['bmnum'] == beam_num or
-                        beam_num == 'all') and \
-                       (channel == dmap_record['channel'] or channel == 'all'):
-                        # construct the x-axis array
-                        x.append(rec_time)
-                        try:
-                            if parameter == 'tfreq':
-                                # Convert kHz to MHz by dividing by 1000
-                                y.append(dmap_record[parameter]/1000)
-                            elif isinstance(dmap_record[parameter],
-                                            np.ndarray):
-                                if gate in dmap_record['slist']:
-                                    for i in range(len(dmap_record['slist'])):
-                                        if dmap_record['slist'][i] == gate:
-                                            break
-                                    y.append(dmap_record[parameter][i])
-                                else:
-                                    y.append(np.ma.masked)
-                            else:
-                                y.append(dmap_record[parameter])
-                        except KeyError:
-                            y.append(np.ma.masked)
-                    # else plot missing data
-                    elif len(x) > 0:
-                        diff_time = rec_time - x[-1]
-                        # if the time difference is greater than 2 minutes
-                        # meaning no data was collected for that time period
-                        # then plot nothing.
-                        if diff_time.total_seconds() > 2.0 * 60.0:
-                            x.append(rec_time)
-                            y.append(np.nan)  # for masking the data
+            # parameter value of every record, NaN when the record
+            # does not have the parameter (or the gate for array parameters)
+            values = np.full(len(data), np.nan)
+            if data.is_array(parameter):
+                if 'slist' in data.fields:
+                    slist, offsets = data.ragged('slist')
+                    at_gate = np.flatnonzero(slist == gate)
+                    records, first = np.unique(
+                        np.searchsorted(offsets, at_gate, side='right') - 1,
+                        return_index=True)
+                    positions = at_gate[first] - offsets[records]
+                    gate_values, valid = data.gather(parameter, records,
+                                                     positions)
+                    valid &= data.present(parameter)[records]
+                    values[records[valid]] = gate_values[valid]
+            else:
+                has_parameter = data.present(parameter)
+                values[has_parameter] = data.scalar(parameter)[has_parameter]
+                if parameter == 'tfreq':
+                    # Convert kHz to MHz by dividing by 1000
+                    values /= 1000
+
+            # data gaps (no data for more than gap_resolution) are padded
+            # with NaN so the line is not drawn over them
+            plotted = np.flatnonzero(selected & in_window)
+            x_times, index = fill_gaps(rec_times[plotted], gap_resolution)
+            y = np.full(len(x_times), np.nan)
+            y[index] = values[plotted]
+            x = x_times.astype(datetime).tolist()
+            y = y.tolist()
             # Check if there is any data to plot
             if np.all(np.isnan(y)) or len(x) == 0:
                 raise plot_exceptions.\
@@ -723,6 +673,23 @@ class RTP():
                                          opt_beam_num=cls.
                                          dmap_data[0]['bmnum'])
 
+            if append:
+                # connect the new line to the end of the time series
+                # already plotted unless there is a data gap in between
+                series = [line for line in ax.get_lines()
+                          if line.get_gid() == 'time series']
+                if series:
+                    color = series[-1].get_color()
+                    linestyle = series[-1].get_linestyle()
+                    linewidth = series[-1].get_linewidth()
+                if series and len(series[-1].get_xdata()) > 0:
+                    last_x = series[-1].get_xdata()[-1]
+                    if not isinstance(last_x, datetime):
+                        last_x = dates.num2date(last_x).replace(tzinfo=None)
+                    if timedelta(0) < x[0] - last_x <= gap_resolution:
+                        x.insert(0, last_x)
+                        y.insert(0, series[-1].get_ydata()[-1])
+
             # using masked arrays to create gaps in the plot
             # otherwise the lines will connect in gapped data
             my = np.ma.array(y)
@@ -730,13 +697,13 @@ class RTP():
 
             lines = ax.plot_date(x, my, fmt='k', tz=None, xdate=True,
                                  ydate=False, color=color, linestyle=linestyle,
-                                 linewidth=linewidth)
+                                 linewidth=linewidth, gid='time series')
 
             if round_start:
                 major_locator, _ = plt.xticks()
                 dt = dates.num2date(major_locator[1]) -\
                     dates.num2date(major_locator[0])
-                tick_sep = dt.seconds//60
+                tick_sep = int(dt.total_seconds()//60)
                 if tick_sep > 0:
                     rounded_down_start_time = x[0] -\
                         timedelta(minutes=x[0].minute % tick_sep,
@@ -751,48 +718,55 @@ class RTP():
                 rounded_down_start_time = x[0]
 
             ax.set_xlim([rounded_down_start_time, x[-1]])
-            ax.set_yscale(scale)
-
-        # set date format and minor hourly locators
-        # Rounded the time down to show origin label upon
-        # Daniel Billet and others request.
-        # TODO: may move this to its own function
-        if round_start:
-            major_locator, _ = plt.xticks()
-            dt = dates.num2date(major_locator[1]) -\
-                dates.num2date(major_locator[0])
-            tick_sep = dt.seconds//60
-            if tick_sep > 0:
-                rounded_down_start_time = x[0] -\
-                    timedelta(minutes=x[0].minute % tick_sep,
-                              seconds=x[0].second,
-                              microseconds=x[0].microsecond)
-            else:
-                rounded_down_start_time = x[0] -\
-                    timedelta(minutes=x[0].minute % 15,
-                              seconds=x[0].second,
-                              microseconds=x[0].microsecond)
+            if not append:
+                ax.set_yscale(scale)
+
+        if append:
+            # keep the axes of the plot being continued, only extend the
+            # x-axis to the new records
+            ax.set_xlim([dates.num2date(ax.get_xlim()[0]).replace(
+                tzinfo=None), x[-1]])
         else:
-            rounded_down_start_time = x[0]
-
-        ax.set_xlim([rounded_down_start_time, x[-1]])
-
-        ax.xaxis.set_major_formatter(dates.DateFormatter(date_fmt))
-        ax.xaxis.set_minor_locator(dates.HourLocator())
-        # SuperDARN file typically are in 2hr or 24 hr files
-        # to make the minute ticks sensible, the time length is detected
-        # then a interval is picked. 30 minute ticks for 24 hr plots
-        # and 5 minute ticks for 2 hour plots.
-        data_time_length = end_time - start_time
-        # 3 hours * 60 minutes * 60 seconds
-        if data_time_length.total_seconds() > 3*60*60:
-            tick_interval = 30
-        else:
-            tick_interval = 1
-        # byminute keyword makes sure that the ticks are situated at
-        # the minute or half hour marks, rather than at a set interval
-        ax.xaxis.set_minor_locator(
-            dates.MinuteLocator(byminute=range(0, 60, tick_interval)))
+            # set date format and minor hourly locators
+            # Rounded the time down to show origin label upon
+            # Daniel Billet and others request.
+            # TODO: may move this to its own function
+            if round_start:
+                major_locator, _ = plt.xticks()
+                dt = dates.num2date(major_locator[1]) -\
+                    dates.num2date(major_locator[0])
+                tick_sep = int(dt.total_seconds()//60)
+                if tick_sep > 0:
+                    rounded_down_start_time = x[0] -\
+                        timedelta(minutes=x[0].minute % tick_sep,
+                                  seconds=x[0].second,
+                                  microseconds=x[0].microsecond)
+                else:
+                    rounded_down_start_time = x[0] -\
+                        timedelta(minutes=x[0].minute % 15,
+                                  seconds=x[0].second,
+                                  microseconds=x[0].microsecond)
+            else:
+                rounded_down_start_time = x[0]
+
+            ax.set_xlim([rounded_down_start_time, x[-1]])
+
+            ax.xaxis.set_major_formatter(dates.DateFormatter(date_fmt))
+            ax.xaxis.set_minor_locator(dates.HourLocator())
+            # SuperDARN file typically are in 2hr or 24 hr files
+            # to make the minute ticks sensible, the time length is detected
+            # then a interval is picked. 30 minute ticks for 24 hr plots
+            # and 5 minute ticks for 2 hour plots.
+            data_time_length = end_time - start_time
+            # 3 hours * 60 minutes * 60 seconds
+            if data_time_length.total_seconds() > 3*60*60:
+                tick_interval = 30
+            else:
+                tick_interval = 1
+            # byminute keyword makes sure that the ticks are situated at
+            # the minute or half hour marks, rather than at a set interval
+            ax.xaxis.set_minor_locator(
+                dates.MinuteLocator(byminute=range(0, 60, tick_interval)))
 
         ax.margins(x=0)
         ax.tick_params(axis='y', which='minor')
@@ -808,7 +782,8 @@ class RTP():
                      background: str = 'w', groundscatter: bool = True,
                      channel: int = 'all', line_color: dict = {},
                      range_estimation: object =
-                     RangeEstimation.SLANT_RANGE, **kwargs):
+                     RangeEstimation.SLANT_RANGE, append_to: tuple = None,
+                     **kwargs):
         """
         Plots the summary of several SuperDARN parameters using time-series and
         range-time plots. Please see Notes for further description
@@ -881,6 +856,12 @@ class RTP():
             Default: auto-generated by the files details
             {radar name} {Radar system (if applicable)} Fitacf {version}
             {start hour/date} - {end hour/date}  Beam {number}
+        append_to: (matplotlib.pyplot.figure, list)
+            the figure and axes returned by an earlier plot_summary,
+            dmap_data are the records that came after it (i.e. from
+            SuperDARNRead.follow) and only they are drawn on the panels.
+            Panels without new data are left unchanged.
+            Default: None
         kwargs:
             reflection_height for ground_scatter_mapped method
             background
@@ -923,6 +904,14 @@ class RTP():
                   " adjusted when saving the file."
         warnings.warn(message)
 
+        if append_to is not None:
+            fig, axes = append_to
+            cls.__append_summary(dmap_data, axes, beam_num=beam_num,
+                                 title=title, groundscatter=groundscatter,
+                                 channel=channel,
+                                 range_estimation=range_estimation, **kwargs)
+            return fig, axes
+
         # Default boundary ranges for the various parameter
         boundary_ranges = {'noise.search': (1e0, 1e5),
                            'noise.sky': (1e0, 1e5),
@@ -962,6 +951,10 @@ class RTP():
         else:
             cmap.update({k: cmaps for k, v in cmap.items()})
 
+        # convert to columnar data once so the record times and
+        # fields are shared by all the panels
+        dmap_data = to_columnar(dmap_data)
+
         fig = plt.figure(figsize=figsize)
 
         # axes objects in order of creation:
@@ -972,7 +965,7 @@ class RTP():
             # need to use any because some records at the start
             # can be partial which doesn't mean there is no elv
             # data
-            if any('elv' in d for d in dmap_data) and plot_elv:
+            if dmap_data.present('elv').any() and plot_elv:
                 num_plots = 7
             else:
                 num_plots = 6
@@ -1185,6 +1178,55 @@ class RTP():
 
         return fig, axes
 
+    @classmethod
+    def __append_summary(cls, dmap_data: List[dict], axes: list,
+                         beam_num: int, title: str, groundscatter: bool,
+                         channel: int, range_estimation: RangeEstimation,
+                         **kwargs):
+        """
+        Draws the records that came after a summary plot on its panels,
+        see plot_summary's append_to
+        """
+        # nave is plotted on the twin axes of the frequency panel
+        nave_ax = next(ax for ax in
+                       axes[1].get_shared_x_axes().get_siblings(axes[1])
+                       if ax is not axes[1])
+        panels = [(axes[0], 'noise.sky'), (axes[1], 'tfreq'),
+                  (nave_ax, 'nave'), (axes[2], 'cp')] +\
+            list(zip(axes[3:], ['p_l', 'v', 'w_l', 'elv']))
+        dmap_data = to_columnar(dmap_data)
+        x = None
+        for ax, parameter in panels:
+            # panels are left unchanged when there is no new data
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                try:
+                    if ax in axes[:3] or ax is nave_ax:
+                        cls.plot_time_series(dmap_data, beam_num=beam_num,
+                                             parameter=parameter,
+                                             channel=channel, ax=ax,
+                                             append=True, **kwargs)
+                    else:
+                        _, _, _, x, _, _ =\
+                            cls.plot_range_time(
+                                dmap_data, beam_num=beam_num,
+                                channel=channel, parameter=parameter,
+                                ax=ax, groundscatter=groundscatter and
+                                parameter == 'v',
+                                range_estimation=range_estimation,
+                                append=True, **kwargs)
+                except plot_exceptions.NoDataFoundError:
+                    continue
+        if title is None and x is not None:
+            # the plot starts at the first range-time data
+            start_time = dates.num2date(axes[3].dataLim.x0).\
+                replace(tzinfo=None)
+            title_ax = next((ax for ax in [nave_ax] + axes
+                             if ax.get_title()), axes[-1])
+            title_ax.set_title(cls.__generate_title(start_time, x[-1],
+                                                    beam_num, channel),
+                               y=2.4)
+
     @classmethod
     def __generate_title(cls, start_time: datetime, end_time: datetime,
                          beam_num: int, channel: int) -> str:
@@ -1228,55 +1270,6 @@ class RTP():
             title_format += " channel {ch_num}".format(ch_num=channel)
         return title_format
 
-    @classmethod
-    # TODO: could parallelize this method
-    def __filter_data_check(cls, dmap_record: dict,
-                            settings: dict, j: int) -> bool:
-        """
-        checks for data that does not meet the criteria of the filtered
-        settings
-
-        Parameters
-        ----------
-        dmap_record : dict
-            dictionary of the dmap record fields
-        settings : dict
-            dictionary of the settings list
-        j : int
-            index on the slist or range gate to check the array values
-
-        Returns
-        -------
-        pass_flg : bool
-            boolean indicating if the dmap_record passes all filter checks
-        """
-        pass_flg = True
-        for key, value in settings['min_array_filter'].items():
-            if dmap_record[key][j] < value:
-                pass_flg = False
-                break
-        for key, value in settings['max_array_filter'].items():
-            if dmap_record[key][j] > value:
-                pass_flg = False
-                break
-
-        for key, value in settings['min_scalar_filter'].items():
-            if dmap_record[key] < value:
-                pass_flg = False
-                break
-
-        for key, value in settings['max_scalar_filter'].items():
-            if dmap_record[key] > value:
-                pass_flg = False
-                break
-
-        for key, value in settings['equal_scalar_filter'].items():
-            if dmap_record[key] != value:
-                pass_flg = False
-                break
-
-        return pass_flg
-
     # TODO: if used in other plotting methods then this should moved to
     #       utils
     @classmethod
@@ -1302,3 +1295,224 @@ class RTP():
         if not end_time:
             end_time = time2datetime(cls.dmap_data[-1])
         return start_time, end_time
+
+
+class RangeTimePlot():
+    """
+    Range-time parameter plot that records are appended to, i.e. a
+    real-time plot of the records returned by SuperDARNRead.follow.
+
+    The plot keeps a RangeTimeBuffer (a preallocated time x range gate
+    matrix on a regular time grid) and the pcolormesh drawn from it.
+    append writes the rows of the new records in the buffer and in the
+    data of the mesh in place, so the cost of an update is proportional
+    to the number of new records: earlier records are not filtered again
+    and no array or artist is allocated (unless the buffer is full and
+    doubles in size).
+
+    Attributes
+    ----------
+        buffer: RangeTimeBuffer
+            time x range gate matrix of the plot
+        ax: matplotlib.axes.Axes
+            axes of the plot
+        im: matplotlib.collections.QuadMesh
+            mesh of the parameter values
+        gs_im: matplotlib.collections.QuadMesh
+            mesh of the ground scatter, None without groundscatter
+        cb: matplotlib.colorbar
+            color bar, None if colorbar is False
+        cmap: matplotlib.cm
+            color map of the parameter
+
+    Methods
+    -------
+        append(dmap_data) : adds the records to the plot
+    """
+
+    def __init__(self, dmap_data: List[dict], parameter: str = 'v',
+                 beam_num: int = 0, channel: int = 'all', ax=None,
+                 background: str = 'w', groundscatter: bool = False,
+                 zmin: int = None, zmax: int = None,
+                 start_time: datetime = None,
+                 time_resolution: timedelta = None,
+                 duration: timedelta = timedelta(hours=24),
+                 colorbar: bool = True, ymin: int = None, ymax: int = None,
+                 yspacing: int = 200,
+                 range_estimation: RangeEstimation =
+                 RangeEstimation.SLANT_RANGE,
+                 colorbar_label: str = '', norm=colors.Normalize,
+                 cmap: str = None, filter_settings: dict = {},
+                 date_fmt: str = '%y/%m/%d\n %H:%M',
+                 gap_resolution: timedelta = timedelta(minutes=2), **kwargs):
+        """
+        Plots the first records, see RTP.plot_range_time for the
+        parameters not listed below
+
+        Parameters
+        ----------
+            dmap_data: List[dict] or ColumnarData
+                first records of the plot, they set the range gates and
+                the default start_time, time_resolution and colour scale
+            start_time: datetime
+                start of the x-axis, earlier records are not plotted
+                Default: time of the first record
+            time_resolution: timedelta
+                time of each column of the plot
+                Default: median time between the records of the beam
+            duration: timedelta
+                time span allocated for the plot, it doubles when records
+                go past its end
+                Default: 24 hours
+            colorbar: bool
+                create a color bar
+                Default: True
+            kwargs:
+                passed to the range estimation, i.e., reflection_height
+
+        Raises
+        ------
+            UnknownParameterError
+            IncorrectPlotMethodError
+            NoDataFoundError
+        """
+        self.ax = plt.gca() if ax is None else ax
+        self.buffer = RangeTimeBuffer(dmap_data, parameter=parameter,
+                                      beam_num=beam_num, channel=channel,
+                                      start_time=start_time,
+                                      time_resolution=time_resolution,
+                                      duration=duration,
+                                      groundscatter=groundscatter,
+                                      filter_settings=filter_settings,
+                                      gap_resolution=gap_resolution)
+        if self.buffer.num_rows == 0:
+            raise plot_exceptions.\
+                NoDataFoundError(parameter, beam_num,
+                                 start_time=start_time,
+                                 opt_beam_num=dmap_data[0]['bmnum'])
+        self.y, self._first_gate = \
+            self.buffer.range_edges(range_estimation, **kwargs)
+        self.groundscatter = groundscatter
+
+        z = self.buffer.z[:self.buffer.num_rows]
+        data_values = z[~np.isnan(z) & (z != -1000000)]
+        if zmin is None:
+            zmin = np.min(data_values, initial=np.inf)
+        if zmax is None:
+            zmax = np.max(data_values, initial=-np.inf)
+        if not np.isfinite(zmin):
+            zmin = DEFAULT_RANGES[parameter][0]
+        if not np.isfinite(zmax):
+            zmax = DEFAULT_RANGES[parameter][1]
+        self.norm = norm(zmin, zmax)
+        if isinstance(cmap, str):
+            cmap = cm.get_cmap(cmap)
+        elif cmap is None:
+            cmaps = {'p_l': copy.copy(cm.get_cmap('plasma')),
+                     'v': PyDARNColormaps.PYDARN_VELOCITY,
+                     'w_l': PyDARNColormaps.PYDARN_VIRIDIS,
+                     'elv': PyDARNColormaps.PYDARN}
+            cmap = cmaps[parameter]
+        cmap.set_bad(color=background, alpha=1.)
+        self.cmap = cmap
+        self.im = None
+        self.gs_im = None
+        self.__draw()
+
+        if ymax is None:
+            ymax = np.max(self.y)
+        if ymin is None:
+            ymin = np.min(self.y)
+        self.ax.set_ylim(ymin, ymax)
+        if range_estimation != RangeEstimation.RANGE_GATE:
+            self.ax.yaxis.set_ticks(np.arange(np.ceil(ymin/100.0)*100,
+                                              ymax+1, yspacing))
+            self.ax.yaxis.set_minor_locator(ticker.AutoMinorLocator(2))
+        else:
+            self.ax.yaxis.set_ticks(np.arange(ymin, ymax+1, (ymax)/5))
+            self.ax.yaxis.set_minor_locator(ticker.MultipleLocator(5))
+        self.ax.xaxis_date()
+        self.ax.xaxis.set_major_formatter(dates.DateFormatter(date_fmt))
+        self.__set_xlim()
+
+        self.cb = None
+        if colorbar:
+            locator = ticker.MaxNLocator(symmetric=True, min_n_ticks=3,
+                                         integer=True, nbins='auto')
+            ticks = None if isinstance(self.norm, colors.LogNorm) else \
+                locator.tick_values(vmin=zmin, vmax=zmax)
+            self.cb = self.ax.figure.colorbar(self.im, ax=self.ax,
+                                              extend='both', ticks=ticks)
+            if colorbar_label != '':
+                self.cb.set_label(colorbar_label)
+
+    def __draw(self):
+        """ draws the meshes of the whole buffer """
+        if self.im is not None:
+            self.im.remove()
+        if self.gs_im is not None:
+            self.gs_im.remove()
+        x = dates.date2num(self.buffer.times())
+        z = self.buffer.z[:, self._first_gate:].T
+        self.im = self.ax.pcolormesh(x, self.y, np.ma.masked_invalid(z),
+                                     lw=0.01, cmap=self.cmap, norm=self.norm)
+        if self.groundscatter:
+            gs_color = 'grey' if self.groundscatter is True \
+                else self.groundscatter
+            self.gs_im = self.ax.pcolormesh(
+                x, self.y, np.ma.masked_where(z != -1000000, z), lw=0.01,
+                cmap=colors.ListedColormap([gs_color]), norm=self.norm)
+        self._shape = self.buffer.z.shape
+
+    def __set_xlim(self):
+        """ x-axis from the start of the buffer to the last record """
+        end = self.buffer.start_time + \
+            self.buffer.num_rows * self.buffer.time_resolution
+        self.ax.set_xlim(dates.date2num(self.buffer.start_time),
+                         dates.date2num(end))
+
+    @staticmethod
+    def __update_mesh(mesh, rows: slice, values: np.ndarray,
+                      mask: np.ndarray):
+        """ writes the rows (time columns of the mesh) in place """
+        array = mesh.get_array()
+        if np.ma.getmask(array) is np.ma.nomask:
+            array.mask = np.zeros(array.shape, dtype=bool)
+        # the mesh keeps the range x time matrix (flattened by
+        # older matplotlib versions)
+        num_gates = values.shape[1]
+        array.data.reshape(num_gates, -1)[:, rows] = values.T
+        array.mask.reshape(num_gates, -1)[:, rows] = mask.T
+        mesh.stale = True
+
+    def append(self, dmap_data: List[dict]):
+        """
+        Adds the records to the plot, only the rows of the new records
+        are written to the buffer and the meshes
+
+        Parameters
+        ----------
+            dmap_data: List[dict] or ColumnarData
+                records to add, in time order (i.e. the records returned
+                by DmapFollower.read)
+
+        Returns
+        -------
+            rows: slice
+                rows of the buffer that changed
+        """
+        rows = self.buffer.append(dmap_data)
+        if rows.start == rows.stop:
+            return rows
+        if self.buffer.z.shape != self._shape:
+            # the buffer doubled
+            self.__draw()
+            if self.cb is not None:
+                self.cb.update_normal(self.im)
+        else:
+            z = self.buffer.z[rows, self._first_gate:]
+            self.__update_mesh(self.im, rows, z, np.isnan(z))
+            if self.gs_im is not None:
+                self.__update_mesh(self.gs_im, rows, z, z != -1000000)
+        self.__set_xlim()
+        return rows
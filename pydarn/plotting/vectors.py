@@ -0,0 +1,71 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+#
+"""
+Vector layer of the map and grid plots, all the vectors of a plot are drawn
+as a single LineCollection artist
+"""
+import matplotlib.pyplot as plt
+import numpy as np
+
+from matplotlib import colors
+from matplotlib.collections import LineCollection
+
+
+def plot_vectors(start_lons: np.ndarray, start_lats: np.ndarray,
+                 end_lons: np.ndarray, end_lats: np.ndarray,
+                 values: np.ndarray, cmap: colors.Colormap,
+                 norm: colors.Normalize, ax=None,
+                 **kwargs) -> LineCollection:
+    """
+    Draws vectors (line segments from start to end) coloured by their
+    values. The vectors are one LineCollection with a colour per segment
+    so drawing and saving does not slow down with thousands of vectors
+    the way one Line2D per vector does.
+
+    Parameters
+    ----------
+        start_lons: np.ndarray
+            x (longitude/MLT angle in radians on polar axes) of the start
+            of the vectors
+        start_lats: np.ndarray
+            y (latitude on polar axes) of the start of the vectors
+        end_lons: np.ndarray
+            x of the end of the vectors
+        end_lats: np.ndarray
+            y of the end of the vectors
+        values: np.ndarray
+            values the vectors are coloured by
+        cmap: matplotlib.colors.Colormap
+            colour map of the values
+        norm: matplotlib.colors.Normalize
+            normalisation of the values to the colour map
+        ax: matplotlib.pyplot.axis
+            axis to draw on
+            Default: current axis
+        kwargs: key=value
+            LineCollection properties, i.e. linewidth or zorder
+
+    Returns
+    -------
+        vectors: LineCollection
+            the vector artist
+    """
+    if ax is None:
+        ax = plt.gca()
+    # segments: (vectors, 2 points, x/y)
+    segments = np.stack([np.column_stack([start_lons, start_lats]),
+                         np.column_stack([end_lons, end_lats])], axis=1)
+    vectors = LineCollection(segments, colors=cmap(norm(values)), **kwargs)
+    ax.add_collection(vectors)
+    ax.autoscale_view()
+    return vectors
@@ -0,0 +1,480 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+#
+"""
+This module contains a columnar container for SuperDARN records so
+plotting methods can work on whole arrays rather than looping over
+a list of dictionaries
+"""
+import numpy as np
+
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import List, Union
+
+
+class ColumnarData(Sequence):
+    """
+    Columnar store of SuperDARN DMap records, for example the output of
+    SuperDARNRead.read_dmap. Scalar fields (bmnum, channel, time.yr, tfreq,
+    ...) are stored as contiguous numpy arrays with one value per record.
+    Array fields (slist, v, p_l, w_l, elv, gflg, ...) are flattened
+    along their first axis into one array plus an offsets index, values of
+    record i are values[offsets[i]:offsets[i+1]].
+
+    ColumnarData is also a sequence of records, indexing with an integer
+    returns a read-only dictionary view of that record so it can be used
+    anywhere a List[dict] is used.
+
+    Attributes
+    ----------
+        fields: List[str]
+            field names in the order they first appear in the records
+
+    Methods
+    -------
+        scalar(name) : array of the scalar field, one value per record
+        ragged(name) : flattened values and offsets of an array field
+        present(name) : boolean array of which records contain the field
+        gather(name, records, positions) : values of an array field at
+            the given record and position within the record
+        take(indices) : new ColumnarData of the selected records
+        times() : datetime64 array of the record times
+        time_index() : TimeIndex of the record times
+        cached(key, build) : build(self) computed once per ColumnarData
+        to_records() : list of dictionaries
+    """
+    # fields the record time is read from, see time2datetime
+    TIME_FIELDS = ['time.yr', 'time.mo', 'time.dy', 'time.hr', 'time.mt',
+                   'time.sc', 'time.us', 'start.year', 'start.month',
+                   'start.day', 'start.hour', 'start.minute', 'start.second']
+
+    def __init__(self, dmap_data: List[dict], fields: List[str] = None):
+        """
+        Parameters
+        ----------
+            dmap_data: List[dict]
+                list of records (dictionaries) representing DMap data
+            fields: List[str]
+                only store these fields, default: all fields
+        """
+        self._num_records = len(dmap_data)
+        self._scalars = {}
+        self._arrays = {}
+        self._present = {}
+        self._times = None
+        self._time_index = None
+        self._cache = {}
+
+        if fields is None:
+            fields = []
+            known = set()
+            for record in dmap_data:
+                for name in record:
+                    if name not in known:
+                        known.add(name)
+                        fields.append(name)
+        self.fields = []
+
+        for name in fields:
+            indices = []
+            values = []
+            for i, record in enumerate(dmap_data):
+                try:
+                    values.append(record[name])
+                except KeyError:
+                    continue
+                indices.append(i)
+            if not indices:
+                continue
+            self.fields.append(name)
+            present = np.zeros(self._num_records, dtype=bool)
+            present[indices] = True
+            self._present[name] = present
+
+            if isinstance(values[0], np.ndarray):
+                try:
+                    lengths = np.zeros(self._num_records, dtype=int)
+                    lengths[indices] = [len(value) for value in values]
+                    flat = np.concatenate(values)
+                except (TypeError, ValueError):
+                    # arrays that cannot be flattened, i.e., the
+                    # trailing dimensions change between records, are
+                    # kept as objects
+                    column = np.empty(self._num_records, dtype=object)
+                    column[indices] = values
+                    self._scalars[name] = column
+                    continue
+                offsets = np.zeros(self._num_records + 1, dtype=int)
+                np.cumsum(lengths, out=offsets[1:])
+                self._arrays[name] = (flat, offsets)
+            else:
+                column_values = np.array(values)
+                column = np.zeros(self._num_records,
+                                  dtype=column_values.dtype)
+                column[indices] = column_values
+                self._scalars[name] = column
+
+    @classmethod
+    def _from_columns(cls, num_records: int, fields: List[str],
+                      scalars: dict, arrays: dict, present: dict):
+        data = cls.__new__(cls)
+        data._num_records = num_records
+        data.fields = fields
+        data._scalars = scalars
+        data._arrays = arrays
+        data._present = present
+        data._times = None
+        data._time_index = None
+        data._cache = {}
+        return data
+
+    def __len__(self):
+        return self._num_records
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray]):
+        if np.ndim(index) == 0 and not isinstance(index, slice):
+            index = int(index)
+            if index < 0:
+                index += self._num_records
+            if not 0 <= index < self._num_records:
+                raise IndexError("record index {} is out of range for {}"
+                                 " records".format(index, self._num_records))
+            return _RecordView(self, index)
+        if isinstance(index, slice):
+            return self.take(np.arange(self._num_records)[index])
+        return self.take(index)
+
+    def __repr__(self):
+        return "{class_name}({num} records, {fields} fields)"\
+               "".format(class_name=self.__class__.__name__,
+                         num=self._num_records, fields=len(self.fields))
+
+    def is_array(self, name: str) -> bool:
+        """
+        True if the field is an array (ragged) field
+        """
+        return name in self._arrays
+
+    def present(self, name: str) -> np.ndarray:
+        """
+        Boolean array of which records contain the field,
+        all False if no record contains the field
+        """
+        try:
+            return self._present[name]
+        except KeyError:
+            return np.zeros(self._num_records, dtype=bool)
+
+    def scalar(self, name: str) -> np.ndarray:
+        """
+        Array of the scalar field, one value per record. Records
+        without the field contain zero, see present.
+
+        Raises
+        ------
+            KeyError if the field is not a scalar field
+        """
+        return self._scalars[name]
+
+    def ragged(self, name: str) -> tuple:
+        """
+        Flattened values and offsets of an array field. Values
+        of record i are values[offsets[i]:offsets[i+1]]
+
+        Raises
+        ------
+            KeyError if the field is not an array field
+        """
+        return self._arrays[name]
+
+    def lengths(self, name: str) -> np.ndarray:
+        """
+        Length of the array field in each record, 0 for missing records
+        """
+        return np.diff(self._arrays[name][1])
+
+    def gather(self, name: str, records: np.ndarray,
+               positions: np.ndarray) -> tuple:
+        """
+        Values of an array field at the given position in the given
+        record, i.e., the vectorized values of dmap_data[record][name][pos]
+
+        Parameters
+        ----------
+            name: str
+                array field name
+            records: np.ndarray
+                record index of each element
+            positions: np.ndarray
+                position of each element in its record
+
+        Returns
+        -------
+            values: np.ndarray
+                values of the field, undefined where valid is False
+            valid: np.ndarray
+                False where the record does not have the field or
+                the position is past the end of the record's array
+        """
+        values, offsets = self._arrays[name]
+        valid = positions < offsets[records + 1] - offsets[records]
+        if len(values) == 0:
+            return np.zeros(len(records), dtype=values.dtype), valid
+        index = np.minimum(offsets[records] + positions, len(values) - 1)
+        return values[index], valid
+
+    def take(self, indices: np.ndarray):
+        """
+        Returns a new ColumnarData of the selected records
+
+        Parameters
+        ----------
+            indices: np.ndarray
+                integer indices or boolean mask of the records
+        """
+        indices = np.arange(self._num_records)[indices]
+        scalars = {name: column[indices]
+                   for name, column in self._scalars.items()}
+        present = {name: mask[indices]
+                   for name, mask in self._present.items()}
+        arrays = {}
+        for name, (values, offsets) in self._arrays.items():
+            lengths = offsets[indices + 1] - offsets[indices]
+            new_offsets = np.zeros(len(indices) + 1, dtype=int)
+            np.cumsum(lengths, out=new_offsets[1:])
+            element = np.arange(new_offsets[-1]) +\
+                np.repeat(offsets[indices] - new_offsets[:-1], lengths)
+            arrays[name] = (values[element], new_offsets)
+        fields = [name for name in self.fields if present[name].any()]
+        data = self._from_columns(len(indices), fields, scalars,
+                                  arrays, present)
+        if self._times is not None:
+            data._times = self._times[indices]
+        return data
+
+    def times(self) -> np.ndarray:
+        """
+        Record times as a datetime64[us] array, converted from the time.*
+        (or start.*) fields of all records at once. The array is computed
+        on the first call and reused afterwards.
+
+        Raises
+        ------
+            KeyError if a record has no time fields
+        """
+        if self._times is None:
+            times = np.zeros(self._num_records, dtype='datetime64[us]')
+            time_fields = self.present('time.yr')
+            start_fields = ~time_fields & self.present('start.year')
+            if not np.all(time_fields | start_fields):
+                raise KeyError('start.year')
+            if time_fields.any():
+                times[time_fields] = \
+                    _fields2datetime64(*[self.scalar(name)[time_fields]
+                                         for name in self.TIME_FIELDS[:7]])
+            if start_fields.any():
+                times[start_fields] = \
+                    _fields2datetime64(*[self.scalar(name)[start_fields]
+                                         for name in self.TIME_FIELDS[7:]])
+            self._times = times
+        return self._times
+
+    @classmethod
+    def record_times(cls, dmap_data: List[dict]) -> np.ndarray:
+        """
+        Record times of a list of records as a datetime64[us] array, the
+        time fields are gathered in one pass over the records without
+        building ColumnarData
+
+        Parameters
+        ----------
+            dmap_data: List[dict]
+                records with time.* (or start.*) fields
+
+        Raises
+        ------
+            KeyError if a record has no time fields
+        """
+        rows = []
+        for record in dmap_data:
+            if 'time.yr' in record:
+                rows.append([record[name] for name in cls.TIME_FIELDS[:7]])
+            else:
+                rows.append([record[name] for name in cls.TIME_FIELDS[7:]] +
+                            [0])
+        if not rows:
+            return np.zeros(0, dtype='datetime64[us]')
+        return _fields2datetime64(*np.array(rows).T)
+
+    def time_index(self):
+        """
+        TimeIndex of the record times to look up records by time with a
+        binary search. The index is built on the first call and reused
+        afterwards.
+        """
+        if self._time_index is None:
+            self._time_index = TimeIndex(self.times())
+        return self._time_index
+
+    def cached(self, key, build):
+        """
+        Returns build(self), build is only called the first time the key
+        is used so indexes of the records (i.e. the scan index) are built
+        once per ColumnarData
+
+        Parameters
+        ----------
+            key: hashable
+                name of the cached value
+            build: function
+                function taking the ColumnarData and returning the value
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = build(self)
+            self._cache[key] = value
+            return value
+
+    def to_records(self) -> List[dict]:
+        """
+        Returns the records as a list of dictionaries
+        """
+        return [dict(record) for record in self]
+
+
+class TimeIndex():
+    """
+    Sorted index of record times, records are looked up with a
+    binary search (np.searchsorted) so a lookup takes O(log n) time
+
+    Attributes
+    ----------
+        times: np.ndarray
+            sorted datetime64[us] record times
+        order: np.ndarray
+            record index of each sorted time
+
+    Methods
+    -------
+        find(start, end) : record index of the earliest record
+            between start and end
+    """
+    def __init__(self, times: np.ndarray):
+        """
+        Parameters
+        ----------
+            times: np.ndarray
+                datetime64 time of each record, does not need to be sorted
+        """
+        times = np.asarray(times, dtype='datetime64[us]')
+        # stable sort so records with the same time keep the record order
+        self.order = np.argsort(times, kind='stable')
+        self.times = times[self.order]
+
+    def __len__(self):
+        return len(self.times)
+
+    def find(self, start: datetime, end: datetime = None) -> int:
+        """
+        Returns the record index of the earliest record with
+        start <= time <= end, -1 if there is no record in the window
+
+        Parameters
+        ----------
+            start: datetime
+                start of the time window
+            end: datetime
+                end of the time window
+                default: start
+        """
+        if end is None:
+            end = start
+        position = np.searchsorted(self.times, np.datetime64(start, 'us'),
+                                   side='left')
+        if position == len(self.times) or\
+           self.times[position] > np.datetime64(end, 'us'):
+            return -1
+        return int(self.order[position])
+
+
+class _RecordView(Mapping):
+    """
+    Read-only dictionary view of a single record in ColumnarData
+    """
+    __slots__ = ('_data', '_index')
+
+    def __init__(self, data: ColumnarData, index: int):
+        self._data = data
+        self._index = index
+
+    def __getitem__(self, name: str):
+        data = self._data
+        present = data._present.get(name)
+        if present is None or not present[self._index]:
+            raise KeyError(name)
+        if name in data._arrays:
+            values, offsets = data._arrays[name]
+            return values[offsets[self._index]:offsets[self._index + 1]]
+        return data._scalars[name][self._index]
+
+    def __contains__(self, name):
+        present = self._data._present.get(name)
+        return present is not None and bool(present[self._index])
+
+    def __iter__(self):
+        return (name for name in self._data.fields if name in self)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return "{}({})".format(self.__class__.__name__, dict(self))
+
+
+def _fields2datetime64(year: np.ndarray, month: np.ndarray, day: np.ndarray,
+                       hour: np.ndarray, minute: np.ndarray,
+                       second: np.ndarray,
+                       microsecond: np.ndarray = 0) -> np.ndarray:
+    """
+    Converts arrays of the date and time fields into a datetime64[us] array,
+    seconds are truncated to an integer like time2datetime
+    """
+    date = (np.asarray(year, dtype=np.int64) - 1970).astype('datetime64[Y]')
+    date = date.astype('datetime64[M]') +\
+        (np.asarray(month, dtype=np.int64) - 1).astype('timedelta64[M]')
+    date = date.astype('datetime64[D]') +\
+        (np.asarray(day, dtype=np.int64) - 1).astype('timedelta64[D]')
+    return date.astype('datetime64[us]') +\
+        np.asarray(hour, dtype=np.int64).astype('timedelta64[h]') +\
+        np.asarray(minute, dtype=np.int64).astype('timedelta64[m]') +\
+        np.asarray(second).astype(np.int64).astype('timedelta64[s]') +\
+        np.asarray(microsecond, dtype=np.int64).astype('timedelta64[us]')
+
+
+def to_columnar(dmap_data: Union[List[dict], ColumnarData],
+                fields: List[str] = None) -> ColumnarData:
+    """
+    Returns dmap_data as ColumnarData, a list of records is converted
+    with only the given fields while ColumnarData is returned as is
+
+    Parameters
+    ----------
+        dmap_data: List[dict] or ColumnarData
+            records to convert
+        fields: List[str]
+            only convert these fields, default: all fields
+    """
+    if isinstance(dmap_data, ColumnarData):
+        return dmap_data
+    return ColumnarData(dmap_data, fields=fields)
@@ -0,0 +1,192 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+#
+# Modifications:
+#
+"""
+coordinate_cache.py caches the beam corner coordinates of radar fields of
+view so the same FOV is only calculated once
+"""
+import glob
+import hashlib
+import os
+import numpy as np
+
+from collections import OrderedDict
+
+
+def user_cache_dir(name: str = 'coordinates'):
+    """
+    Returns the directory pyDARN uses to store a cache: name under
+    $PYDARN_CACHE_DIR if set, otherwise under pydarn in the platforms user
+    cache directory ($XDG_CACHE_HOME or ~/.cache, %LOCALAPPDATA% on
+    windows)
+
+    Parameters
+    ----------
+        name: str
+            name of the cache
+            default: 'coordinates'
+    """
+    if os.environ.get('PYDARN_CACHE_DIR'):
+        return os.path.join(os.environ['PYDARN_CACHE_DIR'], name)
+    if os.name == 'nt' and os.environ.get('LOCALAPPDATA'):
+        cache_home = os.environ['LOCALAPPDATA']
+    else:
+        cache_home = os.environ.get('XDG_CACHE_HOME',
+                                    os.path.join(os.path.expanduser('~'),
+                                                 '.cache'))
+    return os.path.join(cache_home, 'pydarn', name)
+
+
+class CoordinateCache():
+    """
+    Two tier cache of beam corner coordinates (latitudes and
+    longitudes/MLT). The most recently used entries are kept in memory
+    and every entry is stored as a .npz file in a directory so it is
+    reused between python sessions. When the directory holds more than
+    max_files files the least recently used ones are removed.
+
+    Keys are tuples of plain python values (str, int, float, datetime,
+    tuples of these) describing everything the coordinates depend on.
+
+    Attributes
+    ----------
+        max_size: int
+            number of entries kept in memory, 0 disables the memory tier
+            default: 256
+        directory: str
+            directory the .npz files are stored in, None disables the
+            disk tier
+            default: user_cache_dir()
+        max_files: int
+            number of .npz files kept in the directory
+            default: 4096
+    """
+
+    def __init__(self, max_size: int = 256, directory: str = '',
+                 max_files: int = 4096):
+        self.max_size = max_size
+        self.directory = user_cache_dir() if directory == '' else directory
+        self.max_files = max_files
+        self._memory = OrderedDict()
+
+    def __len__(self):
+        return len(self._memory)
+
+    @staticmethod
+    def _name(key: tuple):
+        """ file name (and memory key) of a cache key """
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def _path(self, name: str):
+        return os.path.join(self.directory, name + '.npz')
+
+    def _remember(self, name: str, lats: np.ndarray, lons: np.ndarray):
+        if self.max_size <= 0:
+            return
+        self._memory[name] = (lats, lons)
+        self._memory.move_to_end(name)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: tuple):
+        """
+        Returns copies of the cached latitudes and longitudes of the key
+        or None when the key is not cached
+        """
+        name = self._name(key)
+        if name in self._memory:
+            self._memory.move_to_end(name)
+            lats, lons = self._memory[name]
+        elif self.directory is not None:
+            try:
+                with np.load(self._path(name)) as cached:
+                    lats, lons = cached['lats'], cached['lons']
+            # missing or unreadable files are treated as not cached
+            except (OSError, ValueError, KeyError):
+                return None
+            # the modification time orders the files for eviction
+            try:
+                os.utime(self._path(name))
+            except OSError:
+                pass
+            self._remember(name, lats, lons)
+        else:
+            return None
+        return lats.copy(), lons.copy()
+
+    def put(self, key: tuple, lats: np.ndarray, lons: np.ndarray):
+        """
+        Stores copies of the latitudes and longitudes under the key
+        """
+        name = self._name(key)
+        lats = np.array(lats)
+        lons = np.array(lons)
+        self._remember(name, lats, lons)
+        if self.directory is None:
+            return
+        # the disk tier is best effort, a read-only or full disk
+        # should not stop anyone from plotting
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # write to a temporary file first so other processes never
+            # read a partially written file
+            tmp_path = '{}.{}.tmp.npz'.format(self._path(name)[:-4],
+                                              os.getpid())
+            np.savez(tmp_path, lats=lats, lons=lons)
+            os.replace(tmp_path, self._path(name))
+            self._evict()
+        except OSError:
+            pass
+
+    def _evict(self):
+        """ removes the least recently used files over max_files """
+        cache_files = glob.glob(os.path.join(self.directory, '*.npz'))
+        if len(cache_files) <= self.max_files:
+            return
+        mtimes = {}
+        for cache_file in cache_files:
+            try:
+                mtimes[cache_file] = os.path.getmtime(cache_file)
+            # removed by another process
+            except OSError:
+                pass
+        for cache_file in sorted(mtimes, key=mtimes.get)[
+                :len(mtimes) - self.max_files]:
+            try:
+                os.remove(cache_file)
+            except OSError:
+                pass
+
+    def clear(self, disk: bool = True):
+        """
+        Removes all cached coordinates
+
+        Parameters
+        ----------
+            disk: bool
+                if True the .npz files are removed as well
+                default: True
+        """
+        self._memory.clear()
+        if disk and self.directory is not None:
+            for cache_file in glob.glob(os.path.join(self.directory,
+                                                     '*.npz')):
+                try:
+                    os.remove(cache_file)
+                except OSError:
+                    pass
+
+
+# coordinates cache used by pydarn.Coords
+coordinate_cache = CoordinateCache()
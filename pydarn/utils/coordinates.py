@@ -21,13 +21,140 @@ plotting
 """
 import datetime as dt
 import enum
+import functools
 import numpy as np
 
 import aacgmv2
-from pydarn import (geocentric_coordinates, SuperDARNRadars, RangeEstimation,
-                    radar_exceptions, Re)
+from pydarn import (__version__, geocentric_coordinates, SuperDARNRadars,
+                    RangeEstimation, VHModels, radar_exceptions, Re,
+                    coordinate_cache)
 
+# keyword arguments that change the position of the beam corners and
+# their defaults, any other keyword argument (plotting options) is
+# ignored by the cache
+COORDINATE_KWARGS = {'rsep': 45, 'frang': 180, 'nrang': None,
+                     'center': True, 'elv_angle': 0.0,
+                     'reflection_height': 250,
+                     'range_estimation': RangeEstimation.SLANT_RANGE,
+                     'virtual_height_model': VHModels.STANDARD}
 
+# AACGM coordinates are calculated (and cached) for the date rounded down
+# to this resolution, the AACGM coefficients barely change within an hour
+AACGM_DATE_RESOLUTION = dt.timedelta(hours=1)
+
+
+def aacgm_date(date: dt.datetime = None,
+               date_resolution: dt.timedelta = None):
+    """
+    Rounds the date down to the date resolution used for AACGM conversions
+
+    Parameters
+    ----------
+        date: datetime
+            date of the AACGM conversion
+            default: current date
+        date_resolution: timedelta
+            resolution to round the date down to, timedelta(0) keeps
+            the exact date
+            default: AACGM_DATE_RESOLUTION
+
+    Returns
+    -------
+        date: datetime
+            rounded date
+    """
+    if date is None:
+        date = dt.datetime.now()
+    if date_resolution is None:
+        date_resolution = AACGM_DATE_RESOLUTION
+    if not date_resolution:
+        return date
+    return date - (date - dt.datetime.min) % date_resolution
+
+
+def coordinate_key(name: str, stid: int, beams: int = None,
+                   gates: tuple = None, date: dt.datetime = None,
+                   options: dict = {}):
+    """
+    Returns the coordinate_cache key of the beam corners of a radar
+
+    Parameters
+    ----------
+        name: str
+            name of the coordinate system
+        stid: int
+            station id of the radar
+        beams: int
+            number of beams, default: from the hardware file
+        gates: tuple
+            first and last range gate, default: 0 to the 45 km range gate
+        date: datetime
+            date the coordinates depend on, None when they do not
+        options: dict
+            keyword arguments of the coordinate method, the ones not in
+            COORDINATE_KWARGS are ignored
+
+    Returns
+    -------
+        key: tuple
+            cache key
+        beams: int
+            number of beams
+        gates: tuple
+            first and last range gate
+    """
+    radar = SuperDARNRadars.radars[stid]
+    if gates is None or len(gates) == 0:
+        gates = [0, radar.range_gate_45]
+    if beams is None:
+        beams = radar.hardware_info.beams
+    # enums are keyed by name as their value holds functions
+    values = tuple((option, getattr(options.get(option, default), 'name',
+                                    options.get(option, default)))
+                   for option, default in COORDINATE_KWARGS.items())
+    # the hardware information holds the epoch of the hardware line used,
+    # the versions invalidate the disk cache of older calculations
+    key = (name, stid, radar.hardware_info, beams, (gates[0], gates[1]),
+           values, date, __version__, aacgmv2.__version__)
+    return key, beams, gates
+
+
+def cached_coordinates(uses_date: bool = False):
+    """
+    Decorator caching the beam corners returned by a coordinate method
+    in coordinate_cache. The cache key is given by coordinate_key with,
+    when uses_date is True, the date rounded by aacgm_date.
+
+    Parameters
+    ----------
+        uses_date: bool
+            the coordinates depend on the date (AACGM)
+            default: False
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(stid: int, beams: int = None, gates: tuple = None,
+                    **kwargs):
+            if uses_date:
+                kwargs['date'] = aacgm_date(kwargs.get('date'),
+                                            kwargs.pop('date_resolution',
+                                                       None))
+            key, beams, gates = \
+                coordinate_key(function.__name__, stid, beams, gates,
+                               kwargs['date'] if uses_date else None,
+                               kwargs)
+            cached = coordinate_cache.get(key)
+            if cached is not None:
+                return cached
+            lats, lons = function(stid=stid, beams=beams, gates=gates,
+                                  **kwargs)
+            coordinate_cache.put(key, lats, lons)
+            return lats, lons
+        return wrapper
+    return decorator
+
+
+@cached_coordinates()
 def geo_coordinates(stid: int, beams: int = None,
                     gates: tuple = None, **kwargs):
     """
@@ -45,48 +172,135 @@ def geo_coordinates(stid: int, beams: int = None,
     # Plus 1 is due to the fact fov files index at 1 so in the plotting
     # of the boundary there is a subtraction of 1 to offset this as python
     # converts to index of 0 which my code already accounts for
-    beam_corners_lats = np.zeros((gates[1]-gates[0]+1, beams+1))
-    beam_corners_lons = np.zeros((gates[1]-gates[0]+1, beams+1))
-
-    for beam in range(0, beams+1):
-        for gate in range(gates[0], gates[1]+1):
-            lat, lon = gate2geographic_location(stid=stid, beam=beam,
-                                                range_gate=gate, height=300,
-                                                **kwargs)
-            beam_corners_lats[gate-gates[0], beam] = lat
-            beam_corners_lons[gate-gates[0], beam] = lon
+    # all the gate x beam corners are calculated at once
+    beam_corners_lats, beam_corners_lons = \
+        gate2geographic_location(stid=stid,
+                                 beam=np.arange(0, beams+1)[np.newaxis, :],
+                                 range_gate=np.arange(gates[0], gates[1]+1)
+                                 [:, np.newaxis],
+                                 height=300, **kwargs)
     y0inx = np.min(np.where(np.isfinite(beam_corners_lats[:,0]))[0])
     return beam_corners_lats[y0inx:], beam_corners_lons[y0inx:]
 
 
-def aacgm_coordinates(stid: int, beams: int = None, gates: tuple = None,
-                      date: dt.datetime = dt.datetime.now, **kwargs):
-    if gates is None:
-        gates = [0, SuperDARNRadars.radars[stid].range_gate_45]
-    if beams is None:
-        beams = SuperDARNRadars.radars[stid].hardware_info.beams
+def geo2aacgm(lats: np.ndarray, lons: np.ndarray, date: dt.datetime):
+    """
+    Converts geographic beam corners to AACGM in one aacgmv2 call
 
-    # Plus 1 is due to the fact fov files index at 1 so in the plotting
-    # of the boundary there is a subtraction of 1 to offset this as python
-    # converts to index of 0 which my code already accounts for
-    beam_corners_lats = np.zeros((gates[1]-gates[0]+1, beams+1))
-    beam_corners_lons = np.zeros((gates[1]-gates[0]+1, beams+1))
-
-    for beam in range(0, beams+1):
-        for gate in range(gates[0], gates[1]+1):
-            lat, lon = gate2geographic_location(stid=stid, beam=beam,
-                                                range_gate=gate, height=300,
-                                                **kwargs)
-            geomag = np.array(aacgmv2.get_aacgm_coord(glat=lat,
-                                                      glon=lon,
-                                                      height=250,
-                                                      dtime=date))
-            beam_corners_lats[gate-gates[0], beam] = geomag[0]
-            beam_corners_lons[gate-gates[0], beam] = geomag[1]
+    Parameters
+    ----------
+        lats: np.ndarray
+            geographic latitudes [deg]
+        lons: np.ndarray
+            geographic longitudes [deg]
+        date: datetime
+            date of the conversion
+
+    Returns
+    -------
+        mlats: np.ndarray
+            AACGM latitudes [deg], same shape as lats
+        mlons: np.ndarray
+            AACGM longitudes [deg], same shape as lons
+    """
+    lats = np.asarray(lats, dtype=float)
+    # same method as aacgmv2.get_aacgm_coord
+    mlats, mlons, _ = \
+        aacgmv2.convert_latlon_arr(lats.ravel(),
+                                   np.asarray(lons, dtype=float).ravel(),
+                                   250, date, method_code='G2A|ALLOWTRACE')
+    return mlats.reshape(lats.shape), mlons.reshape(lats.shape)
+
+
+def _trim_aacgm(beam_corners_lats: np.ndarray, beam_corners_lons: np.ndarray):
+    """ removes the leading range gates without AACGM coordinates """
     y0inx = np.min(np.where(np.isfinite(beam_corners_lats[:,0]))[0])
     return beam_corners_lats[y0inx:], beam_corners_lons[y0inx:]
 
 
+@cached_coordinates(uses_date=True)
+def aacgm_coordinates(stid: int, beams: int = None, gates: tuple = None,
+                      date: dt.datetime = None, **kwargs):
+    """
+    aacgm_coordinates calculates the AACGM coordinates of the beam corners
+    for a given set of gates and beams
+
+    Parameters
+    ----------
+        stid: int
+            station id of the radar
+        beams: int
+            number of beams, default: from the hardware file
+        gates: tuple
+            first and last range gate, default: 0 to the 45 km range gate
+        date: datetime
+            date of the AACGM conversion, cached_coordinates rounds it
+            down to date_resolution
+            default: current date
+        date_resolution: timedelta
+            see aacgm_date
+            default: AACGM_DATE_RESOLUTION
+    """
+    geo_lats, geo_lons = geo_coordinates(stid=stid, beams=beams,
+                                         gates=gates, **kwargs)
+    return _trim_aacgm(*geo2aacgm(geo_lats, geo_lons, date))
+
+
+def batch_aacgm_coordinates(stids: list, date: dt.datetime = None,
+                            beams: int = None, gates: tuple = None,
+                            date_resolution: dt.timedelta = None,
+                            **kwargs):
+    """
+    Calculates the AACGM beam corners of several radars for the same date,
+    all the radars not in coordinate_cache are converted in one aacgmv2
+    call. The results are cached so following aacgm_coordinates calls for
+    these radars do not convert again.
+
+    Parameters
+    ----------
+        stids: list
+            station ids of the radars
+        date: datetime
+            date of the AACGM conversion
+            default: current date
+        beams, gates, date_resolution and kwargs:
+            see aacgm_coordinates, used for every radar
+
+    Returns
+    -------
+        coordinates: list
+            (beam_corners_lats, beam_corners_lons) for each stid
+    """
+    date = aacgm_date(date, date_resolution)
+    coordinates = {}
+    converting = []
+    for stid in stids:
+        key, stid_beams, stid_gates = \
+            coordinate_key(aacgm_coordinates.__name__, stid, beams, gates,
+                           date, kwargs)
+        coordinates[stid] = coordinate_cache.get(key)
+        if coordinates[stid] is None:
+            converting.append((stid, key,
+                               geo_coordinates(stid=stid, beams=stid_beams,
+                                               gates=stid_gates, **kwargs)))
+    if converting:
+        geo_lats = np.concatenate([lats.ravel()
+                                   for _, _, (lats, _) in converting])
+        geo_lons = np.concatenate([lons.ravel()
+                                   for _, _, (_, lons) in converting])
+        mlats, mlons = geo2aacgm(geo_lats, geo_lons, date)
+        offset = 0
+        for stid, key, (lats, _) in converting:
+            size = lats.size
+            beam_corners = _trim_aacgm(
+                mlats[offset:offset + size].reshape(lats.shape),
+                mlons[offset:offset + size].reshape(lats.shape))
+            coordinate_cache.put(key, *beam_corners)
+            coordinates[stid] = beam_corners
+            offset += size
+    return [coordinates[stid] for stid in stids]
+
+
 def aacgm_MLT_coordinates(**kwargs):
     beam_corners_lats, beam_corners_lons = aacgm_coordinates(**kwargs)
     beam_corners_mlts = convert2MLT(beam_corners_lons, **kwargs)
@@ -108,15 +322,17 @@ def gate2geographic_location(stid: int, beam: int, height: float = None,
                              range_estimation: RangeEstimation =
                              RangeEstimation.SLANT_RANGE, **kwargs):
     """
-    determines the geographic cell position for a given range gate and beam
+    determines the geographic cell position for a given range gate and beam,
+    beam and range_gate can be arrays (broadcast together) to get the
+    positions of many cells at once
 
     parameters
     ----------
         stid: int
             station id of the radar to use
-        beam: int
+        beam: int or np.ndarray
             beam number (indexing at 0)
-        range_gate: int
+        range_gate: int or np.ndarray
             range gate number (indexing at 0)
         rsep: int
             range seperation, determined by the mode the
@@ -140,9 +356,9 @@ def gate2geographic_location(stid: int, beam: int, height: float = None,
 
     returns
     -------
-        lat: float
+        lat: float or np.ndarray
             latitude of the range gate in geographic coordinates [deg]
-        lon: float
+        lon: float or np.ndarray
             longitude of the range gate in geographic coordinates [deg]
     """
     # centre of the field of view
@@ -0,0 +1,312 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+#
+"""
+This module compiles the filters of SuperDARN data (the filter_settings
+dictionaries of the plotting methods, or expressions combining field
+comparisons with and/or/not) into boolean masks computed over whole
+arrays of ColumnarData
+"""
+import numpy as np
+
+from typing import List, Union
+
+from pydarn import ColumnarData, to_columnar
+
+# filter_settings keys and the comparison of the values they remove
+SETTINGS_COMPARISONS = {'min_array_filter': np.less,
+                        'max_array_filter': np.greater,
+                        'min_scalar_filter': np.less,
+                        'max_scalar_filter': np.greater,
+                        'equal_scalar_filter': np.not_equal}
+
+
+class Filter():
+    """
+    Boolean expression on the fields of SuperDARN records. Comparisons of
+    fields with values are combined with & (and), | (or) and ~ (not) and
+    evaluated with numpy on the cells (record and position in the array
+    fields) of ColumnarData, scalar fields are broadcast to the cells of
+    their record.
+
+    A comparison is False where the field is missing (the record does not
+    have it or the position is past the end of the array).
+
+    Example
+    -------
+        # velocities between -500 and 500 m/s with more than 3 dB of
+        # power or any data at 12 MHz and up
+        v = Filter.field('v')
+        plot_filter = ((v >= -500) & (v <= 500) &
+                       (Filter.field('p_l') > 3)) |\\
+            (Filter.field('tfreq') >= 12000)
+
+    Methods
+    -------
+        field(name) : FilterField to compare
+        compile(filter_settings) : Filter of a filter_settings dictionary
+        fields() : names of the fields used
+        mask(data, records, positions) : mask of the cells passing the
+            filter
+        cell_masks(dmap_data, indices, array_field) : masks of the array
+            positions of records passing the filter
+    """
+
+    def __init__(self, operator: str, *operands):
+        """
+        Use Filter.field and the &, |, ~ operators (or Filter.compile)
+        to build filters
+
+        Parameters
+        ----------
+            operator: str
+                'all', 'present', 'compare', 'and', 'or' or 'not'
+            operands:
+                field names and comparison for 'present' and 'compare',
+                Filters for 'and', 'or' and 'not'
+        """
+        self.operator = operator
+        self.operands = operands
+
+    def __and__(self, other):
+        return Filter('and', self, other)
+
+    def __or__(self, other):
+        return Filter('or', self, other)
+
+    def __invert__(self):
+        return Filter('not', self)
+
+    def __repr__(self):
+        if self.operator == 'all':
+            return 'Filter()'
+        if self.operator == 'present':
+            return "present({})".format(self.operands[0])
+        if self.operator == 'compare':
+            name, compare, value = self.operands
+            return "({} {} {!r})".format(name, compare.__name__, value)
+        if self.operator == 'not':
+            return "~{!r}".format(self.operands[0])
+        return "({!r} {} {!r})".format(self.operands[0],
+                                       '&' if self.operator == 'and'
+                                       else '|', self.operands[1])
+
+    @staticmethod
+    def field(name: str):
+        """
+        Returns a FilterField, comparing it (<, <=, >, >=, ==, !=) with a
+        value gives a Filter
+
+        Parameters
+        ----------
+            name: str
+                name of a scalar or array field, i.e. 'v' or 'tfreq'
+        """
+        return FilterField(name)
+
+    @classmethod
+    def compile(cls, filter_settings: Union[dict, 'Filter'] = {}):
+        """
+        Returns the Filter of a filter_settings dictionary (see
+        RTP.plot_range_time) or the Filter itself
+
+        Parameters
+        ----------
+            filter_settings: dict or Filter
+                dictionary of min_array_filter, max_array_filter,
+                min_scalar_filter, max_scalar_filter and
+                equal_scalar_filter each a dictionary of field names and
+                values, values failing the comparison (or missing the field)
+                are removed
+                Default: {} no filter
+
+        Raises
+        ------
+            KeyError - unknown filter type in the dictionary
+        """
+        if isinstance(filter_settings, Filter):
+            return filter_settings
+        plot_filter = None
+        for filter_type, settings in filter_settings.items():
+            compare = SETTINGS_COMPARISONS[filter_type]
+            for name, value in settings.items():
+                # removes the values matching the comparison
+                keep = cls('present', name) &\
+                    ~cls('compare', name, compare, value)
+                plot_filter = keep if plot_filter is None \
+                    else plot_filter & keep
+        return cls('all') if plot_filter is None else plot_filter
+
+    def fields(self) -> List[str]:
+        """
+        Names of the fields used by the filter
+        """
+        if self.operator in ['present', 'compare']:
+            return [self.operands[0]]
+        fields = []
+        for operand in self.operands:
+            fields.extend(name for name in operand.fields()
+                          if name not in fields)
+        return fields
+
+    def mask(self, data: ColumnarData, records: np.ndarray = None,
+             positions: np.ndarray = None) -> np.ndarray:
+        """
+        Evaluates the filter on cells of the data
+
+        Parameters
+        ----------
+            data: ColumnarData
+                records with the fields of the filter
+            records: np.ndarray
+                record index of each cell
+                Default: every record
+            positions: np.ndarray
+                position of each cell in the array fields of its record,
+                None evaluates records (the filter can only use scalar
+                fields)
+                Default: None
+
+        Returns
+        -------
+            mask: np.ndarray
+                True for the cells passing the filter
+
+        Raises
+        ------
+            ValueError - array field used without positions
+        """
+        if records is None:
+            records = np.arange(len(data))
+        # fields used many times are only gathered once
+        values = {}
+        return self.__evaluate(data, np.asarray(records), positions, values)
+
+    def __evaluate(self, data: ColumnarData, records: np.ndarray,
+                   positions: np.ndarray, values: dict):
+        if self.operator == 'all':
+            return np.ones(len(records), dtype=bool)
+        if self.operator == 'not':
+            return ~self.operands[0].__evaluate(data, records, positions,
+                                                values)
+        if self.operator in ['and', 'or']:
+            left = self.operands[0].__evaluate(data, records, positions,
+                                               values)
+            right = self.operands[1].__evaluate(data, records, positions,
+                                                values)
+            return left & right if self.operator == 'and' else left | right
+
+        name = self.operands[0]
+        if name not in values:
+            values[name] = self.__field_values(data, name, records,
+                                               positions)
+        field_values, valid = values[name]
+        if self.operator == 'present':
+            return valid.copy()
+        _, compare, value = self.operands
+        if field_values is None:
+            return valid.copy()
+        return compare(field_values, value) & valid
+
+    @staticmethod
+    def __field_values(data: ColumnarData, name: str, records: np.ndarray,
+                       positions: np.ndarray):
+        """ values of the field at the cells and where they exist """
+        if name not in data.fields:
+            return None, np.zeros(len(records), dtype=bool)
+        if data.is_array(name):
+            if positions is None:
+                raise ValueError("The array field {} can only be filtered"
+                                 " with the positions of the cells"
+                                 "".format(name))
+            field_values, valid = data.gather(name, records, positions)
+            return field_values, valid
+        return data.scalar(name)[records], data.present(name)[records]
+
+    def cell_masks(self, dmap_data: Union[List[dict], ColumnarData],
+                   indices: np.ndarray,
+                   array_field: str = 'slist') -> List[np.ndarray]:
+        """
+        Evaluates the filter on every position of the array fields of the
+        given records, i.e. the range gates of the records of a scan
+
+        Parameters
+        ----------
+            dmap_data: List[dict] or ColumnarData
+                records
+            indices: np.ndarray
+                indices of the records to evaluate
+            array_field: str
+                array field giving the number of positions of each record
+                Default: slist
+
+        Returns
+        -------
+            masks: List[np.ndarray]
+                one mask per record, True for the positions passing the
+                filter, empty for records without array_field
+        """
+        indices = np.asarray(indices, dtype=int)
+        if isinstance(dmap_data, ColumnarData):
+            data = dmap_data.take(indices)
+        else:
+            data = to_columnar([dmap_data[i] for i in indices],
+                               fields=self.fields() + [array_field])
+        if array_field not in data.fields:
+            return [np.zeros(0, dtype=bool) for _ in indices]
+        lengths = data.lengths(array_field)
+        offsets = np.zeros(len(indices) + 1, dtype=int)
+        np.cumsum(lengths, out=offsets[1:])
+        records = np.repeat(np.arange(len(indices)), lengths)
+        positions = np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths)
+        return np.split(self.mask(data, records, positions), offsets[1:-1])
+
+
+class FilterField():
+    """
+    Field of a Filter, comparing it with a value gives a Filter
+    (see Filter.field)
+    """
+    # FilterFields are not hashable as == is a comparison
+    __hash__ = None
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __compare(self, compare, value):
+        return Filter('compare', self.name, compare, value)
+
+    def __lt__(self, value):
+        return self.__compare(np.less, value)
+
+    def __le__(self, value):
+        return self.__compare(np.less_equal, value)
+
+    def __gt__(self, value):
+        return self.__compare(np.greater, value)
+
+    def __ge__(self, value):
+        return self.__compare(np.greater_equal, value)
+
+    def __eq__(self, value):
+        return self.__compare(np.equal, value)
+
+    def __ne__(self, value):
+        return self.__compare(np.not_equal, value)
+
+    def isin(self, values: list):
+        """ Filter of the cells with one of the values """
+        return self.__compare(np.isin, list(values))
+
+    def present(self):
+        """ Filter of the cells with the field """
+        return Filter('present', self.name)
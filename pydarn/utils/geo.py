@@ -43,6 +43,9 @@ def geocentric_coordinates(target_range: float, psi: float, boresight: float,
     """
     Calculates the geocentric coordinates of gate cell  point,
     using either the standard or Chisham virtual height model.
+    target_range, psi and boresight can be arrays (broadcast together)
+    to calculate many cells at once, each cell stops iterating
+    once it has converged.
 
     Parameters
     ----------
@@ -50,13 +53,13 @@ def geocentric_coordinates(target_range: float, psi: float, boresight: float,
             radars site latitude [rad]
         radar_lon : float
             radars site longitude [lon]
-        target_range: float
+        target_range: float or np.ndarray
             The range from the instrument to the target (echo) [km]
         cell_height : float
             virtual height of the gate cell [km]
-        psi: int
+        psi: float or np.ndarray
             [rad]
-        boresight: float
+        boresight: float or np.ndarray
             boresight of the radar beam [rad]
         virtual_height_model: VHModels
             use for choosing type of virtual height
@@ -64,9 +67,9 @@ def geocentric_coordinates(target_range: float, psi: float, boresight: float,
 
     Returns
     -------
-        cell_lat: float
+        cell_lat: float or np.ndarray
             latitude of the range gate in geographic coordinates [rad]
-        cell_lon: float
+        cell_lon: float or np.ndarray
             longitude of the range gate in geographic coordinates [rad]
 
     """
@@ -75,70 +78,82 @@ def geocentric_coordinates(target_range: float, psi: float, boresight: float,
     radars – Part 1: A new empirical virtual height model by
     G. Chisham 2008 (https://doi.org/10.5194/angeo-26-823-2008)
     """
-    x_height = virtual_height_model(target_range=target_range, **kwargs)
+    target_range, psi, boresight = \
+        np.broadcast_arrays(np.asarray(target_range, dtype=float),
+                            np.asarray(psi, dtype=float),
+                            np.asarray(boresight, dtype=float))
+    x_height = np.broadcast_to(virtual_height_model(target_range=target_range,
+                                                    **kwargs),
+                               target_range.shape)
 
     # calculate the radius over the earth underneath
     # the radar and range gate cell
     rlat, rlon, r_radar, delta = geodetic2geocentric(**kwargs)
-    r_cell = r_radar
+    r_cell = np.full(target_range.shape, r_radar)
 
     psi_cos_2 = np.cos(psi)**2
     psi_sin_2 = np.sin(psi)**2
 
-    while_flag = True
-    while while_flag:
+    cell_lat = np.zeros(target_range.shape)
+    cell_lon = np.zeros(target_range.shape)
+    # cells that have not converged yet, every iteration only
+    # works on these cells
+    active = np.ones(target_range.shape, dtype=bool)
+    while active.any():
+        t_range = target_range[active]
+        x_hgt = x_height[active]
         # distance between the gate cell to the earth's centre [km]
-        cell_rho = r_cell + x_height
+        cell_rho = r_cell[active] + x_hgt
         # elevation angle relative to local horizon [rad]
-        rel_elv = np.arcsin(((cell_rho**2) - (r_radar**2) - target_range**2) /
-                            (2.0 * r_radar * target_range))
+        rel_elv = np.arcsin(((cell_rho**2) - (r_radar**2) - t_range**2) /
+                            (2.0 * r_radar * t_range))
         # estimate elevation for multi-hop propagation
-        if virtual_height_model == VHModels.CHISHAM and target_range > 2137.5:
-            gamma = np.arccos((r_radar**2 + cell_rho**2 - target_range**2) /
+        if virtual_height_model == VHModels.CHISHAM:
+            gamma = np.arccos((r_radar**2 + cell_rho**2 - t_range**2) /
                               (2.0 * r_radar * cell_rho))
             beta = np.arcsin(r_radar * np.sin(gamma/3.0) /
-                             (target_range/3.0))
+                             (t_range/3.0))
             # Elevation angle used for estimating off-array normal
             # azimuth [rad]
-            xelv = (np.pi/2) - beta - (gamma/3.0)
+            xelv = np.where(t_range > 2137.5,
+                            (np.pi/2) - beta - (gamma/3.0), rel_elv)
         else:
             xelv = rel_elv
 
         # Estimate the off-array-normal azimuth in radians
         elv_sin_2 = np.sin(xelv)**2
 
-        est_azimuth = psi_cos_2 - elv_sin_2
-        if est_azimuth < 0:
-            tan_azimuth = 1e32
-        else:
-            # in radians
-            tan_azimuth = np.sqrt(psi_sin_2 /
-                                  (psi_cos_2 - elv_sin_2))
+        est_azimuth = psi_cos_2[active] - elv_sin_2
+        # in radians
+        tan_azimuth = np.where(est_azimuth < 0, 1e32,
+                               np.sqrt(psi_sin_2[active] /
+                                       np.where(est_azimuth < 0, 1,
+                                                est_azimuth)))
         # azimuth in [rad]
-        if psi > 0:
-            azimuth = np.arctan(tan_azimuth)
-        else:
-            azimuth = -np.arctan(tan_azimuth)
+        azimuth = np.where(psi[active] > 0, np.arctan(tan_azimuth),
+                           -np.arctan(tan_azimuth))
 
         # azimuth of the gate cell [rad]
-        cell_azimuth = azimuth + boresight
+        cell_azimuth = azimuth + boresight[active]
         flatten_azimuth = geocentric2flattening(delta=delta,
                                                 azimuth=cell_azimuth,
                                                 elv=xelv)
-        cell_rho, cell_lat, cell_lon = \
+        cell_rho, lat, lon = \
             cell_geocentric_coordinates(lat=rlat, lon=rlon,
                                         rho=r_radar,
                                         azimuth=flatten_azimuth,
                                         elv=rel_elv,
-                                        r=target_range)
+                                        r=t_range)
+        cell_lat[active] = lat
+        cell_lon[active] = lon
 
         # recalculate the radius under the gate cell and centre of earth
-        r_cell = geocentric2geodetic(lat=cell_lat, lon=cell_lon)
-        cell_heightx = cell_rho - r_cell
+        r_cell[active] = geocentric2geodetic(lat=lat, lon=lon)
+        cell_heightx = cell_rho - r_cell[active]
         # this ensures convergence on the cell point
-        while_flag = abs(cell_heightx - x_height) > 0.5
+        active[active] = abs(cell_heightx - x_hgt) > 0.5
 
-    return cell_lat, cell_lon
+    return cell_lat[()], cell_lon[()]
 
 
 # fldpnt
@@ -215,10 +230,8 @@ def cell_geocentric_coordinates(lat: float, lon: float, rho: float,
     # convert Cartesian back to spherical
     rho = np.sqrt(global_x**2 + global_y**2 + global_z**2)
     lat = np.pi/2 - np.arccos(global_z/rho)
-    if global_x == 0 and global_y == 0:
-        lon = 0
-    else:
-        lon = np.arctan2(global_y, global_x)
+    lon = np.where((global_x == 0) & (global_y == 0), 0,
+                   np.arctan2(global_y, global_x))[()]
 
     return rho, lat, lon
 
@@ -298,8 +311,7 @@ def geodetic2geocentric(lat: float, lon: float, **kwargs):
     # glon [rad]
     glon = lon
 
-    if glon > np.pi:
-        glon = glon - 2 * np.pi
+    glon = np.where(glon > np.pi, glon - 2 * np.pi, glon)[()]
     # grho is km?
     rho = EARTH_EQUATORIAL_RADIUS / np.sqrt(1 + e2 * np.sin(glat)**2)
     # delta in [rad]
@@ -18,10 +18,10 @@ for multiple plotting methods
 import enum
 import numpy as np
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List
 
-from pydarn import plot_exceptions
+from pydarn import plot_exceptions, ColumnarData
 
 class MapParams(enum.Enum):
     """
@@ -33,19 +33,22 @@ class MapParams(enum.Enum):
     SPECTRAL_WIDTH = "vector.wdt.median"
 
 
-def find_record(dmap_data: List[dict], start_time: datetime, time_delta:int = 1):
+def find_record(dmap_data: List[dict], start_time: datetime,
+                time_delta: int = 1):
     """
     finds the record number that associates to the start time
 
     Parameter
     ---------
-        dmap_data : List[dict]
-            the data to look over for the record number
+        dmap_data : List[dict] or ColumnarData
+            the data to look over for the record number, a list is scanned
+            in record order up to the first match, ColumnarData is looked
+            up with its time index (built once) for repeated lookups
         start_time : datetime
             the start_time to associate to the record number
         time_delta : int
             the difference between start_time and dmap_data time to determine
-            the record number within a region
+            the record number within a region in minutes
 
     Return
     ------
@@ -57,14 +60,19 @@ def find_record(dmap_data: List[dict], start_time: datetime, time_delta:int = 1)
         NoDataFound
             raises if the start_time is not in the dmap_data list
     """
-    record_num = 0
-    for record in dmap_data:
-        date = time2datetime(record)
-        time_diff = date - start_time
-        if time_diff.seconds/60 <= time_delta:
+    end_time = start_time + timedelta(minutes=time_delta)
+    if isinstance(dmap_data, ColumnarData):
+        record_num = dmap_data.time_index().find(start_time, end_time)
+        if record_num >= 0:
             return record_num
-        record_num += 1
-    raise plot_exceptions.NoDataFoundError(parameter, start_time=start_time)
+    else:
+        # building an index of the whole list costs more than a scan
+        # that stops at the first match
+        for record_num, record in enumerate(dmap_data):
+            if start_time <= time2datetime(record) <= end_time:
+                return record_num
+    raise plot_exceptions.NoDataFoundError('time', start_time=start_time)
+
 
 def check_data_type(dmap_data: List[dict], parameter: str,
                     expected_type: str, index: int):
@@ -100,6 +108,95 @@ def check_data_type(dmap_data: List[dict], parameter: str,
                                                            data_type)
 
 
+def times2datetime64(dmap_data: List[dict]) -> np.ndarray:
+    """
+    Converts the DMAP time parameter fields of all records into one
+    datetime64 array in a single pass
+
+    Parameter
+    ---------
+    dmap_data: List[dict] or ColumnarData
+        list of records of the DMAP data contains the time data,
+        ColumnarData keeps the converted times so they are only
+        converted once
+
+    Returns
+    -------
+    numpy.ndarray
+        datetime64[us] array of the records time stamps
+    """
+    if isinstance(dmap_data, ColumnarData):
+        return dmap_data.times()
+    return ColumnarData.record_times(dmap_data)
+
+
+def find_gaps(times: np.ndarray,
+              gap_resolution: timedelta = timedelta(minutes=2)) -> np.ndarray:
+    """
+    Finds the data gaps in a time axis
+
+    Parameter
+    ---------
+    times: numpy.ndarray
+        datetime64 array of the times in time order
+    gap_resolution: timedelta
+        longest time between two times that is not a gap
+        Default: 2 minutes
+
+    Returns
+    -------
+    numpy.ndarray
+        indices i of the times followed by a gap,
+        times[i+1] - times[i] > gap_resolution
+    """
+    return np.flatnonzero(np.diff(times) >
+                          np.timedelta64(gap_resolution, 'us'))
+
+
+def fill_gaps(times: np.ndarray,
+              gap_resolution: timedelta = timedelta(minutes=2),
+              end_time: datetime = None) -> tuple:
+    """
+    Pads a time axis with a time every gap_resolution in the data gaps so
+    no time is followed by more than gap_resolution without data, i.e.
+    pcolormesh does not stretch a record over a data gap and the lines of
+    plot_date are broken at the gaps
+
+    Parameter
+    ---------
+    times: numpy.ndarray
+        datetime64 array of the times in time order
+    gap_resolution: timedelta
+        time step of the padding
+        Default: 2 minutes
+    end_time: datetime
+        the gap between the last time and end_time is padded too
+        Default: None
+
+    Returns
+    -------
+    filled_times: numpy.ndarray
+        datetime64[us] padded time axis
+    index: numpy.ndarray
+        position of each of times in filled_times, data is scattered into
+        the padded axis with filled_values[index] = values
+    """
+    times = np.asarray(times, dtype='datetime64[us]')
+    gap_resolution = np.timedelta64(gap_resolution, 'us')
+    anchors = times
+    if end_time is not None and len(times) > 0:
+        anchors = np.append(times, max(np.datetime64(end_time, 'us'),
+                                       times[-1]))
+    fills = np.zeros(len(times), dtype=int)
+    fills[:len(anchors) - 1] = np.maximum(
+        np.ceil(np.diff(anchors) / gap_resolution) - 1, 0)
+    rows_per_time = fills + 1
+    index = np.cumsum(rows_per_time) - rows_per_time
+    steps = np.arange(rows_per_time.sum()) - np.repeat(index, rows_per_time)
+    filled_times = np.repeat(times, rows_per_time) + steps * gap_resolution
+    return filled_times, index
+
+
 def time2datetime(dmap_record: dict) -> datetime:
     """
     Converts DMAP time parameter fields into a datetime object
@@ -0,0 +1,504 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+#
+"""
+This module builds the time x range gate matrix used in range-time
+parameter plots without doing any plotting, in one go (build_range_time)
+or record by record (RangeTimeBuffer)
+"""
+import numpy as np
+
+from datetime import datetime, timedelta
+from typing import List, Union
+
+from pydarn import (RangeEstimation, SuperDARNRadars, check_data_type,
+                    plot_exceptions, ColumnarData, to_columnar, find_gaps,
+                    fill_gaps, Filter)
+
+
+def build_range_time(dmap_data: Union[List[dict], ColumnarData],
+                     parameter: str = 'v',
+                     beam_num: int = 0, channel: int = 'all',
+                     start_time: datetime = None, end_time: datetime = None,
+                     groundscatter: bool = False, filter_settings: dict = {},
+                     range_estimation: RangeEstimation =
+                     RangeEstimation.SLANT_RANGE,
+                     gap_resolution: timedelta = timedelta(minutes=2),
+                     **kwargs):
+    """
+    Builds the x (time), y (range) and z (parameter) arrays of a range-time
+    parameter plot. The time x gate grid is allocated once and the
+    parameter data of all records is scattered into it in bulk.
+
+    Parameters
+    ----------
+    dmap_data: List[dict] or ColumnarData
+        List of dictionaries or ColumnarData representing SuperDARN data
+    parameter: str
+        key name indicating which parameter to use
+        Default: v (Velocity)
+    beam_num : int or str
+        The beam number of data to use or 'all'
+        Default: 0
+    channel : int or str
+        The channel 0, 1, 2, 'all'
+        Default : 'all'
+    start_time: datetime
+        Start time of the x-axis
+        Default: first record time
+    end_time: datetime
+        End time of the x-axis
+        Default: last record time
+    groundscatter : bool or str
+        If True (or a string) ground scatter cells are set to -1000000
+        so they can be coloured separately
+        Default : False
+    filter_settings: dict or Filter
+        dictionary of min_array_filter, max_array_filter,
+        min_scalar_filter, max_scalar_filter and equal_scalar_filter
+        (see RTP.plot_range_time for more information) or a Filter of
+        the values to keep, ground scatter is not filtered
+        Default: {}
+    range_estimation: RangeEstimation
+        range estimation used for the y-axis
+        Default: RangeEstimation.SLANT_RANGE
+    gap_resolution: timedelta
+        records more than gap_resolution apart are not joined, the data
+        gap is filled with empty rows every gap_resolution
+        Default: 2 minutes
+    kwargs:
+        passed to the range estimation, i.e., reflection_height
+
+    Raises
+    ------
+    UnknownParameterError
+    IncorrectPlotMethodError
+    NoDataFoundError
+
+    Returns
+    -------
+    x: list
+        datetime objects of the time edges of each z row,
+        one longer than the number of rows
+    y: numpy.ndarray
+        range edges of each z column, one longer than the number of columns
+    z: numpy.ndarray
+        2D array (time x range) of the parameter values, NaN where
+        there is no data
+    """
+    plot_filter = Filter.compile(filter_settings)
+    data = to_columnar(dmap_data, fields=_range_time_fields(
+        parameter, groundscatter, plot_filter))
+
+    if not data.present(parameter).any():
+        raise plot_exceptions.UnknownParameterError(parameter)
+    # because of partial records we need to find the first
+    # record that has that parameter
+    index_first_match = int(np.argmax(data.present(parameter)))
+    check_data_type(data, parameter, 'array', index_first_match)
+
+    rec_times = data.times()
+    if not start_time:
+        start_time = rec_times[0].astype(datetime)
+    if not end_time:
+        end_time = rec_times[-1].astype(datetime)
+    start = np.datetime64(start_time, 'us')
+    end = np.datetime64(end_time, 'us')
+
+    # records are in time order so stop at the first record past end_time
+    past_end = rec_times > end
+    stop = np.argmax(past_end) if past_end.any() else len(data)
+
+    selected = np.zeros(len(data), dtype=bool)
+    selected[:stop] = rec_times[:stop] >= start
+    if beam_num != 'all':
+        selected &= data.scalar('bmnum') == beam_num
+    if channel != 'all':
+        selected &= data.scalar('channel') == channel
+    selected = np.flatnonzero(selected)
+
+    # because nrang can change based on mode we need to look
+    # for the largest value
+    nrang = data.scalar('nrang')
+    y_max = nrang[data.present('nrang')].max()
+    y = np.arange(0, y_max+1, 1)
+
+    if len(selected) == 0:
+        raise plot_exceptions.\
+                NoDataFoundError(parameter, beam_num,
+                                 start_time=start_time,
+                                 end_time=end_time,
+                                 opt_beam_num=data[0]['bmnum'])
+
+    # Fill data gaps (no data recorded past gap_resolution) with empty rows
+    # every gap_resolution so pcolormesh does not stretch a record over the
+    # gap. The last record before end_time closes the final gap.
+    x_times, row_index = fill_gaps(rec_times[selected], gap_resolution,
+                                   end_time=rec_times[stop-1])
+
+    # z: parameter data mapped into the color mesh
+    z = np.full((len(x_times), y_max), np.nan)
+
+    record_row = np.full(len(data), -1)
+    record_row[selected] = row_index
+    records, gates, values = _range_time_cells(data, parameter, selected,
+                                               groundscatter, plot_filter)
+    z[record_row[records], gates] = values
+
+    x = x_times.astype(datetime).tolist()
+    x.append(end_time)
+
+    # Check if there is any data to plot
+    if np.all(np.isnan(z)):
+        raise plot_exceptions.\
+                NoDataFoundError(parameter, beam_num,
+                                 start_time=start_time,
+                                 end_time=end_time,
+                                 opt_beam_num=data[0]['bmnum'])
+
+    if range_estimation != RangeEstimation.RANGE_GATE:
+        y, y0inx = _range_edges(dmap_data[0], y_max, range_estimation,
+                                **kwargs)
+        z = z[:, y0inx:]
+    return x, y, z
+
+
+class RangeTimeBuffer():
+    """
+    Preallocated time x range gate matrix of a range-time parameter plot
+    that records are appended to, i.e. the records returned by
+    SuperDARNRead.follow. The rows are a regular time grid of
+    time_resolution from start_time so appending records only writes the
+    rows of the new records, the earlier rows are never filtered or
+    copied again (unless the buffer is full and doubled in size).
+
+    Each record fills its row, a record lasts until the next record
+    (the rows in between are copied from it) unless there is a data gap
+    of more than gap_resolution. If two records fall in the same row the
+    later one is kept.
+
+    Attributes
+    ----------
+        z: numpy.ndarray
+            2D array (time x range gate) of the parameter values, NaN
+            where there is no data and -1000000 for ground scatter
+        start_time: numpy.datetime64
+            time of the first row
+        time_resolution: numpy.timedelta64
+            time of each row
+        gap_resolution: numpy.timedelta64
+            records further apart are not joined
+        num_rows: int
+            number of rows up to the row of the last record
+        last_time: numpy.datetime64
+            time of the last record appended, None before the first one
+
+    Methods
+    -------
+        append(dmap_data) : writes the rows of the records
+        times() : datetime64 edges of the rows
+        range_edges(range_estimation) : range edges of the columns
+    """
+    def __init__(self, dmap_data: Union[List[dict], ColumnarData],
+                 parameter: str = 'v', beam_num: int = 0,
+                 channel: int = 'all', start_time: datetime = None,
+                 time_resolution: timedelta = None,
+                 duration: timedelta = timedelta(hours=24),
+                 groundscatter: bool = False, filter_settings: dict = {},
+                 gap_resolution: timedelta = timedelta(minutes=2)):
+        """
+        Parameters
+        ----------
+        dmap_data: List[dict] or ColumnarData
+            first records of the plot, they set the number of range gates
+            (largest nrang) and the default start_time and time_resolution
+        parameter: str
+            key name indicating which parameter to use
+            Default: v (Velocity)
+        beam_num : int or str
+            The beam number of data to use or 'all'
+            Default: 0
+        channel : int or str
+            The channel 0, 1, 2, 'all'
+            Default : 'all'
+        start_time: datetime
+            time of the first row, earlier records are dropped
+            Default: time of the first record
+        time_resolution: timedelta
+            time of each row
+            Default: median time between the selected records of
+            dmap_data, 1 minute with less than 2 records
+        duration: timedelta
+            time span the matrix is allocated for, it doubles when
+            records go past its end
+            Default: 24 hours
+        groundscatter : bool or str
+            If True (or a string) ground scatter cells are set to -1000000
+            Default : False
+        filter_settings: dict or Filter
+            dictionary of min_array_filter, max_array_filter,
+            min_scalar_filter, max_scalar_filter and equal_scalar_filter
+            (see RTP.plot_range_time for more information) or a Filter of
+            the values to keep
+            Default: {}
+        gap_resolution: timedelta
+            records more than gap_resolution apart are not joined
+            Default: 2 minutes
+
+        Raises
+        ------
+        UnknownParameterError
+        IncorrectPlotMethodError
+        """
+        self.parameter = parameter
+        self.beam_num = beam_num
+        self.channel = channel
+        self.groundscatter = groundscatter
+        self.plot_filter = Filter.compile(filter_settings)
+        self.gap_resolution = np.timedelta64(gap_resolution, 'us')
+        self._fields = _range_time_fields(parameter, groundscatter,
+                                          self.plot_filter)
+
+        data = to_columnar(dmap_data, fields=self._fields)
+        if not data.present(parameter).any():
+            raise plot_exceptions.UnknownParameterError(parameter)
+        index_first_match = int(np.argmax(data.present(parameter)))
+        check_data_type(data, parameter, 'array', index_first_match)
+
+        rec_times = data.times()
+        if start_time is None:
+            self.start_time = rec_times[0]
+        else:
+            self.start_time = np.datetime64(start_time, 'us')
+        if time_resolution is None:
+            sel_times = rec_times[self._select(data, rec_times)]
+            if len(sel_times) > 1:
+                time_resolution = np.median(np.diff(sel_times))
+            else:
+                time_resolution = timedelta(minutes=1)
+        self.time_resolution = np.timedelta64(time_resolution, 'us')
+        if self.time_resolution <= np.timedelta64(0, 'us'):
+            raise ValueError("time_resolution has to be positive, not {}"
+                             "".format(time_resolution))
+
+        # because nrang can change based on mode we need to look
+        # for the largest value
+        nrang = data.scalar('nrang')[data.present('nrang')].max()
+        num_rows = int(np.ceil(np.timedelta64(duration, 'us') /
+                               self.time_resolution))
+        self.z = np.full((max(num_rows, 1), nrang), np.nan)
+        # radar settings of the range estimation
+        self._record = {key: dmap_data[0][key]
+                        for key in ['stid', 'frang', 'rsep']
+                        if key in dmap_data[0]}
+        self.num_rows = 0
+        self.last_time = None
+        self._last_row = -1
+        self.append(data)
+
+    def _select(self, data: ColumnarData, rec_times: np.ndarray):
+        """ indices of the records of the beam and channel """
+        selected = rec_times >= self.start_time
+        if self.beam_num != 'all':
+            selected &= data.scalar('bmnum') == self.beam_num
+        if self.channel != 'all':
+            selected &= data.scalar('channel') == self.channel
+        return np.flatnonzero(selected)
+
+    def times(self):
+        """
+        datetime64 edges of the rows, one longer than the number of rows
+        """
+        return self.start_time + \
+            np.arange(len(self.z) + 1) * self.time_resolution
+
+    def range_edges(self, range_estimation: RangeEstimation =
+                    RangeEstimation.RANGE_GATE, **kwargs):
+        """
+        Range edges of the z columns, gates without a finite range
+        (before the first gate) are left out of the edges
+
+        Parameters
+        ----------
+        range_estimation: RangeEstimation
+            range estimation used for the y-axis
+            Default: RangeEstimation.RANGE_GATE
+        kwargs:
+            passed to the range estimation, i.e., reflection_height
+
+        Returns
+        -------
+        y: numpy.ndarray
+            range edges
+        first_gate: int
+            z column of the first edge
+        """
+        if range_estimation == RangeEstimation.RANGE_GATE:
+            return np.arange(0, self.z.shape[1] + 1, 1), 0
+        return _range_edges(self._record, self.z.shape[1],
+                            range_estimation, **kwargs)
+
+    def append(self, dmap_data: Union[List[dict], ColumnarData]):
+        """
+        Writes the rows of the records (and the rows joining them to the
+        previous records), the cost is proportional to the number of new
+        records
+
+        Parameters
+        ----------
+        dmap_data: List[dict] or ColumnarData
+            records to add, in time order
+
+        Returns
+        -------
+        rows: slice
+            rows of z that changed, empty if no record was selected
+        """
+        data = to_columnar(dmap_data, fields=self._fields)
+        if len(data) == 0:
+            return slice(self.num_rows, self.num_rows)
+        rec_times = data.times()
+        selected = self._select(data, rec_times)
+        if len(selected) == 0:
+            return slice(self.num_rows, self.num_rows)
+        rows = (rec_times[selected] - self.start_time) // self.time_resolution
+        rows = rows.astype(int)
+
+        if rows[-1] >= len(self.z):
+            # double the buffer so appending stays linear overall
+            grown = np.full((max(2 * len(self.z), rows[-1] + 1),
+                             self.z.shape[1]), np.nan)
+            grown[:len(self.z)] = self.z
+            self.z = grown
+
+        # keep the last record of each row
+        rows, last = np.unique(rows[::-1], return_index=True)
+        selected = selected[::-1][last]
+        times = rec_times[selected]
+        self.z[rows] = np.nan
+        records, gates, values = _range_time_cells(
+            data, self.parameter, selected, self.groundscatter,
+            self.plot_filter)
+        record_row = np.full(len(data), -1)
+        record_row[selected] = rows
+        # modes with more range gates than the first records are cut
+        in_range = gates < self.z.shape[1]
+        self.z[record_row[records[in_range]], gates[in_range]] = \
+            values[in_range]
+
+        # fill the rows between records closer than gap_resolution, from
+        # the last record already in the buffer
+        continued = self.last_time is not None and self._last_row < rows[0]
+        if continued:
+            anchor_rows = np.append(self._last_row, rows)
+            anchor_times = np.append(self.last_time, times)
+        else:
+            anchor_rows = rows
+            anchor_times = times
+        fills = np.diff(anchor_rows) - 1
+        fills[find_gaps(anchor_times, self.gap_resolution)] = 0
+        first_fill = np.cumsum(fills) - fills
+        steps = np.arange(fills.sum()) - np.repeat(first_fill, fills)
+        source = np.repeat(anchor_rows[:-1], fills)
+        self.z[source + steps + 1] = self.z[source]
+
+        if rows[-1] >= self._last_row:
+            self._last_row = rows[-1]
+            self.last_time = times[-1]
+        self.num_rows = max(self.num_rows, rows[-1] + 1)
+        return slice(rows[0] - fills[0] if continued else rows[0],
+                     rows[-1] + 1)
+
+
+def _range_edges(record: dict, nrang: int,
+                 range_estimation: RangeEstimation, **kwargs):
+    """
+    Returns the range estimation edges of the gates with a finite range
+    and the index of the first of those gates
+    """
+    # Get rxrise from hardware files (consistent with RST)
+    rxrise = SuperDARNRadars.radars[record['stid']]\
+                            .hardware_info.rx_rise_time
+    frang = int(record['frang'])
+    rsep = int(record['rsep'])
+
+    y = range_estimation(frang=frang, rxrise=rxrise,
+                         rsep=rsep, nrang=nrang, **kwargs)
+
+    y0inx = np.min(np.where(np.isfinite(y))[0])
+    return y[y0inx:], y0inx
+
+
+def _range_time_fields(parameter: str, groundscatter: bool,
+                       plot_filter: Filter):
+    """ fields needed to build the range-time matrix """
+    # only the fields needed are converted when given a list of records
+    fields = [parameter, 'slist', 'nrang', 'bmnum', 'channel']
+    if groundscatter:
+        fields.append('gflg')
+    fields.extend(plot_filter.fields())
+    fields.extend(ColumnarData.TIME_FIELDS)
+    return fields
+
+
+def _range_time_cells(data: ColumnarData, parameter: str,
+                      selected: np.ndarray, groundscatter: bool,
+                      plot_filter: Filter):
+    """
+    Returns the record, range gate and value of every cell of the selected
+    records that passes the filters, ground scatter values are -1000000
+    """
+    # Records can be skipped as slist (and other per-gate fields) is not
+    # created due to bad quality data. Parameters that have a value for
+    # every range gate (i.e. pwr0) do not need slist.
+    lengths = data.lengths(parameter)
+    full_range = lengths == data.scalar('nrang')
+    usable = np.zeros(len(data), dtype=bool)
+    usable[selected] = True
+    usable &= data.present(parameter) &\
+        (full_range | data.present('slist'))
+    if groundscatter:
+        usable &= data.present('gflg')
+
+    # flattened index of every parameter value of the usable records
+    values, offsets = data.ragged(parameter)
+    records = np.repeat(np.arange(len(data)), lengths)
+    positions = np.arange(len(values)) - np.repeat(offsets[:-1], lengths)
+    keep = usable[records]
+    records = records[keep]
+    positions = positions[keep]
+    values = values[keep]
+
+    if 'slist' in data.fields:
+        slist, valid = data.gather('slist', records, positions)
+        gates = np.where(full_range[records], positions, slist)
+        keep = full_range[records] | valid
+    else:
+        gates = positions
+        keep = np.ones(len(records), dtype=bool)
+
+    if groundscatter:
+        gflg, valid = data.gather('gflg', records, positions)
+        gs_mask = (gflg == 1) & valid
+    else:
+        gs_mask = np.zeros(len(records), dtype=bool)
+
+    # the filter removes values, ground scatter is kept
+    good = ~gs_mask & plot_filter.mask(data, records, positions)
+
+    good &= keep
+    gs_mask &= keep
+    cells = good | gs_mask
+    # chosen value from davitpy to make the groundscatter
+    # a different color from the color map
+    values = np.where(gs_mask, -1000000, values)
+    return records[cells], gates[cells], values[cells]
@@ -18,8 +18,155 @@ into scans
 """
 
 import numpy as np
+
+from datetime import datetime
 from typing import List
 
+from pydarn import ColumnarData, TimeIndex, to_columnar
+
+
+class ScanIndex():
+    """
+    Index of the scans in the records. Scan numbers are built once with a
+    cumulative sum of the scan flags, a record with abs(scan) == 1 starts
+    a new scan, so the records of any scan are found in O(1).
+
+    Scans are numbered from 1, records before the first scan flag are in
+    scan 0 and records with a scan flag other than 0, 1 or -1 are not in
+    any scan (scan number -1).
+
+    Attributes
+    ----------
+        scan_numbers: np.ndarray
+            scan number of each record, -1 for records not in any scan
+            (records not in the channel or with a scan flag other than
+            0, 1 or -1)
+        record_numbers: np.ndarray
+            record indices in the channel
+        num_scans: int
+            number of scans
+        start_records: np.ndarray
+            first record of each scan (scan n at n-1)
+        stop_records: np.ndarray
+            one past the last record of each scan (scan n at n-1)
+
+    Methods
+    -------
+        records(scan_number) : record indices of the scan
+        beams(scan_number) : beam numbers of the scan
+        find(start, end) : scan number of the earliest record between
+            start and end
+        time_index() : TimeIndex of the records in the channel
+        start_times : datetime64 start time of each scan
+    """
+    def __init__(self, dmap_data: List[dict], channel: int = 'all'):
+        """
+        Parameters
+        ----------
+            dmap_data: List[dict] or ColumnarData
+                list of records (dictionaries) representing dmap data
+            channel: int or str
+                only index records of this channel or 'all' channels
+                Default: 'all'
+        """
+        self._data = to_columnar(dmap_data, fields=['scan', 'bmnum',
+                                                    'channel'] +
+                                 ColumnarData.TIME_FIELDS)
+        if channel == 'all':
+            in_channel = np.ones(len(self._data), dtype=bool)
+        else:
+            in_channel = self._data.present('channel') &\
+                (self._data.scalar('channel') == channel)
+        scan_mark = self._data.scalar('scan')
+        # Absolute value used due to some scan flags set as "-1"
+        new_scan = in_channel & (np.abs(scan_mark) == 1)
+        self.scan_numbers = np.cumsum(new_scan)
+        self.scan_numbers[~in_channel | ((scan_mark != 0) & ~new_scan)] = -1
+        self.record_numbers = np.flatnonzero(in_channel)
+        self.num_scans = int(np.count_nonzero(new_scan))
+
+        # records grouped by scan number, the records of scan n are
+        # self._order[self._offsets[n]:self._offsets[n+1]]
+        self._order = np.argsort(self.scan_numbers, kind='stable')
+        self._offsets = np.searchsorted(self.scan_numbers[self._order],
+                                        np.arange(self.num_scans + 2))
+        self.start_records = np.flatnonzero(new_scan)
+        self.stop_records = self._order[self._offsets[2:] - 1] + 1
+        self._time_index = None
+
+    def __len__(self):
+        return self.num_scans
+
+    def __iter__(self):
+        """
+        Iterates over the scans giving the scan number and its records
+        """
+        for scan_number in range(1, self.num_scans + 1):
+            yield scan_number, self.records(scan_number)
+
+    def records(self, scan_number: int) -> np.ndarray:
+        """
+        Record indices of the scan, empty if there is no such scan
+        """
+        scan_number = int(scan_number)
+        if not 0 <= scan_number <= self.num_scans:
+            return np.zeros(0, dtype=int)
+        return self._order[self._offsets[scan_number]:
+                           self._offsets[scan_number + 1]]
+
+    def beams(self, scan_number: int) -> np.ndarray:
+        """
+        Beam numbers of the records in the scan
+        """
+        return self._data.scalar('bmnum')[self.records(scan_number)]
+
+    def time_index(self) -> TimeIndex:
+        """
+        TimeIndex of the records in the channel, built on the first call
+        """
+        if self._time_index is None:
+            self._time_index = \
+                TimeIndex(self._data.times()[self.record_numbers])
+        return self._time_index
+
+    def find(self, start: datetime, end: datetime = None) -> int:
+        """
+        Returns the scan number of the earliest record in the channel with
+        start <= time <= end, -1 if there is no record in the window or
+        the record is not in any scan
+        """
+        record = self.time_index().find(start, end)
+        if record < 0:
+            return -1
+        return int(self.scan_numbers[self.record_numbers[record]])
+
+    @property
+    def start_times(self) -> np.ndarray:
+        """
+        datetime64 start time of each scan (scan n at n-1)
+        """
+        return self._data.times()[self.start_records]
+
+
+def build_scan_index(dmap_data: List[dict],
+                     channel: int = 'all') -> ScanIndex:
+    """
+    Returns the ScanIndex of the records, for ColumnarData the index is
+    built once and reused
+
+    Parameters
+    ----------
+    dmap_data: List(dict) or ColumnarData
+        list of records (dictionaries) representing dmap data
+    channel: int or str
+        only index records of this channel or 'all' channels
+        Default: 'all'
+    """
+    if isinstance(dmap_data, ColumnarData):
+        return dmap_data.cached(('scan_index', channel),
+                                lambda data: ScanIndex(data, channel))
+    return ScanIndex(dmap_data, channel)
+
 
 def build_scan(dmap_data: List[dict]):
     """
@@ -34,19 +181,7 @@ def build_scan(dmap_data: List[dict]):
     ----------
     beam_scan: List
         list of size equal to number of records in dmap_data, with scan number
-    for each record
+    for each record, records not in any scan are in scan 0
     """
-    # Set up scans for easy locating
-    # Makes a list of size (number of records), with the scan number for each
-    scan_mark = [sub['scan'] for sub in dmap_data]
-    current_scan = 0
-    beam_scan = np.zeros((len(dmap_data)))
-    for beam in range(len(dmap_data)):
-        # Absoloute value used due to some scan flags set as "-1"
-        if abs(scan_mark[beam]) == 1:
-            current_scan += 1
-            beam_scan[beam] = current_scan
-        if scan_mark[beam] == 0:
-            beam_scan[beam] = current_scan
-
-    return beam_scan
+    return np.maximum(build_scan_index(dmap_data).scan_numbers,
+                      0).astype(float)
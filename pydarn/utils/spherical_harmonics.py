@@ -0,0 +1,319 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+#
+"""
+This module evaluates the spherical harmonic expansion of the convection map
+potential for many points at once. The basis (Legendre functions and
+cos(m phi)/sin(m phi) of the points) only depends on the fit order, the
+lowest latitude of the fit and the points, so it is cached and reused by
+consecutive map records.
+"""
+import hashlib
+import numpy as np
+
+from collections import OrderedDict
+
+
+def associated_legendre(fit_order: int, x: np.ndarray) -> np.ndarray:
+    """
+    Associated Legendre functions P_l^m(x) of all the orders and degrees up
+    to fit_order for an array of x. The values are the same as
+    scipy.special.lpmn(fit_order, fit_order, x)[0] (with the Condon-Shortley
+    phase, assoc_legendre_p_all replaces lpmn from scipy 1.15) for each
+    x, but all the points are computed together with the recurrences over
+    degree:
+        P_m^m = -(2m - 1) sqrt(1 - x^2) P_{m-1}^{m-1}
+        P_{m+1}^m = (2m + 1) x P_m^m
+        P_l^m = ((2l - 1) x P_{l-1}^m - (l + m - 1) P_{l-2}^m) / (l - m)
+
+    Parameters
+    ----------
+        fit_order: int
+            maximum order and degree
+        x: np.ndarray
+            points to evaluate, -1 <= x <= 1
+
+    Returns
+    -------
+        plm: np.ndarray
+            shape x.shape + (fit_order + 1, fit_order + 1), plm[..., m, l]
+            is P_l^m(x) and 0 for m > l (the layout of scipy's lpmn)
+    """
+    x = np.asarray(x, dtype=float)
+    plm = np.zeros(x.shape + (fit_order + 1, fit_order + 1))
+    sin_x = np.sqrt(np.maximum(1.0 - x**2, 0.0))
+    plm[..., 0, 0] = 1.0
+    for m in range(fit_order + 1):
+        if m > 0:
+            plm[..., m, m] = -(2 * m - 1) * sin_x * plm[..., m - 1, m - 1]
+        if m < fit_order:
+            plm[..., m, m + 1] = (2 * m + 1) * x * plm[..., m, m]
+        for l in range(m + 2, fit_order + 1):
+            plm[..., m, l] = ((2 * l - 1) * x * plm[..., m, l - 1] -
+                              (l + m - 1) * plm[..., m, l - 2]) / (l - m)
+    return plm
+
+
+def harmonic_indices(fit_order: int):
+    """
+    Degree l, order m and sine flag of each coefficient of a fit, in the
+    order of the map file N+2 coefficients (see Maps.index_legendre): for
+    each degree the m = 0 term then the cos(m phi) and sin(m phi) terms of
+    each order m
+
+    Parameters
+    ----------
+        fit_order: int
+            order of the fit
+
+    Returns
+    -------
+        l: np.ndarray
+            degree of each coefficient
+        m: np.ndarray
+            order of each coefficient
+        sine: np.ndarray
+            True for the coefficients of the sin(m phi) terms
+    """
+    l, m = np.tril_indices(fit_order + 1)
+    # the m > 0 terms have a cos and a sin coefficient
+    terms = np.where(m == 0, 1, 2)
+    l = np.repeat(l, terms)
+    m = np.repeat(m, terms)
+    sine = np.zeros(len(l), dtype=bool)
+    sine[1:] = (m[1:] > 0) & (m[1:] == m[:-1]) & (l[1:] == l[:-1])
+    return l, m, sine
+
+
+class HarmonicBasisCache():
+    """
+    Memory cache of the least recently used spherical harmonic bases.
+    The cached arrays are read-only as they are shared between calls.
+
+    Attributes
+    ----------
+        max_size: int
+            number of bases kept, 0 disables the cache
+            default: 16
+    """
+
+    def __init__(self, max_size: int = 16):
+        self.max_size = max_size
+        self._memory = OrderedDict()
+
+    def __len__(self):
+        return len(self._memory)
+
+    @staticmethod
+    def key(kind: str, fit_order: int, lat_min: float, mlats: np.ndarray,
+            phi: np.ndarray):
+        """ cache key of a basis of the points """
+        digest = hashlib.sha1()
+        for points in (mlats, phi):
+            points = np.ascontiguousarray(points, dtype=float)
+            digest.update(repr(points.shape).encode())
+            digest.update(points.tobytes())
+        return (kind, int(fit_order), float(lat_min), digest.hexdigest())
+
+    def get(self, key: tuple):
+        """ Returns the cached basis of the key or None """
+        if key not in self._memory:
+            return None
+        self._memory.move_to_end(key)
+        return self._memory[key]
+
+    def put(self, key: tuple, basis):
+        """ Stores the basis (array or tuple of arrays) as read-only """
+        for array in (basis if isinstance(basis, tuple) else (basis,)):
+            array.setflags(write=False)
+        if self.max_size <= 0:
+            return
+        self._memory[key] = basis
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        """ Removes all cached bases """
+        self._memory.clear()
+
+
+# bases cache used by harmonic_basis and potential_basis
+harmonic_basis_cache = HarmonicBasisCache()
+
+
+def harmonic_basis(fit_order: int, lat_min: float, mlats: np.ndarray,
+                   phi: np.ndarray):
+    """
+    Legendre functions and cos(m phi)/sin(m phi) of points, cached in
+    harmonic_basis_cache
+
+    Parameters
+    ----------
+        fit_order: int
+            order of the fit
+        lat_min: float
+            lowest latitude of the fit in degrees
+        mlats: np.ndarray
+            magnetic latitudes of the points in degrees
+        phi: np.ndarray
+            magnetic longitudes of the points in radians
+
+    Returns
+    -------
+        plm: np.ndarray
+            P_l^m of the points, shape mlats.shape + (m, l), the colatitudes
+            are stretched so lat_min is the equator
+        cos_mphi: np.ndarray
+            cos(m phi), shape mlats.shape + (m,)
+        sin_mphi: np.ndarray
+            sin(m phi), shape mlats.shape + (m,)
+    """
+    key = harmonic_basis_cache.key('harmonic', fit_order, lat_min, mlats,
+                                   phi)
+    basis = harmonic_basis_cache.get(key)
+    if basis is None:
+        thetas = np.radians(90.0 - np.abs(mlats))
+        alpha = np.pi / np.radians(90.0 - np.abs(lat_min))
+        plm = associated_legendre(fit_order, np.cos(alpha * thetas))
+        m_phi = np.multiply.outer(phi, np.arange(fit_order + 1))
+        basis = (plm, np.cos(m_phi), np.sin(m_phi))
+        harmonic_basis_cache.put(key, basis)
+    return basis
+
+
+def potential_basis(fit_order: int, lat_min: float, mlats: np.ndarray,
+                    phi: np.ndarray) -> np.ndarray:
+    """
+    Dense basis matrix of the potential at points, cached in
+    harmonic_basis_cache. The potential at the points is basis @ N+2
+    coefficients (and basis @ coefficients of many records stacked as
+    columns gives all their potentials). The potential is 0 below lat_min.
+
+    Parameters
+    ----------
+        fit_order: int
+            order of the fit
+        lat_min: float
+            lowest latitude of the fit in degrees
+        mlats: np.ndarray
+            magnetic latitudes of the points in degrees
+        phi: np.ndarray
+            magnetic longitudes of the points in radians
+
+    Returns
+    -------
+        basis: np.ndarray
+            read-only matrix of shape (number of points,
+            (fit_order + 1)**2), in the order of the points flattened
+    """
+    key = harmonic_basis_cache.key('potential', fit_order, lat_min, mlats,
+                                   phi)
+    basis = harmonic_basis_cache.get(key)
+    if basis is None:
+        plm, cos_mphi, sin_mphi = harmonic_basis(fit_order, lat_min,
+                                                 mlats, phi)
+        plm = plm.reshape(-1, fit_order + 1, fit_order + 1)
+        cos_mphi = cos_mphi.reshape(-1, fit_order + 1)
+        sin_mphi = sin_mphi.reshape(-1, fit_order + 1)
+        l, m, sine = harmonic_indices(fit_order)
+        basis = plm[:, m, l] * np.where(sine, sin_mphi[:, m], cos_mphi[:, m])
+        basis[np.abs(np.ravel(mlats)) < np.abs(lat_min)] = 0
+        harmonic_basis_cache.put(key, basis)
+    return basis
+
+
+def efield_basis(fit_order: int, lat_min: float, mlats: np.ndarray,
+                 phi: np.ndarray, earth_radius: float):
+    """
+    Dense basis matrices of the electric field (E = -grad potential) at
+    points, cached in harmonic_basis_cache. The theta (colatitude) and phi
+    components of the field at the points are theta_basis @ N+2
+    coefficients and phi_basis @ N+2 coefficients.
+
+    The derivative of the Legendre functions comes from
+        sin(theta') dP_l^m/dtheta' = l cos(theta') P_l^m - (l + m) P_{l-1}^m
+    with theta' the colatitude stretched by alpha = pi / theta_max, the
+    field is 0 at the pole
+
+    Parameters
+    ----------
+        fit_order: int
+            order of the fit
+        lat_min: float
+            lowest latitude of the fit in degrees
+        mlats: np.ndarray
+            magnetic latitudes of the points in degrees
+        phi: np.ndarray
+            magnetic longitudes of the points in radians
+        earth_radius: float
+            radius the field is evaluated at in meters
+
+    Returns
+    -------
+        theta_basis: np.ndarray
+            read-only (number of points, (fit_order + 1)**2) matrix of the
+            theta component
+        phi_basis: np.ndarray
+            read-only (number of points, (fit_order + 1)**2) matrix of the
+            phi component
+    """
+    key = harmonic_basis_cache.key('efield', fit_order, lat_min, mlats,
+                                   phi) + (float(earth_radius),)
+    basis = harmonic_basis_cache.get(key)
+    if basis is None:
+        plm, cos_mphi, sin_mphi = harmonic_basis(fit_order, lat_min,
+                                                 mlats, phi)
+        num_orders = fit_order + 1
+        plm = plm.reshape(-1, num_orders, num_orders)
+        cos_mphi = cos_mphi.reshape(-1, num_orders, 1)
+        sin_mphi = sin_mphi.reshape(-1, num_orders, 1)
+        thetas = np.radians(90.0 - np.abs(np.ravel(mlats)))
+        alpha = np.pi / np.radians(90.0 - np.abs(lat_min))
+        thetas_prime = alpha * thetas
+
+        # 1 / sin of the colatitudes, the field is left 0 at the pole
+        inv_sin_prime = np.divide(1.0, np.sin(thetas_prime),
+                                  out=np.zeros_like(thetas),
+                                  where=thetas_prime != 0.0)
+        inv_sin_thetas = np.divide(1.0, np.sin(thetas),
+                                   out=np.zeros_like(thetas),
+                                   where=thetas != 0.0)
+
+        # derivative coefficient matrices of P_l^m and P_{l-1}^m
+        # (P_{l-1}^m is 0 for l - 1 < m by plm's layout) in plm's layout
+        degrees = np.arange(num_orders)
+        orders = degrees[:, np.newaxis]
+        theta_plm = degrees * plm
+        theta_plm *= np.cos(thetas_prime)[:, np.newaxis, np.newaxis]
+        theta_plm[:, :, 1:] -= (degrees[1:] + orders) * plm[:, :, :-1]
+        theta_plm *= (-alpha / earth_radius *
+                      inv_sin_prime)[:, np.newaxis, np.newaxis]
+        phi_plm = orders * plm
+        phi_plm *= (-inv_sin_thetas / earth_radius)[:, np.newaxis,
+                                                    np.newaxis]
+
+        # index table of the coefficients in the cos(m phi) then
+        # sin(m phi) terms, d/dphi of cos is -m sin and of sin is m cos
+        l, m, sine = harmonic_indices(fit_order)
+        columns = sine * num_orders**2 + m * num_orders + l
+        theta_basis = np.concatenate([theta_plm * cos_mphi,
+                                      theta_plm * sin_mphi],
+                                     axis=1).reshape(len(thetas), -1)
+        theta_basis = np.take(theta_basis, columns, axis=1)
+        phi_basis = np.concatenate([phi_plm * -sin_mphi,
+                                    phi_plm * cos_mphi],
+                                   axis=1).reshape(len(thetas), -1)
+        phi_basis = np.take(phi_basis, columns, axis=1)
+        basis = (theta_basis, phi_basis)
+        harmonic_basis_cache.put(key, basis)
+    return basis
@@ -17,10 +17,12 @@
 This module contains SuperDARN radar information
 """
 import glob
+import numpy as np
 import os
 import pydarn
 import shutil
 
+from collections.abc import Mapping
 from typing import NamedTuple
 from enum import Enum
 from datetime import datetime
@@ -69,11 +71,278 @@ def get_hdw_files(force: bool = True, version: str = None):
             shutil.move(hdw_file, hdw_path+os.path.basename(hdw_file))
         # delete the empty folder
         os.removedirs(hdw_path+'/hdw-main/')
+        # read the new hardware files the next time a radar is used
+        HardwareDatabase.compiled(rebuild=True)
+        SuperDARNRadars.radars.reload()
+        # cached FOV coordinates may come from the old hardware files
+        pydarn.coordinate_cache.clear()
+
+
+# Hardware file columns (after the station id, status, date and time)
+# of the HardwareDatabase.data arrays
+HDW_DTYPE = np.dtype([('abbrev', 'U8'), ('epoch', 'datetime64[s]'),
+                      ('stid', 'i4'), ('status', 'i4'),
+                      ('lat', 'f8'), ('lon', 'f8'), ('alt', 'f8'),
+                      ('boresight_physical', 'f8'),
+                      ('boresight_electronic', 'f8'),
+                      ('beam_separation', 'f8'), ('velocity_sign', 'f8'),
+                      ('phase_sign', 'f8'),
+                      ('tdiff_a', 'f8'), ('tdiff_b', 'f8'),
+                      ('interferometer_x', 'f8'), ('interferometer_y', 'f8'),
+                      ('interferometer_z', 'f8'),
+                      ('rx_rise_time', 'f8'), ('rx_attenuator', 'f8'),
+                      ('attenuation_stages', 'i4'), ('gates', 'i4'),
+                      ('beams', 'i4')])
+
+
+def _read_hdw_lines(hdw_file: str, abbrv: str):
+    """
+    Reads the hardware lines of a hardware file
+
+    Parameters
+    ----------
+        hdw_file: str
+            path to the hardware file
+        abbrv: str
+            Radars 3 letter assigned abbreviation
+
+    Returns
+    -------
+        lines: list
+            a tuple in the order of HDW_DTYPE for each line
+
+    Notes
+    -----
+        Hardware data array positions definitions:
+            0: Station ID (unique numerical value).
+            1: Status code (1 operational, -1 offline).
+            2: First date that parameter string is valid
+               (YYYYMMDD).
+            3: First time that parameter string is valid
+               (HH:MM:SS).
+            4: Geographic latitude of radar site
+               (Given in decimal degrees to 3
+               decimal places. Southern hemisphere
+               values are negative)
+            5: Geographic longitude of radar site
+               (Given in decimal degrees to
+               3 decimal places.
+               West longitude values are negative)
+            6: Altitude of the radar site (meters)
+            7: Physical scanning boresight
+               (Direction of the center beam, measured in
+               degrees relative to geographic north.
+               CCW rotations are negative.)
+            8: Electronic shift to radar scanning
+               boresight (Degrees relative to
+               physical antenna boresight.
+               Normally 0.0 degrees)
+            9: Beam separation (Angular
+               separation in degrees between adjacent
+               beams. Normally 3.24 degrees)
+            10: Velocity sign (At the radar level,
+                backscattered signals with
+                frequencies above the transmitted
+                frequency are assigned positive
+                Doppler velocities while backscattered
+                signals with frequencies below
+                the transmitted frequency are assigned
+                negative Doppler velocity. This
+                convention can be reversed by changes
+                in receiver design or in the
+                data sampling rate. This parameter
+                is set to +1 or -1 to maintain the
+                convention.)
+            11: Phase sign (Cabling errors can
+                lead to a 180 degree shift of the
+                interferometry phase measurement.
+                +1 indicates that the sign is
+                correct, -1 indicates that it must be flipped.)
+            12: Tdiff [Channel A]
+                (Propagation time from interferometer
+                array antenna to phasing matrix input
+                minus propagation time from main array antenna
+                through transmitter to phasing matrix input.
+                Units are decimal
+                microseconds)
+            13: Tdiff [Channel B]
+                (Propagation time from interferometer
+                array antenna to phasing matrix input minus
+                propagation time from main array antenna
+                through transmitter to phasing matrix input.
+                Units are decimal microseconds)
+            14: Interferometer X offset
+                (Displacement of midpoint of interferometer
+                array from midpoint of main array,
+                along the line of antennas
+                with +X toward higher antenna numbers.
+                Units are meters)
+            15: Interferometer Y offset
+                (Displacement of midpoint of
+                interferometer array from midpoint of
+                main array, along the array
+                normal direction with +Y in the direction of
+                the array normal. Units are meters)
+            16: Interferometer Z offset
+                (Displacement of midpoint of
+                interferometer array from midpoint of
+                main array, in terms of altitude
+                difference with +Z up. Units are meters)
+            17: Analog Rx rise time
+                (Time given in microseconds. Time delays of
+                less than ~10 microseconds can be ignored.
+                If narrow-band filters are
+                used in analog receivers or front-ends,
+                the time delays should be
+                specified.)
+            18: Analog Rx attenuator step (dB)
+            19: Analog attenuation stages (Number of stages.
+                This is used for gain control of an analog
+                receiver or front-end.)
+            20: Maximum of range gates used
+            21: Maximum number of beams
+        """
+    lines = []
+    with open(hdw_file, 'r') as reader:
+        for line in reader:
+            if '#' in line or len(line.split()) <= 1:
+                continue
+            columns = line.split()
+            """
+            Hardware files give the date and time the line is valid
+            from as YYYYMMDD HH:MM:SS
+            """
+            epoch = np.datetime64("{}-{}-{}T{}".format(columns[2][0:4],
+                                                       columns[2][4:6],
+                                                       columns[2][6:8],
+                                                       columns[3][0:8]),
+                                  's')
+            lines.append((abbrv, epoch, int(columns[0]), int(columns[1]),
+                          *[float(value) for value in columns[4:19]],
+                          int(columns[19]), int(columns[20]),
+                          int(columns[21])))
+    return lines
+
+
+class HardwareDatabase():
+    """
+    Hardware lines of the radars as structured numpy arrays sorted by
+    epoch, so the hardware information of a radar at any date is found with
+    a binary search on the radar's epochs instead of reading the hardware
+    file. A radar's hardware file is only read the first time the radar is
+    looked up, and a malformed file only breaks the lookups of its radar.
+
+    Parameters
+    ----------
+        hdw_path: str
+            directory of the hardware files
+            default: the hdw folder of pydarn
+
+    Attributes
+    ----------
+        hdw_path: str
+            directory of the hardware files
+        data: dict
+            structured array (HDW_DTYPE) of the hardware lines sorted by
+            epoch for each radar abbreviation read so far
+
+    See Also
+    --------
+        read_hdw_file : hardware information of a radar for a date
+    """
+    # database of the hardware files installed with pydarn
+    _compiled = None
+
+    def __init__(self, hdw_path: str = None):
+        if hdw_path is None:
+            hdw_path = os.path.dirname(__file__)+'/hdw/'
+        self.hdw_path = hdw_path
+        self.data = {}
+
+    def __contains__(self, abbrv: str):
+        return abbrv in self.data or os.path.exists(self._hdw_file(abbrv))
+
+    def _hdw_file(self, abbrv: str):
+        return os.path.join(self.hdw_path, 'hdw.dat.{}'.format(abbrv))
+
+    @classmethod
+    def compiled(cls, rebuild: bool = False):
+        """
+        Returns the database of the hardware files installed with pydarn
+
+        Parameters
+        ----------
+            rebuild: bool
+                forget the radars read so far, so their hardware files are
+                read again
+                default: False
+        """
+        if cls._compiled is None or rebuild:
+            cls._compiled = cls()
+        return cls._compiled
+
+    def lines(self, abbrv: str) -> np.ndarray:
+        """
+        Returns the hardware lines of a radar sorted by epoch, the hardware
+        file is read the first time
+
+        Parameters
+        ----------
+            abbrv: str
+                Radars 3 letter assigned abbreviation
+
+        Raises
+        ------
+            KeyError: there is no hardware file (or no hardware line) for
+                abbrv
+            ValueError, IndexError: the hardware file is malformed
+        """
+        if abbrv not in self.data:
+            try:
+                lines = _read_hdw_lines(self._hdw_file(abbrv), abbrv)
+            except FileNotFoundError:
+                raise KeyError(abbrv)
+            if not lines:
+                raise KeyError(abbrv)
+            data = np.array(lines, dtype=HDW_DTYPE)
+            # stable sort so lines with the same epoch keep the file order
+            self.data[abbrv] = data[np.argsort(data['epoch'], kind='stable')]
+        return self.data[abbrv]
+
+    def lookup(self, abbrv: str, dates):
+        """
+        Returns the hardware lines of a radar valid at the dates, the line
+        valid at a date is the last line with an epoch before (or at) the
+        date, dates before the first epoch use the first line
+
+        Parameters
+        ----------
+            abbrv: str
+                Radars 3 letter assigned abbreviation
+            dates: datetime, np.datetime64 or array of them
+                dates to find the hardware lines of
+
+        Returns
+        -------
+            lines: np.ndarray
+                HDW_DTYPE line or array of lines (same shape as dates)
+
+        Raises
+        ------
+            KeyError: the database has no hardware lines for abbrv
+        """
+        lines = self.lines(abbrv)
+        rows = np.searchsorted(lines['epoch'],
+                               np.asarray(dates, dtype='datetime64[s]'),
+                               side='right') - 1
+        return lines[np.maximum(rows, 0)]
 
 
 def read_hdw_file(abbrv, date: datetime = None, update: bool = False):
     """
     Reads the hardware file for the associated abbreviation of the radar name.
+    The hardware lines are kept in HardwareDatabase so only the first call
+    for a radar reads its file.
 
     Parameters
     ----------
@@ -99,151 +368,41 @@ def read_hdw_file(abbrv, date: datetime = None, update: bool = False):
     if date is None:
         date = datetime.now()
 
-    hdw_path = os.path.dirname(__file__)+'/hdw/'
-    hdw_file = "{path}/hdw.dat.{radar}".format(path=hdw_path, radar=abbrv)
-    hdw_data = []
-    hdw_lines_date = []
-    # if the file does not exist then try
-    # and download it
-    if os.path.exists(hdw_file) is False:
+    database = HardwareDatabase.compiled()
+    if abbrv not in database:
+        # if the file does not exist then try and download it
         get_hdw_files()
+        database = HardwareDatabase.compiled()
+        if abbrv not in database:
+            raise pydarn.radar_exceptions.HardwareFileNotFoundError(abbrv)
+
     try:
-        with open(hdw_file, 'r') as reader:
-            lines = reader.readlines()
-            for i in range(len(lines)):
-                if '#' not in lines[i] and len(lines[i].split()) > 1:
-                    hdw_data.append(lines[i].split())
-                    """
-                    Hardware files give the year and seconds from the beginning
-                    of that year. Thus to check the date if it corresponds we
-                    need to convert to a datetime object and then compare.
-                    """
-                    j = len(hdw_data)-1
-                    hdw_lines_date.append(
-                        datetime(year=int(hdw_data[j][2][0:4]),
-                                 month=int(hdw_data[j][2][4:6]),
-                                 day=int(hdw_data[j][2][6:8]),
-                                 hour=int(hdw_data[j][3][0:2]),
-                                 minute=int(hdw_data[j][3][3:5]),
-                                 second=int(hdw_data[j][3][6:8])))
-                    if hdw_lines_date[j] > date:
-                        j = j-1
-                        break
-            """
-            Hardware data array positions definitions:
-                0: Station ID (unique numerical value).
-                1: Status code (1 operational, -1 offline).
-                2: First date that parameter string is valid
-                   (YYYYMMDD).
-                3: First time that parameter string is valid
-                   (HH:MM:SS).
-                4: Geographic latitude of radar site
-                   (Given in decimal degrees to 3
-                   decimal places. Southern hemisphere
-                   values are negative)
-                5: Geographic longitude of radar site
-                   (Given in decimal degrees to
-                   3 decimal places.
-                   West longitude values are negative)
-                6: Altitude of the radar site (meters)
-                7: Physical scanning boresight
-                   (Direction of the center beam, measured in
-                   degrees relative to geographic north.
-                   CCW rotations are negative.)
-                8: Electronic shift to radar scanning
-                   boresight (Degrees relative to
-                   physical antenna boresight.
-                   Normally 0.0 degrees)
-                9: Beam separation (Angular
-                   separation in degrees between adjacent
-                   beams. Normally 3.24 degrees)
-                10: Velocity sign (At the radar level,
-                    backscattered signals with
-                    frequencies above the transmitted
-                    frequency are assigned positive
-                    Doppler velocities while backscattered
-                    signals with frequencies below
-                    the transmitted frequency are assigned
-                    negative Doppler velocity. This
-                    convention can be reversed by changes
-                    in receiver design or in the
-                    data sampling rate. This parameter
-                    is set to +1 or -1 to maintain the
-                    convention.)
-                11: Phase sign (Cabling errors can
-                    lead to a 180 degree shift of the
-                    interferometry phase measurement.
-                    +1 indicates that the sign is
-                    correct, -1 indicates that it must be flipped.)
-                12: Tdiff [Channel A]
-                    (Propagation time from interferometer
-                    array antenna to phasing matrix input
-                    minus propagation time from main array antenna
-                    through transmitter to phasing matrix input.
-                    Units are decimal
-                    microseconds)
-                13: Tdiff [Channel B]
-                    (Propagation time from interferometer
-                    array antenna to phasing matrix input minus
-                    propagation time from main array antenna
-                    through transmitter to phasing matrix input.
-                    Units are decimal microseconds)
-                14: Interferometer X offset
-                    (Displacement of midpoint of interferometer
-                    array from midpoint of main array,
-                    along the line of antennas
-                    with +X toward higher antenna numbers.
-                    Units are meters)
-                15: Interferometer Y offset
-                    (Displacement of midpoint of
-                    interferometer array from midpoint of
-                    main array, along the array
-                    normal direction with +Y in the direction of
-                    the array normal. Units are meters)
-                16: Interferometer Z offset
-                    (Displacement of midpoint of
-                    interferometer array from midpoint of
-                    main array, in terms of altitude
-                    difference with +Z up. Units are meters)
-                17: Analog Rx rise time
-                    (Time given in microseconds. Time delays of
-                    less than ~10 microseconds can be ignored.
-                    If narrow-band filters are
-                    used in analog receivers or front-ends,
-                    the time delays should be
-                    specified.)
-                18: Analog Rx attenuator step (dB)
-                19: Analog attenuation stages (Number of stages.
-                    This is used for gain control of an analog
-                    receiver or front-end.)
-                20: Maximum of range gates used
-                21: Maximum number of beams
-            """
-            return _HdwInfo(stid=int(hdw_data[j][0]),
-                            status=Status(int(hdw_data[j][1])),
-                            abbrev=abbrv,
-                            date=hdw_lines_date[j],
-                            geographic=_Coord(float(hdw_data[j][4]),
-                                              float(hdw_data[j][5]),
-                                              float(hdw_data[j][6])),
-                            boresight=_Boresight(float(hdw_data[j][7]),
-                                                 float(hdw_data[j][8])),
-                            beam_separation=float(hdw_data[j][9]),
-                            velocity_sign=float(hdw_data[j][10]),
-                            phase_sign=float(hdw_data[j][11]),
-                            tdiff=_Tdiff(float(hdw_data[j][12]),
-                                         float(hdw_data[j][13])),
-                            interferometer_offset=_InterferometerOffset(
-                                float(hdw_data[j][14]),
-                                float(hdw_data[j][15]),
-                                float(hdw_data[j][16])),
-                            rx_rise_time=float(hdw_data[j][17]),
-                            rx_attenuator=float(hdw_data[j][18]),
-                            attenuation_stages=int(hdw_data[j][19]),
-                            gates=int(hdw_data[j][20]),
-                            beams=int(hdw_data[j][21]))
-    except FileNotFoundError:
+        line = database.lookup(abbrv, date)
+    except KeyError:
         raise pydarn.radar_exceptions.HardwareFileNotFoundError(abbrv)
+    return _HdwInfo(stid=int(line['stid']),
+                    status=Status(int(line['status'])),
+                    abbrev=abbrv,
+                    date=line['epoch'].astype(datetime),
+                    geographic=_Coord(float(line['lat']),
+                                      float(line['lon']),
+                                      float(line['alt'])),
+                    boresight=_Boresight(float(line['boresight_physical']),
+                                         float(line['boresight_electronic'])),
+                    beam_separation=float(line['beam_separation']),
+                    velocity_sign=float(line['velocity_sign']),
+                    phase_sign=float(line['phase_sign']),
+                    tdiff=_Tdiff(float(line['tdiff_a']),
+                                 float(line['tdiff_b'])),
+                    interferometer_offset=_InterferometerOffset(
+                        float(line['interferometer_x']),
+                        float(line['interferometer_y']),
+                        float(line['interferometer_z'])),
+                    rx_rise_time=float(line['rx_rise_time']),
+                    rx_attenuator=float(line['rx_attenuator']),
+                    attenuation_stages=int(line['attenuation_stages']),
+                    gates=int(line['gates']),
+                    beams=int(line['beams']))
 
 
 class Hemisphere(Enum):
@@ -446,6 +605,47 @@ class _Radar(NamedTuple):
     hardware_info: _HdwInfo
 
 
+class _LazyRadars(Mapping):
+    """
+    Read only dictionary of _Radar objects that only reads a radar's
+    hardware file the first time the radar is accessed
+
+    Parameters
+    ----------
+        radars: dict
+            dictionary with the STID as key and a tuple of the name,
+            institution, hemisphere, 45 km range gate and hardware file
+            abbreviation of the radar as value
+    """
+    def __init__(self, radars: dict):
+        self._info = radars
+        self._radars = {}
+
+    def __getitem__(self, stid: int):
+        try:
+            return self._radars[stid]
+        except KeyError:
+            name, institution, hemisphere, range_gate_45, abbrv = \
+                self._info[stid]
+            radar = _Radar(name, institution, hemisphere, range_gate_45,
+                           read_hdw_file(abbrv))
+            self._radars[stid] = radar
+            return radar
+
+    def __iter__(self):
+        return iter(self._info)
+
+    def __len__(self):
+        return len(self._info)
+
+    def reload(self):
+        """
+        Forgets the hardware information read so far so it is read again
+        from the hardware files on the next access
+        """
+        self._radars.clear()
+
+
 class SuperDARNRadars():
     """
     Class containing a dictionary of Nested Named Tuples with information
@@ -456,7 +656,8 @@ class SuperDARNRadars():
         radars: dict
             dictionary of each SuperDARN radar with key being STID value and
             a _Radar object containing the name, institutional and hardware
-            information of the radar
+            information of the radar. The hardware file of a radar is read
+            the first time the radar is accessed.
 
     See Also
     --------
@@ -465,89 +666,85 @@ class SuperDARNRadars():
     """
     # Information obtained from
     # http://vt.superdarn.org/tiki-index.php?page=Radar+Overview
-    radars = {209: _Radar('Adak Island East',
-                          'University of Alaska Fairbanks', Hemisphere.North,
-                          75, read_hdw_file('ade')),
-              208: _Radar('Adak Island West', 'University of Alaska Fairbanks',
-                          Hemisphere.North, 75, read_hdw_file('adw')),
-              33: _Radar('Blackstone', 'Virginia Tech', Hemisphere.North,
-                         100, read_hdw_file('bks')),
-              207: _Radar('Christmas Valley East', 'Dartmouth College',
-                          Hemisphere.North, 100, read_hdw_file('cve')),
-              206: _Radar('Christmas Valley West', 'Dartmouth College',
-                          Hemisphere.North, 100, read_hdw_file('cvw')),
-              66: _Radar('Clyde River', 'University of Saskatchewan',
-                         Hemisphere.North, 100, read_hdw_file('cly')),
-              205: _Radar('Fort Hays East', 'Virginia Tech', Hemisphere.North,
-                          100, read_hdw_file('fhe')),
-              204: _Radar('Fort Hays West', 'Virginia Tech', Hemisphere.North,
-                          100, read_hdw_file('fhw')),
-              1: _Radar('Goose Bay', 'Virginia Tech', Hemisphere.North,
-                        100, read_hdw_file('gbr')),
-              10: _Radar('Hankasalmi', 'University of Leicester',
-                         Hemisphere.North, 70, read_hdw_file('han')),
-              40: _Radar('Hokkaido East', 'Nagoya University',
-                         Hemisphere.North, 110, read_hdw_file('hok')),
-              41: _Radar('Hokkaido West', 'Nagoya University',
-                         Hemisphere.North, 110, read_hdw_file('hkw')),
-              64: _Radar('Inuvik', 'University of Saskatchewan',
-                         Hemisphere.North, 75, read_hdw_file('inv')),
-              50: _Radar('Jiamusi East radar',
-                         'National Space Science Center,'
-                         'Chinese Academy of Sciences',
-                         Hemisphere.North, 100, read_hdw_file('jme')),
-              3: _Radar('Kapuskasing', 'Virginia Tech', Hemisphere.North,
-                        75, read_hdw_file('kap')),
-              16: _Radar('King Salmon',
-                         'National Institute of Information and'
-                         ' Communications Technology', Hemisphere.North,
-                         75, read_hdw_file('ksr')),
-              7: _Radar('Kodiak', 'University of Alaska Fairbanks',
-                        Hemisphere.North, 110, read_hdw_file('kod')),
-              90: _Radar('Longyearbyen', 'University of Centre in Svalbard',
-                         Hemisphere.North, 70, read_hdw_file('lyr')),
-              9: _Radar('Pykkvibaer', 'University of Leicester',
-                        Hemisphere.North, 70, read_hdw_file('pyk')),
-              6: _Radar('Prince George', 'University of Saskatchewan',
-                        Hemisphere.North, 75, read_hdw_file('pgr')),
-              65: _Radar('Rankin Inlet', 'University of Saskatchewan',
-                         Hemisphere.North, 75, read_hdw_file('rkn')),
-              5: _Radar('Saskatoon', 'University of Saskatchewan',
-                        Hemisphere.North, 75, read_hdw_file('sas')),
-              2: _Radar('Schefferville', 'CNRS/LPCE', Hemisphere.North,
-                        75, read_hdw_file('sch')),
-              8: _Radar('Stokkseyri', 'Lancaster University',
-                        Hemisphere.North, 75, read_hdw_file('sto')),
-              32: _Radar('Wallops Island', 'JHU Applied Physics Laboratory',
-                         Hemisphere.North, 100, read_hdw_file('wal')),
-              24: _Radar('Buckland Park', 'La Trobe University',
-                         Hemisphere.South, 75, read_hdw_file('bpk')),
-              96: _Radar('Dome C East',
-                         'Institute for Space Astrophysics and Planetology',
-                         Hemisphere.South, 75, read_hdw_file('dce')),
-              97: _Radar('Dome C North',
-                         'Institute for Space Astrophysics and Planetology',
-                         Hemisphere.South, 75, read_hdw_file('dcn')),
-              21: _Radar('Falkland Islands', 'British Antarctic Survey',
-                         Hemisphere.South,  110, read_hdw_file('fir')),
-              4: _Radar('Halley', 'British Antarctic Survey',
-                        Hemisphere.South, 100, read_hdw_file('hal')),
-              15: _Radar('Kerguelen', 'IRAP/CNRS/IPEV', Hemisphere.South,
-                         75, read_hdw_file('ker')),
-              20: _Radar('McMurdo', 'University of Alaska, Fairbanks',
-                         Hemisphere.South, 75, read_hdw_file('mcm')),
-              11: _Radar('SANAE', 'South African National Space Agency',
-                         Hemisphere.South, 110, read_hdw_file('san')),
-              22: _Radar('South Pole Station',
-                         'University of Alaska, Fairbanks', Hemisphere.South,
-                         75, read_hdw_file('sps')),
-              13: _Radar('Syowa East', 'National Institute of Polar Research',
-                         Hemisphere.South, 75, read_hdw_file('sye')),
-              12: _Radar('Syowa South', 'National Institute of Polar Research',
-                         Hemisphere.South, 80, read_hdw_file('sys')),
-              14: _Radar('Tiger', 'La Trobe University', Hemisphere.South,
-                         75, read_hdw_file('tig')),
-              18: _Radar('Unwin', 'La Trobe University', Hemisphere.South,
-                         75, read_hdw_file('unw')),
-              19: _Radar('Zhongshan', 'Polar Research Institute of China',
-                         Hemisphere.South, 70, read_hdw_file('zho'))}
+    radars = _LazyRadars({
+        209: ('Adak Island East', 'University of Alaska Fairbanks',
+              Hemisphere.North, 75, 'ade'),
+        208: ('Adak Island West', 'University of Alaska Fairbanks',
+              Hemisphere.North, 75, 'adw'),
+        33: ('Blackstone', 'Virginia Tech',
+             Hemisphere.North, 100, 'bks'),
+        207: ('Christmas Valley East', 'Dartmouth College',
+              Hemisphere.North, 100, 'cve'),
+        206: ('Christmas Valley West', 'Dartmouth College',
+              Hemisphere.North, 100, 'cvw'),
+        66: ('Clyde River', 'University of Saskatchewan',
+             Hemisphere.North, 100, 'cly'),
+        205: ('Fort Hays East', 'Virginia Tech',
+              Hemisphere.North, 100, 'fhe'),
+        204: ('Fort Hays West', 'Virginia Tech',
+              Hemisphere.North, 100, 'fhw'),
+        1: ('Goose Bay', 'Virginia Tech',
+            Hemisphere.North, 100, 'gbr'),
+        10: ('Hankasalmi', 'University of Leicester',
+             Hemisphere.North, 70, 'han'),
+        40: ('Hokkaido East', 'Nagoya University',
+             Hemisphere.North, 110, 'hok'),
+        41: ('Hokkaido West', 'Nagoya University',
+             Hemisphere.North, 110, 'hkw'),
+        64: ('Inuvik', 'University of Saskatchewan',
+             Hemisphere.North, 75, 'inv'),
+        50: ('Jiamusi East radar',
+             'National Space Science Center,Chinese Academy of Sciences',
+             Hemisphere.North, 100, 'jme'),
+        3: ('Kapuskasing', 'Virginia Tech',
+            Hemisphere.North, 75, 'kap'),
+        16: ('King Salmon',
+             'National Institute of Information and Communications Technology',
+             Hemisphere.North, 75, 'ksr'),
+        7: ('Kodiak', 'University of Alaska Fairbanks',
+            Hemisphere.North, 110, 'kod'),
+        90: ('Longyearbyen', 'University of Centre in Svalbard',
+             Hemisphere.North, 70, 'lyr'),
+        9: ('Pykkvibaer', 'University of Leicester',
+            Hemisphere.North, 70, 'pyk'),
+        6: ('Prince George', 'University of Saskatchewan',
+            Hemisphere.North, 75, 'pgr'),
+        65: ('Rankin Inlet', 'University of Saskatchewan',
+             Hemisphere.North, 75, 'rkn'),
+        5: ('Saskatoon', 'University of Saskatchewan',
+            Hemisphere.North, 75, 'sas'),
+        2: ('Schefferville', 'CNRS/LPCE',
+            Hemisphere.North, 75, 'sch'),
+        8: ('Stokkseyri', 'Lancaster University',
+            Hemisphere.North, 75, 'sto'),
+        32: ('Wallops Island', 'JHU Applied Physics Laboratory',
+             Hemisphere.North, 100, 'wal'),
+        24: ('Buckland Park', 'La Trobe University',
+             Hemisphere.South, 75, 'bpk'),
+        96: ('Dome C East', 'Institute for Space Astrophysics and Planetology',
+             Hemisphere.South, 75, 'dce'),
+        97: ('Dome C North',
+             'Institute for Space Astrophysics and Planetology',
+             Hemisphere.South, 75, 'dcn'),
+        21: ('Falkland Islands', 'British Antarctic Survey',
+             Hemisphere.South, 110, 'fir'),
+        4: ('Halley', 'British Antarctic Survey',
+            Hemisphere.South, 100, 'hal'),
+        15: ('Kerguelen', 'IRAP/CNRS/IPEV',
+             Hemisphere.South, 75, 'ker'),
+        20: ('McMurdo', 'University of Alaska, Fairbanks',
+             Hemisphere.South, 75, 'mcm'),
+        11: ('SANAE', 'South African National Space Agency',
+             Hemisphere.South, 110, 'san'),
+        22: ('South Pole Station', 'University of Alaska, Fairbanks',
+             Hemisphere.South, 75, 'sps'),
+        13: ('Syowa East', 'National Institute of Polar Research',
+             Hemisphere.South, 75, 'sye'),
+        12: ('Syowa South', 'National Institute of Polar Research',
+             Hemisphere.South, 80, 'sys'),
+        14: ('Tiger', 'La Trobe University',
+             Hemisphere.South, 75, 'tig'),
+        18: ('Unwin', 'La Trobe University',
+             Hemisphere.South, 75, 'unw'),
+        19: ('Zhongshan', 'Polar Research Institute of China',
+             Hemisphere.South, 70, 'zho')})
@@ -0,0 +1,64 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+"""
+Import time benchmark of pydarn, the hardware files are read lazily so
+importing pydarn does not read the hardware files of every radar.
+
+Usage (from the root of the repository):
+    python test/benchmark_import.py [runs]
+
+Each measurement runs in a new python process so nothing is cached between
+runs. Most of the import time of pydarn is spent importing matplotlib,
+cartopy and aacgmv2 so the import time of pydarn.utils.superdarn_radars is
+reported separately (python -X importtime). "read all radars" is the cost
+of reading every hardware file, which importing pydarn used to pay.
+"""
+import statistics
+import subprocess
+import sys
+
+TIMER = """
+import time
+start = time.perf_counter()
+import pydarn
+imported = time.perf_counter()
+for stid in pydarn.SuperDARNRadars.radars:
+    pydarn.SuperDARNRadars.radars[stid]
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def measure():
+    """
+    times [s] of importing pydarn, importing superdarn_radars and
+    reading all the hardware files in a new python process
+    """
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             TIMER], check=True, capture_output=True,
+                            text=True)
+    import_time, read_time = map(float, output.stdout.split()[-2:])
+    # -X importtime lines: "import time: self [us] | cumulative | module"
+    radars_time = [int(line.split('|')[1]) * 1e-6
+                   for line in output.stderr.splitlines()
+                   if line.split('|')[-1].strip() ==
+                   'pydarn.utils.superdarn_radars'][0]
+    return import_time, radars_time, read_time
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    times = [measure() for _ in range(runs)]
+    for i, name in enumerate(['import pydarn',
+                              'import superdarn_radars',
+                              'read all radars']):
+        print("{:<24} {:8.1f} ms".format(
+            name, statistics.median(t[i] for t in times) * 1000))
@@ -0,0 +1,170 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+"""
+Fitted velocity benchmark of pydarn.Maps.calculated_fitted_velocities
+against the reference implementation it replaced: one scipy Legendre call
+per point and the E field coefficients assembled in loops over (m, l).
+
+Usage (from the root of the repository):
+    python test/benchmark_maps.py [runs]
+
+Random fits of several orders are evaluated at random positions, the
+velocities and azimuths have to match the reference (relative tolerance
+1e-9) before the times are reported. "cold" clears the basis cache before
+every call, "cached" reuses the basis of the same fit order, lat_min and
+positions (consecutive records of a map file).
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+from scipy import special
+
+import pydarn
+
+
+def reference_legendre(fit_order: int, x: float) -> np.ndarray:
+    """
+    scipy's P_l^m(x) in the [m, l] layout of lpmn, from
+    assoc_legendre_p_all (lpmn was removed in scipy 1.17)
+    """
+    try:
+        plm = special.assoc_legendre_p_all(fit_order, fit_order, x)[0]
+    except AttributeError:
+        return special.lpmn(fit_order, fit_order, x)[0]
+    # [l, m] with the negative orders after the positive ones
+    return plm[:, :fit_order + 1].T
+
+
+def reference_fitted_velocities(mlats, mlons, fit_coefficient, hemisphere,
+                                fit_order, lat_min):
+    """ calculated_fitted_velocities before the E field basis matrices """
+    index_legendre = pydarn.Maps.index_legendre
+    Re_meters = pydarn.Re * 1000.0
+    thetas = np.radians(90.0 - abs(mlats))
+    alpha = np.pi / np.radians(90.0 - abs(lat_min))
+    thetas_prime = alpha * thetas
+    legendre_poly = np.array([reference_legendre(fit_order, x_i)
+                              for x_i in np.cos(thetas_prime)])
+    phi = mlons
+
+    k_max = index_legendre(fit_order, fit_order)
+    thetas_ecoeffs = np.zeros((k_max + 2, len(thetas)))
+    phi_ecoeffs = np.zeros((k_max + 2, len(thetas)))
+    q_prime = np.where(thetas_prime != 0.0)[0]
+    q = np.where(thetas != 0.0)[0]
+    c = fit_coefficient.flatten()
+    cot_prime = np.cos(thetas_prime[q_prime]) / np.sin(thetas_prime[q_prime])
+    for m in range(fit_order + 1):
+        for l in range(m, fit_order + 1):
+            k3 = k4 = k2 = index_legendre(l, m)
+            k1 = index_legendre(l + 1, m) if l < fit_order else -1
+            thetas_ecoeffs[k4, q_prime] -= \
+                c[k3] * alpha * l * cot_prime / Re_meters
+            phi_ecoeffs[k4, q] -= c[k3 + 1] * m / np.sin(thetas[q]) / \
+                Re_meters
+            phi_ecoeffs[k4 + 1, q] += c[k3] * m / np.sin(thetas[q]) / \
+                Re_meters
+            if k1 >= 0:
+                thetas_ecoeffs[k2, q_prime] += \
+                    c[k1] * alpha * (l + 1 + m) / \
+                    np.sin(thetas_prime[q_prime]) / Re_meters
+            if m > 0:
+                thetas_ecoeffs[k4 + 1, q_prime] -= \
+                    c[k3 + 1] * alpha * l * cot_prime / Re_meters
+                if k1 >= 0:
+                    thetas_ecoeffs[k2 + 1, q_prime] += \
+                        c[k1 + 1] * alpha * (l + 1 + m) / \
+                        np.sin(thetas_prime[q_prime]) / Re_meters
+
+    thetas_ecomp = np.zeros(thetas.shape)
+    phi_ecomp = np.zeros(thetas.shape)
+    for m in range(fit_order + 1):
+        for l in range(m, fit_order + 1):
+            k = index_legendre(l, m)
+            plm = legendre_poly[:, m, l]
+            if m == 0:
+                thetas_ecomp += thetas_ecoeffs[k] * plm
+                phi_ecomp += phi_ecoeffs[k] * plm
+            else:
+                thetas_ecomp += thetas_ecoeffs[k] * plm * np.cos(m * phi) + \
+                    thetas_ecoeffs[k + 1] * plm * np.sin(m * phi)
+                phi_ecomp += phi_ecoeffs[k] * plm * np.cos(m * phi) + \
+                    phi_ecoeffs[k + 1] * plm * np.sin(m * phi)
+
+    F_altitude = 300.0 * 1000.0
+    B_field = -0.62e-4 * (1.0 - 3.0 * F_altitude / Re_meters) \
+        * np.sqrt(3.0 * np.square(np.cos(thetas)) + 1.0) / 2
+    velocity_x = phi_ecomp / B_field
+    velocity_y = -thetas_ecomp / B_field
+    velocity = np.sqrt(velocity_x**2 + velocity_y**2)
+    if hemisphere == pydarn.Hemisphere.South:
+        azm_v = np.arctan2(velocity_y, velocity_x)
+    else:
+        azm_v = np.arctan2(velocity_y, -velocity_x)
+    azm_v[velocity == 0.0] = 0.0
+    return velocity, azm_v
+
+
+def timed(function, runs):
+    """ median time [s] of runs calls of function """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def cases():
+    """ random fits and positions """
+    rng = np.random.default_rng(0)
+    for fit_order, num_points in [(4, 200), (6, 200), (6, 2000), (8, 2000),
+                                  (12, 2000)]:
+        lat_min = rng.uniform(55, 65)
+        hemisphere = rng.choice([pydarn.Hemisphere.North,
+                                 pydarn.Hemisphere.South])
+        mlats = rng.uniform(lat_min, 90, num_points)
+        mlons = rng.uniform(0, 2 * np.pi, num_points)
+        fit_coefficient = rng.normal(size=(fit_order + 1)**2) * 1000
+        yield fit_order, lat_min, hemisphere, mlats, mlons, fit_coefficient
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print("{:>5} {:>6} {:>14} {:>10} {:>10}".format(
+        'order', 'points', 'reference', 'cold', 'cached'))
+    for fit_order, lat_min, hemisphere, mlats, mlons, fit_coefficient \
+            in cases():
+        def reference():
+            return reference_fitted_velocities(mlats, mlons, fit_coefficient,
+                                               hemisphere, fit_order,
+                                               lat_min)
+
+        def current():
+            return pydarn.Maps.calculated_fitted_velocities(
+                mlats, mlons, fit_coefficient, hemisphere, fit_order,
+                lat_min)
+
+        def cold():
+            pydarn.harmonic_basis_cache.clear()
+            return current()
+
+        for expected, result in zip(reference(), cold()):
+            if not np.allclose(result, expected, rtol=1e-9,
+                               atol=1e-9 * np.abs(expected).max()):
+                sys.exit("fit order {} with {} points does not match the"
+                         " reference".format(fit_order, len(mlats)))
+        print("{:>5} {:>6} {:>11.2f} ms {:>7.2f} ms {:>7.2f} ms".format(
+            fit_order, len(mlats), timed(reference, runs) * 1000,
+            timed(cold, runs) * 1000, timed(current, runs) * 1000))
@@ -0,0 +1,24 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+
+import pytest
+
+import pydarn
+
+
+@pytest.fixture(autouse=True)
+def cache_directories(tmp_path, monkeypatch):
+    """ the disk caches of the tests are written to tmp_path """
+    monkeypatch.setattr(pydarn.coordinate_cache, 'directory',
+                        str(tmp_path / 'coordinates'))
+    monkeypatch.setattr(pydarn.dmap_cache, 'directory',
+                        str(tmp_path / 'dmap'))
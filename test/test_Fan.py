@@ -15,6 +15,7 @@
 import bz2
 import datetime as dt
 import matplotlib.pyplot as plt
+import numpy as np
 import pytest
 import warnings
 
@@ -37,6 +38,69 @@ class TestFan_defaults:
         with warnings.catch_warnings(record=True):
             pydarn.Fan.plot_fov(6, dt.datetime(2020, 4, 4, 6, 2))
 
+    def test_fan_columnar_datetime(self):
+        """ columnar data and a datetime scan index """
+        with warnings.catch_warnings(record=True):
+            pydarn.Fan.plot_fan(pydarn.ColumnarData(data), channel=1,
+                                scan_index=pydarn.time2datetime(data[40]))
+        plt.close('all')
+
+    def test_fan_filter(self):
+        """ filtered cells are not placed in the scan """
+        with warnings.catch_warnings(record=True):
+            _, _, _, scan, _ = pydarn.Fan.plot_fan(data)
+            _, _, _, filtered_scan, _ = pydarn.Fan.plot_fan(
+                data, filter_settings=pydarn.Filter.field('v') > 0)
+        assert (scan < 0).any()
+        assert np.array_equal(filtered_scan[scan > 0], scan[scan > 0])
+        assert not filtered_scan[scan <= 0].any()
+        plt.close('all')
+
+
+@pytest.mark.parametrize('channel', ['all', 1, 2])
+class TestScanIndex:
+
+    def test_scan_index_records(self, channel):
+        """ records of each scan match the scan numbers """
+        records = [rec for rec in data
+                   if channel == 'all' or rec['channel'] == channel]
+        beam_scan = pydarn.build_scan(records)
+        record_numbers = np.array([i for i, rec in enumerate(data)
+                                   if channel == 'all' or
+                                   rec['channel'] == channel])
+        scans = pydarn.ScanIndex(data, channel)
+        assert np.array_equal(scans.record_numbers, record_numbers)
+        assert len(scans) == beam_scan.max()
+        for scan_number, scan_records in scans:
+            assert np.array_equal(
+                scan_records,
+                record_numbers[np.where(beam_scan == scan_number)])
+            assert scans.start_records[scan_number - 1] == scan_records[0]
+            assert scans.stop_records[scan_number - 1] == \
+                scan_records[-1] + 1
+            assert scans.start_times[scan_number - 1] == \
+                np.datetime64(pydarn.time2datetime(data[scan_records[0]]))
+
+    def test_scan_index_find(self, channel):
+        """ scans are found by the time of their records """
+        scans = pydarn.build_scan_index(pydarn.ColumnarData(data), channel)
+        for scan_number, scan_records in scans:
+            time = pydarn.time2datetime(data[scan_records[-1]])
+            assert scans.find(time) == scan_number
+        assert scans.find(dt.datetime(2000, 1, 1)) == -1
+
+
+def test_scan_index_flags():
+    """ records with unknown scan flags are not in any scan """
+    records = [{'scan': flag, 'bmnum': i, 'channel': 1}
+               for i, flag in enumerate([0, 1, 0, 2, -1, 0])]
+    scans = pydarn.ScanIndex(records)
+    assert scans.scan_numbers.tolist() == [0, 1, 1, -1, 2, 2]
+    assert scans.records(1).tolist() == [1, 2]
+    assert scans.records(0).tolist() == [0]
+    # build_scan keeps them in scan 0
+    assert pydarn.build_scan(records).tolist() == [0, 1, 1, 0, 2, 2]
+
 
 @pytest.mark.parametrize('stid', [5, 97])
 @pytest.mark.parametrize('ranges', [(5,70)])
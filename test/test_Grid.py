@@ -15,9 +15,13 @@
 import bz2
 import datetime as dt
 import matplotlib.pyplot as plt
+import numpy as np
 import pytest
 import warnings
 
+from matplotlib import colors
+from matplotlib.collections import LineCollection
+
 import pydarn
 
 
@@ -31,6 +35,62 @@ class TestGrid_defaults:
         with warnings.catch_warnings(record=True):
             pydarn.Grid.plot_grid(data)
 
+    def test_grid_times(self):
+        """ start.* time fields are converted in bulk """
+        times = [pydarn.time2datetime(record) for record in data]
+        assert pydarn.times2datetime64(data).astype(dt.datetime).tolist()\
+            == times
+
+    def test_grid_find_record(self):
+        """ records are found by their start time """
+        columnar_data = pydarn.ColumnarData(data)
+        for i, record in enumerate(data):
+            start_time = pydarn.time2datetime(record)
+            assert pydarn.find_record(data, start_time, 0) == i
+            assert pydarn.find_record(columnar_data, start_time, 0) == i
+        # a day later is not within the time delta
+        with pytest.raises(pydarn.plot_exceptions.NoDataFoundError):
+            pydarn.find_record(data, start_time + dt.timedelta(days=1), 1)
+
+    def test_grid_record(self):
+        """ the record argument is plotted when start_time is None """
+        assert not np.array_equal(data[0]['vector.mlat'],
+                                  data[1]['vector.mlat'])
+        with warnings.catch_warnings(record=True):
+            _, _, rs, _, vel, _ = pydarn.Grid.plot_grid(data, record=1)
+        assert np.array_equal(rs, data[1]['vector.mlat'])
+        assert np.array_equal(vel, data[1]['vector.vel.median'])
+        plt.close('all')
+
+    def test_grid_vectors(self):
+        """ the vectors are a LineCollection coloured by velocity """
+        cmap = plt.get_cmap('plasma_r')
+        with warnings.catch_warnings(record=True):
+            thetas, end_thetas, rs, end_rs, vel, _ = \
+                pydarn.Grid.plot_grid(data, cmap=cmap, zmin=0, zmax=1000)
+        vectors = [collection for collection in plt.gca().collections
+                   if isinstance(collection, LineCollection)]
+        # one collection per radar of the record
+        assert len(vectors) == len(data[0]['stid'])
+        segments = vectors[0].get_segments()
+        assert len(segments) == len(vel)
+        assert np.allclose(segments[0], [[thetas[0], rs[0]],
+                                         [end_thetas[0], end_rs[0]]])
+        assert np.allclose(vectors[0].get_colors(),
+                           cmap(colors.Normalize(0, 1000)(vel)))
+        plt.close('all')
+
+    def test_grid_filter(self):
+        """ filtered vectors are not plotted """
+        velocities = data[0]['vector.vel.median']
+        with warnings.catch_warnings(record=True):
+            _, _, _, _, vel, azm_v = pydarn.Grid.plot_grid(
+                data, filter_settings={'min_array_filter':
+                                       {'vector.vel.median': 100}})
+        assert np.array_equal(vel, velocities[velocities >= 100])
+        assert len(azm_v) == len(vel)
+        plt.close('all')
+
 @pytest.mark.parametrize('colorbar', [False])
 @pytest.mark.parametrize('colorbar_label', 'green')
 @pytest.mark.parametrize('title', [False])
@@ -0,0 +1,368 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Modifications:
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+
+import bz2
+import datetime as dt
+import gzip
+import lzma
+import matplotlib.pyplot as plt
+import os
+import numpy as np
+import pydarnio
+import pytest
+import warnings
+
+import pydarn
+
+from pydarn.io.borealis_records import BorealisRecords
+
+fitacf_file = 'test/data/test.fitacf.bz2'
+rawacf_file = 'test/data/test.rawacf.bz2'
+grid_file = 'test/data/test.grd'
+
+
+def assert_same_records(records, other_records):
+    """ same fields, types and values in the same order """
+    assert len(records) == len(other_records)
+    for record, other_record in zip(records, other_records):
+        assert list(record.keys()) == list(other_record.keys())
+        for key, value in record.items():
+            assert type(value) == type(other_record[key])
+            if isinstance(value, np.ndarray):
+                assert value.dtype == other_record[key].dtype
+                assert np.array_equal(value, other_record[key],
+                                      equal_nan=value.dtype.kind == 'f')
+            else:
+                assert value == other_record[key] or \
+                    (value != value and other_record[key] != other_record[key])
+
+
+@pytest.mark.parametrize('filename', [fitacf_file, rawacf_file, grid_file])
+def test_iter_dmap(filename):
+    """ the generator gives the same records as read_dmap """
+    reader = pydarn.SuperDARNRead()
+    assert_same_records(reader.read_dmap(filename),
+                        list(reader.iter_dmap(filename)))
+
+
+def test_iter_dmap_copy():
+    """ the arrays are writable copies unless copy is False """
+    reader = pydarn.SuperDARNRead()
+    record = next(reader.iter_dmap(fitacf_file))
+    record['v'][record['v'] > 0] = np.nan
+    assert record['v'].base is None
+    view = next(reader.iter_dmap(fitacf_file, copy=False))
+    assert not view['v'].flags.writeable
+    assert np.array_equal(view['slist'], record['slist'])
+
+
+def test_iter_dmap_projection_time_window():
+    """ fields and time window select the records and fields """
+    data = pydarn.SuperDARNRead().read_dmap(fitacf_file)
+    start_time = dt.datetime(2018, 4, 4, 6, 2)
+    end_time = dt.datetime(2018, 4, 4, 6, 3)
+    fields = ['bmnum', 'slist', 'v']
+    expected = [{field: record[field] for field in fields}
+                for record in data
+                if start_time <= pydarn.time2datetime(record) <= end_time
+                and record['bmnum'] == 7]
+    records = list(pydarn.SuperDARNRead().iter_dmap(
+        fitacf_file, fields=fields, start_time=start_time,
+        end_time=end_time, record_filter=lambda rec: rec['bmnum'] == 7))
+    assert len(records) > 0
+    assert_same_records(expected, records)
+
+
+@pytest.mark.parametrize('filename', [fitacf_file, rawacf_file])
+def test_read_dmap_fields(filename):
+    """ fields keeps only the requested fields of every record """
+    fields = ['time.hr', 'time.mt', 'bmnum', 'channel', 'slist', 'pwr0']
+    reader = pydarn.SuperDARNRead()
+    expected = [{field: record[field] for field in record
+                 if field in fields}
+                for record in reader.read_dmap(filename)]
+    assert_same_records(expected, reader.read_dmap(filename, fields=fields))
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_read_dmap_files(processes, tmp_path):
+    """ overlapping files are merged in time order without duplicates """
+    data = pydarn.SuperDARNRead().read_dmap(fitacf_file)
+    # files written out of order that overlap by 5 records
+    for i, (start, stop) in enumerate([(40, None), (0, 45)]):
+        pydarnio.SDarnWrite(data[start:stop]).write_fitacf(
+            str(tmp_path / '{}.fitacf'.format(i)))
+    reader = pydarn.SuperDARNRead()
+    records = reader.read_dmap_files(str(tmp_path / '*.fitacf'),
+                                     processes=processes)
+    assert_same_records(data, records)
+
+    columnar_data = reader.read_dmap_files(
+        sorted(tmp_path.glob('*.fitacf'))[::-1], fields=['v'],
+        columnar=True, processes=processes)
+    assert isinstance(columnar_data, pydarn.ColumnarData)
+    assert len(columnar_data) == len(data)
+    assert np.array_equal(columnar_data.scalar('bmnum'),
+                          [record['bmnum'] for record in data])
+
+
+def test_read_dmap_files_no_time(monkeypatch):
+    """ records without time fields are kept after the timed records """
+    data = pydarn.SuperDARNRead().read_dmap(fitacf_file)
+    untimed = [{'bmnum': 0}, {'bmnum': 1}]
+    file_records = {'0': [untimed[0]] + data[6:10],
+                    '1': data[:6] + [untimed[1]]}
+    monkeypatch.setattr(pydarn.io.superdarn_io, '_read_dmap_file',
+                        lambda filename, fields: file_records[filename])
+    records = pydarn.SuperDARNRead().read_dmap_files(['0', '1'],
+                                                     processes=1)
+    assert_same_records(data[:10] + untimed, records)
+
+
+@pytest.mark.parametrize('compress', [gzip.compress, lzma.compress,
+                                      bz2.compress])
+def test_codecs(compress, tmp_path):
+    """ compressed files are read whatever their name """
+    with bz2.open(fitacf_file) as fp:
+        stream = fp.read()
+    filename = str(tmp_path / 'compressed.fitacf')
+    with open(filename, 'wb') as fp:
+        fp.write(compress(stream))
+    assert pydarn.io.codecs.decompress_file(filename) == stream
+    reader = pydarn.SuperDARNRead()
+    data = reader.read_dmap(fitacf_file)
+    assert_same_records(data, reader.read_dmap(filename))
+    assert_same_records(data, list(reader.iter_dmap(filename)))
+
+
+def test_bz2_streams():
+    """ multi-stream bz2 data is decompressed one stream per thread """
+    with bz2.open(fitacf_file) as fp:
+        stream = fp.read()
+    chunks = [stream[i:i + 100000] for i in range(0, len(stream), 100000)]
+    data = b''.join(bz2.compress(chunk) for chunk in chunks)
+    pieces = pydarn.io.codecs.bz2_streams(data, min_size=0)
+    assert len(pieces) == len(chunks)
+    assert pydarn.io.codecs.decompress_bz2(data, threads=2) == stream
+
+
+@pytest.mark.skipif(pydarn.io.codecs.zstandardInstalled,
+                    reason="zstandard is installed")
+def test_zstd_missing(tmp_path):
+    """ zstd files need zstandard """
+    filename = str(tmp_path / 'compressed.fitacf')
+    with open(filename, 'wb') as fp:
+        fp.write(pydarn.io.codecs.Codecs.ZSTD.value + bytes(10))
+    with pytest.raises(pydarn.io_exceptions.CodecMissingError):
+        pydarn.SuperDARNRead().read_dmap(filename)
+
+
+def borealis_rawacf_record(beam, timestamp):
+    """ a small Borealis rawacf record (1 beam, 5 ranges, 3 lags) """
+    dimensions = np.array([1, 5, 3], dtype=np.uint32)
+    rng = np.random.default_rng(beam)
+    acfs = (rng.random(15) + 1j * rng.random(15)).astype(np.complex64)
+    return {'main_acfs': acfs, 'xcfs': acfs * 2, 'intf_acfs': acfs * 3,
+            'correlation_dimensions': dimensions,
+            'data_normalization_factor': 1.0,
+            'borealis_git_hash': 'v0.5', 'beam_nums': np.array([beam]),
+            'beam_azms': np.array([beam * 3.24]),
+            'sqn_timestamps': np.array([timestamp]),
+            'experiment_name': 'normalscan', 'experiment_id': 151,
+            'experiment_comment': '', 'slice_comment': '',
+            'station': 'sas', 'num_sequences': 20, 'first_range_rtt': 1200.0,
+            'rx_sample_rate': 3333.3, 'agc_status_word': 0,
+            'lp_status_word': 0, 'noise_at_freq': np.array([0.0]),
+            'scan_start_marker': True, 'int_time': 3.5,
+            'tx_pulse_len': 300, 'tau_spacing': 2400,
+            'pulses': np.array([0, 9, 12], dtype=np.uint32),
+            'lags': np.array([[0, 0], [9, 12], [0, 9], [0, 0]]),
+            'first_range': 180.0, 'range_sep': 44.96, 'freq': 10500,
+            'slice_id': 0}
+
+
+def test_borealis_records(monkeypatch):
+    """ the records are converted like BorealisConvert without a file """
+    borealis_records = {str(i): borealis_rawacf_record(i, 1.6e9 + 3.5 * i)
+                        for i in range(3)}
+
+    def borealis_read(self, filename, filetype, structure=None):
+        self.filename = filename
+        self.borealis_filetype = filetype
+    monkeypatch.setattr(pydarnio.BorealisRead, '__init__', borealis_read)
+    monkeypatch.setattr(pydarnio.BorealisRead, 'records', borealis_records)
+    monkeypatch.setattr(pydarnio.BorealisConvert, '_is_convertible_to_rawacf',
+                        lambda self: True)
+    # BorealisConvert without writing the DMap file
+    monkeypatch.setattr(pydarnio.BorealisConvert, '_write_to_sdarn',
+                        lambda self: self._convert_records_to_dmap())
+    expected = pydarnio.BorealisConvert('test.rawacf.hdf5', 'rawacf',
+                                        'unused.rawacf').sdarn_dict
+
+    reader = pydarn.SuperDARNRead()
+    assert_same_records(expected, reader.read_borealis('test.rawacf.hdf5'))
+    records = reader.iter_borealis('test.rawacf.hdf5', fields=['bmnum'])
+    assert next(records) == {'bmnum': 0}
+    assert [record['bmnum'] for record in records] == [1, 2]
+
+
+def test_borealis_records_errors(monkeypatch):
+    """ missing pyDARNio internals and record errors are reported """
+    monkeypatch.delattr(pydarnio.BorealisConvert,
+                        '_BorealisConvert__convert_rawacf_record')
+    with pytest.raises(pydarn.io_exceptions.PydarnioVersionError):
+        BorealisRecords('test.rawacf.hdf5', 'rawacf')
+    monkeypatch.undo()
+
+    def borealis_read(self, filename, filetype, structure=None):
+        self.filename = filename
+        self.borealis_filetype = filetype
+    monkeypatch.setattr(pydarnio.BorealisRead, '__init__', borealis_read)
+    monkeypatch.setattr(pydarnio.BorealisRead, 'records',
+                        {'0': {'slice_id': 0}})
+    monkeypatch.setattr(pydarnio.BorealisConvert, '_is_convertible_to_rawacf',
+                        lambda self: True)
+    # malformed data is a conversion error
+    with pytest.raises(
+            pydarnio.borealis_exceptions.BorealisConvert2RawacfError):
+        list(BorealisRecords('test.rawacf.hdf5', 'rawacf'))
+
+    # programming errors are raised as they are
+    def convert(*args):
+        raise TypeError('bug')
+    monkeypatch.setattr(pydarnio.BorealisConvert,
+                        '_BorealisConvert__convert_rawacf_record',
+                        staticmethod(convert))
+    with pytest.raises(TypeError):
+        list(BorealisRecords('test.rawacf.hdf5', 'rawacf'))
+
+    # pyDARNio 1.1 returns a record, later versions a list of records
+    for converted, expected in [({'bmnum': 0}, [{'bmnum': 0}]),
+                                ([{'bmnum': 0}, {'bmnum': 1}],
+                                 [{'bmnum': 0}, {'bmnum': 1}])]:
+        monkeypatch.setattr(pydarnio.BorealisConvert,
+                            '_BorealisConvert__convert_rawacf_record',
+                            staticmethod(lambda *args: converted))
+        assert list(BorealisRecords('test.rawacf.hdf5', 'rawacf')) == \
+            expected
+    monkeypatch.setattr(pydarnio.BorealisConvert,
+                        '_BorealisConvert__convert_rawacf_record',
+                        staticmethod(lambda *args: None))
+    with pytest.raises(pydarn.io_exceptions.PydarnioVersionError):
+        list(BorealisRecords('test.rawacf.hdf5', 'rawacf'))
+
+
+def test_read_columnar_cache(tmp_path, monkeypatch):
+    """ the second read memory-maps the columns stored by the first """
+    cache = pydarn.DmapCache(str(tmp_path / 'cache'))
+    monkeypatch.setattr(pydarn.io.superdarn_io, 'dmap_cache', cache)
+    filename = str(tmp_path / 'test.fitacf.bz2')
+    with open(fitacf_file, 'rb') as source, open(filename, 'wb') as fp:
+        fp.write(source.read())
+    reader = pydarn.SuperDARNRead()
+    data = reader.read_columnar(filename)
+    assert cache.get(filename, ['v']) is None
+    cached_data = reader.read_columnar(filename)
+    assert isinstance(cached_data.scalar('bmnum'), np.memmap)
+    assert isinstance(cached_data.ragged('v')[0], np.memmap)
+    assert cached_data.fields == data.fields
+    # slices of the mapped columns are memmaps
+    assert_same_records(data.to_records(),
+                        [{key: np.asarray(value) if
+                          isinstance(value, np.ndarray) else value
+                          for key, value in record.items()}
+                         for record in cached_data.to_records()])
+    with warnings.catch_warnings(record=True):
+        pydarn.RTP.plot_range_time(cached_data, beam_num=7)
+        pydarn.Fan.plot_fan(cached_data, scan_index=5)
+    plt.close('all')
+
+    # a changed file is parsed again
+    os.utime(filename, ns=(0, 0))
+    assert cache.get(filename) is None
+    assert not isinstance(reader.read_columnar(filename).scalar('bmnum'),
+                          np.memmap)
+    cache.clear()
+    assert os.listdir(cache.directory) == []
+
+
+def test_dmap_cache_bounds(tmp_path):
+    """ entries are stored without pickle and old entries are removed """
+    cache = pydarn.DmapCache(str(tmp_path / 'cache'), max_entries=2)
+    records = [{'a': np.arange(6.0).reshape(2, 3), 'b': 1},
+               {'a': np.arange(6.0).reshape(3, 2), 'b': 2},
+               {'b': 3}]
+    data = pydarn.ColumnarData(records)
+    assert data.scalar('a').dtype == object
+    filenames = [str(tmp_path / 'test{}.fitacf'.format(i)) for i in range(3)]
+    for filename in filenames:
+        with open(filename, 'wb') as fp:
+            fp.write(b'records')
+    cache.put(filenames[0], data)
+    # the arrays changing shape are views of the mapped values
+    cached_data = cache.get(filenames[0])
+    assert isinstance(cached_data[1]['a'], np.memmap)
+    assert_same_records(data.to_records(),
+                        [{key: np.asarray(value) if
+                          isinstance(value, np.ndarray) else value
+                          for key, value in record.items()}
+                         for record in cached_data.to_records()])
+
+    # a rewritten file replaces its entry
+    os.utime(filenames[0], ns=(0, 0))
+    cache.put(filenames[0], data)
+    assert len(os.listdir(cache.directory)) == 1
+    # the least recently used entry is removed
+    cache.put(filenames[1], data)
+    os.utime(os.path.join(cache.directory, cache._name(filenames[1]),
+                          cache.INDEX), (0, 0))
+    assert cache.get(filenames[0]) is not None
+    cache.put(filenames[2], data)
+    assert len(os.listdir(cache.directory)) == 2
+    assert cache.get(filenames[1]) is None
+    assert cache.get(filenames[0]) is not None
+
+
+@pytest.mark.parametrize('compress', [None, gzip.compress])
+def test_follow(compress, tmp_path):
+    """ only complete records appended since the last read are returned """
+    data = pydarn.SuperDARNRead().read_dmap(fitacf_file)
+    written = str(tmp_path / 'written.fitacf')
+    pydarnio.SDarnWrite(data[:60]).write_fitacf(written)
+    with open(written, 'rb') as fp:
+        stream = fp.read()
+    filename = str(tmp_path / 'follow.fitacf')
+
+    def write(stop):
+        with open(filename, 'wb') as fp:
+            fp.write(stream[:stop] if compress is None
+                     else compress(stream[:stop]))
+
+    # the file ends in the middle of a record
+    write(len(stream) // 2)
+    follower = pydarn.SuperDARNRead().follow(filename)
+    first = follower.read()
+    assert 0 < len(first) < 60
+    assert follower.offset < len(stream) // 2
+    assert follower.read() == []
+    write(len(stream))
+    rest = follower.read()
+    assert follower.offset == len(stream)
+    assert follower.read() == []
+    assert_same_records(data[:60], first + rest)
+
+    fields = ['bmnum', 'v']
+    projected = pydarn.SuperDARNRead().follow(filename, fields).read()
+    assert_same_records([{field: record[field] for field in fields}
+                         for record in data[:60]], projected)
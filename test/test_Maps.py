@@ -0,0 +1,205 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+
+import numpy as np
+import pytest
+
+from scipy import special
+
+import pydarn
+
+rng = np.random.default_rng(0)
+
+
+def reference_legendre(fit_order: int, x: float) -> np.ndarray:
+    """
+    scipy's P_l^m(x) in the [m, l] layout of lpmn, from
+    assoc_legendre_p_all (lpmn was removed in scipy 1.17)
+    """
+    try:
+        plm = special.assoc_legendre_p_all(fit_order, fit_order, x)[0]
+    except AttributeError:
+        return special.lpmn(fit_order, fit_order, x)[0]
+    # [l, m] with the negative orders after the positive ones
+    return plm[:, :fit_order + 1].T
+
+
+
+@pytest.mark.parametrize('fit_order', [1, 6, 12])
+def test_associated_legendre(fit_order):
+    """ same values as scipy's for every point """
+    x = np.concatenate([np.linspace(-1, 1, 51), [0.0, 1.0, -1.0]])
+    plm = pydarn.associated_legendre(fit_order, x)
+    assert plm.shape == (len(x), fit_order + 1, fit_order + 1)
+    for plm_x, x_i in zip(plm, x):
+        assert np.allclose(plm_x,
+                           reference_legendre(fit_order, x_i),
+                           rtol=1e-12, atol=0)
+    # points can have any shape
+    assert np.array_equal(pydarn.associated_legendre(fit_order,
+                                                     x[:50].reshape(5, 10)),
+                          plm[:50].reshape(5, 10, fit_order + 1,
+                                           fit_order + 1))
+
+
+@pytest.mark.parametrize('hemisphere', [pydarn.Hemisphere.North,
+                                        pydarn.Hemisphere.South])
+def test_calculate_potentials(hemisphere):
+    """ potential of the spherical harmonic expansion on the grid """
+    fit_order = 6
+    lat_min = 62
+    coefficients = rng.normal(size=((fit_order + 1)**2, 1)) * 1000
+    mlats, mlons, potentials = pydarn.Maps.calculate_potentials(
+        coefficients, lat_min, fit_order=fit_order, lowlat=55,
+        hemisphere=hemisphere)
+    assert mlats.shape == mlons.shape == potentials.shape == (181, 36)
+    # latitude changes along the second axis, longitude along the first
+    assert np.array_equal(mlats[0], np.arange(55, 91) * hemisphere.value)
+    assert np.array_equal(mlons[:, 0], np.arange(0, 362, 2))
+    assert not potentials[np.abs(mlats) < lat_min].any()
+
+    # potential at one grid point from the expansion
+    i, j = 10, 20
+    theta = np.radians(90 - np.abs(mlats[i, j]))
+    alpha = np.pi / (np.radians(90 - lat_min) * hemisphere.value)
+    plm = reference_legendre(fit_order, np.cos(alpha * theta))
+    phi = np.radians(mlons[i, j])
+    potential = 0
+    for m in range(fit_order + 1):
+        for l in range(m, fit_order + 1):
+            k = pydarn.Maps.index_legendre(l, m)
+            potential += coefficients[k, 0] * np.cos(m * phi) * plm[m, l]
+            if m > 0:
+                potential += coefficients[k + 1, 0] * np.sin(m * phi) *\
+                    plm[m, l]
+    assert np.isclose(potentials[i, j], potential / 1000)
+
+
+def test_harmonic_indices():
+    """ coefficients are in the order of index_legendre """
+    l, m, sine = pydarn.harmonic_indices(6)
+    assert len(l) == 49
+    for k in range(len(l)):
+        assert pydarn.Maps.index_legendre(l[k], m[k]) + sine[k] == k
+
+
+def test_potential_basis_cache():
+    """ the basis is computed once and evaluates many records at once """
+    pydarn.harmonic_basis_cache.clear()
+    fit_order = 6
+    coefficients = rng.normal(size=((fit_order + 1)**2, 3)) * 1000
+    mlats, mlons, potentials = pydarn.Maps.calculate_potentials(
+        coefficients[:, :1], 60, fit_order=fit_order)
+    cached = len(pydarn.harmonic_basis_cache)
+    basis = pydarn.potential_basis(fit_order, 60, mlats, np.radians(mlons))
+    assert len(pydarn.harmonic_basis_cache) == cached
+    assert basis is pydarn.potential_basis(fit_order, 60, mlats,
+                                           np.radians(mlons))
+    assert not basis.flags.writeable
+    assert basis.shape == (mlats.size, (fit_order + 1)**2)
+
+    # one matrix product gives the potentials of all the records
+    all_potentials = basis @ coefficients / 1000.0
+    assert np.allclose(all_potentials[:, 0].reshape(mlats.shape),
+                       potentials)
+    for i in range(1, 3):
+        _, _, potentials = pydarn.Maps.calculate_potentials(
+            coefficients[:, i], 60, fit_order=fit_order)
+        assert np.allclose(all_potentials[:, i].reshape(mlats.shape),
+                           potentials)
+    assert len(pydarn.harmonic_basis_cache) == cached
+
+    # another lowest latitude is another basis
+    pydarn.Maps.calculate_potentials(coefficients[:, 0], 65,
+                                     fit_order=fit_order)
+    assert len(pydarn.harmonic_basis_cache) > cached
+    pydarn.harmonic_basis_cache.clear()
+    assert len(pydarn.harmonic_basis_cache) == 0
+
+
+def test_batch_potentials_velocities():
+    """ the batch API gives the same values as record by record """
+    pydarn.harmonic_basis_cache.clear()
+    fit_orders = [6, 4, 6, 8, 6]
+    lat_mins = [60, 60, 60, 58, 62]
+    hemispheres = [pydarn.Hemisphere.North, pydarn.Hemisphere.South,
+                   pydarn.Hemisphere.South, pydarn.Hemisphere.North,
+                   pydarn.Hemisphere.North]
+    coefficients = [rng.normal(size=(fit_order + 1)**2) * 1000
+                    for fit_order in fit_orders]
+
+    mlats, mlons, potentials = pydarn.Maps.calculate_potentials_batch(
+        coefficients, lat_mins, fit_orders, lowlat=55,
+        hemisphere=hemispheres)
+    assert potentials.shape == (5,) + mlats.shape
+    # one basis per fit order and lat_min
+    assert len(pydarn.harmonic_basis_cache) == 4 * 2
+    for i in range(5):
+        record_mlats, record_mlons, record_potentials = \
+            pydarn.Maps.calculate_potentials(
+                coefficients[i], lat_mins[i], fit_order=fit_orders[i],
+                lowlat=55, hemisphere=hemispheres[i])
+        assert np.array_equal(np.abs(record_mlats), mlats)
+        assert np.array_equal(record_mlons, mlons)
+        assert np.allclose(potentials[i], record_potentials)
+
+    # shared positions and positions of each record
+    vector_mlats = rng.uniform(62, 89, 100)
+    vector_mlons = rng.uniform(0, 2 * np.pi, 100)
+    record_positions = [(vector_mlats[:10 * (i + 1)],
+                         vector_mlons[:10 * (i + 1)]) for i in range(5)]
+    for batch_mlats, batch_mlons in [(vector_mlats, vector_mlons),
+                                     zip(*record_positions)]:
+        batch_mlats, batch_mlons = list(batch_mlats), list(batch_mlons)
+        velocities = pydarn.Maps.calculated_fitted_velocities_batch(
+            batch_mlats, batch_mlons, coefficients, hemispheres, fit_orders,
+            lat_mins)
+        assert len(velocities) == 5
+        for i, (velocity, azm_v) in enumerate(velocities):
+            shared = np.ndim(batch_mlats[0]) == 0
+            expected = pydarn.Maps.calculated_fitted_velocities(
+                vector_mlats if shared else batch_mlats[i],
+                vector_mlons if shared else batch_mlons[i],
+                coefficients[i], hemispheres[i], fit_orders[i],
+                lat_mins[i])
+            assert np.allclose(velocity, expected[0])
+            assert np.allclose(azm_v, expected[1])
+
+
+def test_efield_basis():
+    """ the E field basis is minus the gradient of the potential basis """
+    fit_order = 8
+    lat_min = 58
+    radius = pydarn.Re * 1000.0
+    mlats = rng.uniform(lat_min + 1, 89, 50)
+    phi = rng.uniform(0, 2 * np.pi, 50)
+    theta_basis, phi_basis = pydarn.efield_basis(fit_order, lat_min, mlats,
+                                                 phi, radius)
+    assert theta_basis.shape == phi_basis.shape == (50, (fit_order + 1)**2)
+
+    # central differences along the colatitude and the longitude
+    step = 1e-5
+    theta_gradient = (pydarn.potential_basis(fit_order, lat_min,
+                                             mlats - np.degrees(step), phi) -
+                      pydarn.potential_basis(fit_order, lat_min,
+                                             mlats + np.degrees(step),
+                                             phi)) / (2 * step)
+    phi_gradient = (pydarn.potential_basis(fit_order, lat_min, mlats,
+                                           phi + step) -
+                    pydarn.potential_basis(fit_order, lat_min, mlats,
+                                           phi - step)) / (2 * step)
+    sin_thetas = np.sin(np.radians(90 - mlats))[:, np.newaxis]
+    scale = np.abs(theta_basis).max()
+    assert np.allclose(theta_basis, -theta_gradient / radius,
+                       atol=1e-6 * scale)
+    assert np.allclose(phi_basis, -phi_gradient / (radius * sin_thetas),
+                       atol=1e-6 * scale)
@@ -15,6 +15,7 @@
 import bz2
 import datetime as dt
 import matplotlib.pyplot as plt
+import numpy as np
 import pytest
 import warnings
 
@@ -102,6 +103,249 @@ class TestRangTime:
         plt.close('all')
 
 
+@pytest.mark.parametrize('parameters', ['v', 'p_l', 'w_l'])
+@pytest.mark.parametrize('groundscatter', [False, True])
+@pytest.mark.parametrize('range_estimation',
+                         [pydarn.RangeEstimation.RANGE_GATE,
+                          pydarn.RangeEstimation.SLANT_RANGE])
+class TestBuildRangeTime:
+
+    def test_build_range_time_shape(self, parameters, groundscatter,
+                                    range_estimation):
+        """ x and y are the edges of the z matrix """
+        with warnings.catch_warnings(record=True):
+            x, y, z = pydarn.build_range_time(
+                data, parameter=parameters, beam_num=9, channel=2,
+                groundscatter=groundscatter,
+                range_estimation=range_estimation)
+        assert z.shape == (len(x) - 1, len(y) - 1)
+        assert (z == -1000000).any() == groundscatter
+
+    def test_build_range_time_filter(self, parameters, groundscatter,
+                                     range_estimation):
+        """ filtered values are never placed in the matrix """
+        with warnings.catch_warnings(record=True):
+            _, _, z = pydarn.build_range_time(
+                data, parameter=parameters, beam_num=9, channel=2,
+                groundscatter=groundscatter,
+                range_estimation=range_estimation,
+                filter_settings={'min_array_filter': {parameters: 0},
+                                 'max_array_filter': {parameters: 100}})
+        values = z[~np.isnan(z) & (z != -1000000)]
+        assert np.all((values >= 0) & (values <= 100))
+
+
+def test_filter_engine():
+    """ filter_settings compile to the same filter as the expression """
+    v = pydarn.Filter.field('v')
+    settings = {'min_array_filter': {'v': 0},
+                'max_array_filter': {'v': 100}}
+    expression = v.present() & (v >= 0) & (v <= 100)
+    with warnings.catch_warnings(record=True):
+        _, _, z_settings = pydarn.build_range_time(
+            data, beam_num=9, filter_settings=settings)
+        _, _, z_expression = pydarn.build_range_time(
+            data, beam_num=9, filter_settings=expression)
+    assert np.array_equal(z_settings, z_expression, equal_nan=True)
+    assert pydarn.Filter.compile(settings).fields() == ['v']
+
+    columnar_data = pydarn.ColumnarData(data)
+    tfreq = np.array([record['tfreq'] for record in data])
+    bmnum = np.array([record['bmnum'] for record in data])
+    plot_filter = (pydarn.Filter.field('tfreq') > tfreq.min()) & \
+        ~(pydarn.Filter.field('bmnum').isin([0, 9])) | \
+        (pydarn.Filter.field('bmnum') == 5)
+    assert np.array_equal(plot_filter.mask(columnar_data),
+                          ((tfreq > tfreq.min()) & ~np.isin(bmnum, [0, 9])) |
+                          (bmnum == 5))
+    # missing fields never pass a comparison
+    assert not (pydarn.Filter.field('nofield') != 0).mask(columnar_data).any()
+    with pytest.raises(ValueError):
+        (v > 0).mask(columnar_data)
+
+    masks = (v > 0).cell_masks(data, [10, 20])
+    for mask, i in zip(masks, [10, 20]):
+        assert np.array_equal(mask, data[i]['v'] > 0)
+    masks = (v > 0).cell_masks(columnar_data, [10, 20])
+    for mask, i in zip(masks, [10, 20]):
+        assert np.array_equal(mask, data[i]['v'] > 0)
+
+
+def test_fill_gaps():
+    """ gaps are padded every gap_resolution, also across days """
+    times = np.array(['2018-04-04T23:58', '2018-04-04T23:59',
+                      '2018-04-05T00:05:30', '2018-04-05T00:06'],
+                     dtype='datetime64[us]')
+    assert np.array_equal(pydarn.find_gaps(times), [1])
+    filled_times, index = pydarn.fill_gaps(times)
+    assert np.array_equal(index, [0, 1, 5, 6])
+    assert np.array_equal(filled_times[index], times)
+    assert np.array_equal(filled_times[2:5], np.array(
+        ['2018-04-05T00:01', '2018-04-05T00:03', '2018-04-05T00:05'],
+        dtype='datetime64[us]'))
+    filled_times, _ = pydarn.fill_gaps(times,
+                                       end_time=dt.datetime(2018, 4, 5, 0, 10))
+    assert filled_times[-1] == np.datetime64('2018-04-05T00:08')
+    filled_times, index = pydarn.fill_gaps(times, dt.timedelta(minutes=10))
+    assert np.array_equal(filled_times, times)
+    assert len(pydarn.find_gaps(times, dt.timedelta(minutes=10))) == 0
+
+
+def test_gap_resolution():
+    """ the line and mesh are broken at gaps longer than gap_resolution """
+    times = pydarn.times2datetime64(data)
+    # 90 seconds without records
+    records = [record for record, time in zip(data, times)
+               if not np.datetime64('2018-04-04T06:02') <= time <
+               np.datetime64('2018-04-04T06:03:30')]
+    num_records = len([record for record in records
+                       if record['bmnum'] == 9])
+    for gap_resolution, broken in [(dt.timedelta(minutes=2), False),
+                                   (dt.timedelta(seconds=30), True)]:
+        with warnings.catch_warnings(record=True):
+            lines, _, _ = pydarn.RTP.plot_time_series(
+                records, parameter='tfreq', beam_num=9,
+                gap_resolution=gap_resolution)
+            _, _, _, x, _, z = pydarn.RTP.plot_range_time(
+                records, beam_num=9, gap_resolution=gap_resolution)
+        assert np.ma.is_masked(lines[0].get_ydata()) == broken
+        # empty rows are added in the gap
+        assert (len(x) - 1 > num_records) == broken
+        plt.close('all')
+
+
+class TestColumnarData:
+
+    def test_columnar_records(self):
+        """ records of the columnar data match the list of records """
+        columnar_data = pydarn.ColumnarData(data)
+        assert len(columnar_data) == len(data)
+        for record, columnar_record in zip(data, columnar_data):
+            assert list(record.keys()) == list(columnar_record.keys())
+            for key, value in record.items():
+                if isinstance(value, np.ndarray):
+                    assert np.array_equal(value, columnar_record[key],
+                                          equal_nan=value.dtype.kind == 'f')
+                else:
+                    assert value == columnar_record[key]
+
+    @pytest.mark.parametrize('groundscatter', [False, True])
+    def test_columnar_range_time(self, groundscatter):
+        """ columnar data gives the same range-time matrix as a list """
+        columnar_data = pydarn.ColumnarData(data)
+        with warnings.catch_warnings(record=True):
+            x, y, z = pydarn.build_range_time(data, beam_num=7,
+                                              groundscatter=groundscatter)
+            x_col, y_col, z_col = \
+                pydarn.build_range_time(columnar_data, beam_num=7,
+                                        groundscatter=groundscatter)
+        assert x == x_col
+        assert np.array_equal(y, y_col)
+        assert np.array_equal(z, z_col, equal_nan=True)
+
+    def test_columnar_times(self):
+        """ bulk time conversion matches time2datetime """
+        times = [pydarn.time2datetime(record) for record in data]
+        columnar_data = pydarn.ColumnarData(data)
+        assert pydarn.times2datetime64(data).astype(dt.datetime).tolist()\
+            == times
+        assert columnar_data.times().astype(dt.datetime).tolist() == times
+        # the times are kept on the columnar data
+        assert pydarn.times2datetime64(columnar_data) is columnar_data.times()
+
+    def test_columnar_range_time_plot(self):
+        """ plotting methods take columnar data """
+        with warnings.catch_warnings(record=True):
+            pydarn.RTP.plot_range_time(pydarn.ColumnarData(data))
+        plt.close('all')
+
+
+class TestAppend:
+
+    def test_range_time_append(self):
+        """ appended records are drawn on the same axes """
+        with warnings.catch_warnings(record=True):
+            im, _, _, _, _, _ = pydarn.RTP.plot_range_time(data[:50],
+                                                           beam_num=9)
+            ax = im.axes
+            xlim = ax.get_xlim()
+            _, append_cb, _, _, _, _ = pydarn.RTP.plot_range_time(
+                data[50:], beam_num=9, ax=ax, append=True)
+        meshes = [mesh for mesh in ax.collections
+                  if mesh.get_gid() == 'range time']
+        assert len(meshes) == 2
+        assert append_cb is None
+        assert ax.get_xlim()[0] == xlim[0]
+        assert ax.get_xlim()[1] > xlim[1]
+        assert meshes[1].get_cmap() is meshes[0].get_cmap()
+        assert meshes[1].norm.vmax == meshes[0].norm.vmax
+        plt.close('all')
+
+    def test_summary_append(self):
+        """ append_to reuses the figure and axes of a summary plot """
+        with warnings.catch_warnings(record=True):
+            fig, axes = pydarn.RTP.plot_summary(data[:50], beam_num=9)
+            num_collections = [len(ax.collections) for ax in axes[3:]]
+            append_fig, append_axes = pydarn.RTP.plot_summary(
+                data[50:], beam_num=9, append_to=(fig, axes))
+        assert append_fig is fig
+        assert append_axes is axes
+        # velocity also draws a ground scatter mesh
+        assert [len(ax.collections) for ax in axes[3:]] == \
+            [num * 2 for num in num_collections]
+        plt.close('all')
+
+
+    def test_range_time_buffer(self):
+        """ appending records in chunks fills the same matrix """
+        resolution = dt.timedelta(seconds=3)
+        with warnings.catch_warnings(record=True):
+            buffer = pydarn.RangeTimeBuffer(data, beam_num=9,
+                                            groundscatter=True,
+                                            time_resolution=resolution)
+            # a short buffer has to grow
+            chunked = pydarn.RangeTimeBuffer(data[:30], beam_num=9,
+                                             groundscatter=True,
+                                             time_resolution=resolution,
+                                             duration=dt.timedelta(minutes=1))
+            for start in range(30, len(data), 7):
+                rows = chunked.append(data[start:start + 7])
+                assert rows.stop == chunked.num_rows
+        assert buffer.num_rows == chunked.num_rows
+        assert buffer.last_time == chunked.last_time
+        assert np.array_equal(buffer.z[:buffer.num_rows],
+                              chunked.z[:chunked.num_rows], equal_nan=True)
+        assert (buffer.z == -1000000).any()
+        assert len(buffer.times()) == len(buffer.z) + 1
+
+    def test_range_time_plot(self):
+        """ appended records are written into the mesh in place """
+        resolution = dt.timedelta(seconds=3)
+        _, axes = plt.subplots(2)
+        with warnings.catch_warnings(record=True):
+            plot = pydarn.RangeTimePlot(data[:30], beam_num=9, ax=axes[0],
+                                        groundscatter=True,
+                                        time_resolution=resolution)
+            mesh_data = plot.im.get_array()
+            xlim = plot.ax.get_xlim()
+            for start in range(30, len(data), 7):
+                plot.append(data[start:start + 7])
+            full_plot = pydarn.RangeTimePlot(data, beam_num=9, ax=axes[1],
+                                             groundscatter=True,
+                                             time_resolution=resolution)
+        assert plot.im.get_array() is mesh_data
+        assert len(plot.ax.collections) == 2
+        assert plot.ax.get_xlim()[0] == xlim[0]
+        assert plot.ax.get_xlim()[1] > xlim[1]
+        for mesh, full_mesh in [(plot.im, full_plot.im),
+                                (plot.gs_im, full_plot.gs_im)]:
+            assert np.array_equal(mesh.get_array().mask,
+                                  full_mesh.get_array().mask)
+            assert np.array_equal(mesh.get_array().compressed(),
+                                  full_mesh.get_array().compressed())
+        plt.close('all')
+
+
 @pytest.mark.parametrize('parameters_scalar', ['tfreq', 'cp', 'nave',
                                                'p_l', 'w_l', 'v'])
 @pytest.mark.parametrize('gate', [38, 48])
@@ -0,0 +1,175 @@
+# Copyright (C) 2022 SuperDARN Canada, University of Saskatchewan
+# Author(s): SuperDARN Data Visualization Working Group
+#
+# Disclaimer:
+# pyDARN is under the LGPL v3 license found in the root directory LICENSE.md
+# Everyone is permitted to copy and distribute verbatim copies of this license
+# document, but changing it is not allowed.
+#
+# This version of the GNU Lesser General Public License incorporates the terms
+# and conditions of version 3 of the GNU General Public License,
+# supplemented by the additional permissions listed below.
+
+import aacgmv2
+import datetime as dt
+import numpy as np
+import os
+import pytest
+
+import pydarn
+
+
+@pytest.mark.parametrize('virtual_height_model', [pydarn.VHModels.STANDARD,
+                                                  pydarn.VHModels.CHISHAM])
+def test_geographic_coordinates_grid(virtual_height_model):
+    """ the whole FOV grid matches the per cell calculation """
+    gate2geographic_location = \
+        pydarn.utils.coordinates.gate2geographic_location
+    lats, lons = pydarn.Coords.GEOGRAPHIC(
+        stid=65, gates=[0, 110], virtual_height_model=virtual_height_model)
+    for gate, beam in [(0, 0), (20, 5), (75, 16), (110, 8)]:
+        lat, lon = gate2geographic_location(
+            stid=65, beam=beam, range_gate=gate, height=300,
+            virtual_height_model=virtual_height_model)
+        assert np.isclose(lats[gate - 110 - 1, beam], lat)
+        assert np.isclose(lons[gate - 110 - 1, beam], lon)
+
+
+@pytest.mark.parametrize('coords', [pydarn.Coords.GEOGRAPHIC,
+                                    pydarn.Coords.AACGM])
+def test_coordinate_cache(coords, tmp_path, monkeypatch):
+    """ cached coordinates are reused from memory and disk """
+    cache = pydarn.CoordinateCache(directory=str(tmp_path))
+    monkeypatch.setattr(pydarn.utils.coordinates, 'coordinate_cache', cache)
+    date = dt.datetime(2018, 4, 4, 6)
+    lats, lons = coords(stid=65, gates=[0, 75], date=date,
+                        range_estimation=pydarn.RangeEstimation.GSMR)
+    # AACGM coordinates also cache the geographic coordinates
+    entries = len(cache)
+    assert entries == (1 if coords == pydarn.Coords.GEOGRAPHIC else 2)
+    assert len(list(tmp_path.glob('*.npz'))) == entries
+    # changing the geometry is a new entry
+    coords(stid=65, gates=[0, 75], date=date, rsep=15)
+    assert len(cache) == 2 * entries
+
+    cached_lats, cached_lons = \
+        coords(stid=65, gates=[0, 75], date=date,
+               range_estimation=pydarn.RangeEstimation.GSMR)
+    assert np.array_equal(lats, cached_lats)
+    assert np.array_equal(lons, cached_lons)
+    # the disk tier is used by a new cache in the same directory
+    cache.clear(disk=False)
+    assert len(cache) == 0
+    disk_lats, _ = coords(stid=65, gates=[0, 75], date=date,
+                          range_estimation=pydarn.RangeEstimation.GSMR)
+    assert np.array_equal(lats, disk_lats)
+    assert len(cache) == 1
+    # the cache hands out copies
+    disk_lats[:] = 0
+    assert np.array_equal(lats, coords(
+        stid=65, gates=[0, 75], date=date,
+        range_estimation=pydarn.RangeEstimation.GSMR)[0])
+    cache.clear()
+    assert list(tmp_path.glob('*.npz')) == []
+
+
+def test_coordinate_cache_versions_eviction(tmp_path):
+    """ keys hold the versions and the disk tier keeps max_files files """
+    key, _, _ = pydarn.utils.coordinates.coordinate_key('geo_coordinates',
+                                                        65)
+    assert pydarn.__version__ in key
+    assert aacgmv2.__version__ in key
+
+    cache = pydarn.CoordinateCache(max_size=0, directory=str(tmp_path),
+                                   max_files=2)
+    for i in range(2):
+        cache.put(('key', i), np.zeros(2), np.ones(2))
+        os.utime(cache._path(cache._name(('key', i))), (i, i))
+    # a read file is recently used
+    assert cache.get(('key', 0)) is not None
+    cache.put(('key', 2), np.zeros(2), np.ones(2))
+    assert len(list(tmp_path.glob('*.npz'))) == 2
+    assert cache.get(('key', 1)) is None
+    assert cache.get(('key', 0)) is not None
+    assert cache.get(('key', 2)) is not None
+
+
+def test_lazy_radars(monkeypatch):
+    """ hardware files are only read when a radar is first accessed """
+    superdarn_radars = pydarn.utils.superdarn_radars
+    radars = superdarn_radars._LazyRadars(
+        {65: ('Rankin Inlet', 'University of Saskatchewan',
+              pydarn.Hemisphere.North, 75, 'rkn')})
+    read = []
+    read_hdw_file = superdarn_radars.read_hdw_file
+    monkeypatch.setattr(superdarn_radars, 'read_hdw_file',
+                        lambda abbrv: read.append(abbrv) or
+                        read_hdw_file(abbrv))
+    assert list(radars) == [65]
+    assert read == []
+    assert radars[65] == pydarn.SuperDARNRadars.radars[65]
+    assert radars[65] is radars[65]
+    assert read == ['rkn']
+    radars.reload()
+    radars[65]
+    assert read == ['rkn', 'rkn']
+
+
+def test_hardware_database():
+    """ hardware lines are found by the epoch they are valid from """
+    database = pydarn.HardwareDatabase.compiled()
+    dates = [dt.datetime(1980, 1, 1), dt.datetime(1996, 12, 10, 16, 59),
+             dt.datetime(1996, 12, 10, 17), dt.datetime(2019, 1, 1)]
+    epochs = [dt.datetime(1993, 9, 29), dt.datetime(1993, 9, 29),
+              dt.datetime(1996, 12, 10, 17), dt.datetime(2018, 12, 20, 16, 11)]
+    lines = database.lookup('sas', dates)
+    for date, epoch, line in zip(dates, epochs, lines):
+        hdw_info = pydarn.read_hdw_file('sas', date)
+        assert hdw_info.date == epoch
+        assert line['epoch'].astype(dt.datetime) == epoch
+        assert hdw_info.stid == line['stid'] == 5
+        assert hdw_info.beam_separation == line['beam_separation']
+        assert hdw_info.gates == line['gates']
+
+
+def test_hardware_database_per_radar(tmp_path):
+    """ hardware files are read per radar and independently """
+    hdw_path = os.path.join(os.path.dirname(pydarn.__file__), 'utils', 'hdw')
+    with open(os.path.join(hdw_path, 'hdw.dat.sas')) as fp:
+        (tmp_path / 'hdw.dat.sas').write_text(fp.read())
+    (tmp_path / 'hdw.dat.bad').write_text('5 1 20000101 not a line\n')
+    database = pydarn.HardwareDatabase(str(tmp_path))
+    assert 'sas' in database and 'bad' in database
+    assert 'rkn' not in database
+    assert database.data == {}
+    with pytest.raises((ValueError, IndexError)):
+        database.lookup('bad', dt.datetime(2019, 1, 1))
+    line = database.lookup('sas', dt.datetime(2019, 1, 1))
+    assert line['stid'] == 5
+    assert list(database.data) == ['sas']
+    with pytest.raises(KeyError):
+        database.lookup('rkn', dt.datetime(2019, 1, 1))
+
+
+def test_batch_aacgm_coordinates(monkeypatch):
+    """ one batch for many radars matches converting every radar """
+    date = dt.datetime(2018, 4, 4, 6, 10)
+    stids = [65, 5, 33]
+    monkeypatch.setattr(pydarn.utils.coordinates, 'coordinate_cache',
+                        pydarn.CoordinateCache(directory=None))
+    batch = pydarn.batch_aacgm_coordinates(stids, date)
+    assert len(pydarn.utils.coordinates.coordinate_cache) == 2 * len(stids)
+
+    monkeypatch.setattr(pydarn.utils.coordinates, 'coordinate_cache',
+                        pydarn.CoordinateCache(directory=None))
+    for stid, (lats, lons) in zip(stids, batch):
+        aacgm_lats, aacgm_lons = pydarn.Coords.AACGM(stid=stid, date=date)
+        assert np.array_equal(lats, aacgm_lats, equal_nan=True)
+        assert np.array_equal(lons, aacgm_lons, equal_nan=True)
+        # dates in the same hour share the conversion
+        assert np.array_equal(lats, pydarn.Coords.AACGM(
+            stid=stid, date=date.replace(minute=50))[0], equal_nan=True)
+        exact_lats, _ = pydarn.Coords.AACGM(
+            stid=stid, date=date.replace(minute=0),
+            date_resolution=dt.timedelta(0))
+        assert np.array_equal(lats, exact_lats, equal_nan=True)